@@ -27,6 +27,7 @@ from .exceptions import *  # NOQA
 from . import exceptions
 from . import protocol as edgedb_protocol
 from .future import create_future
+from . import cursor
 from . import transaction
 
 
@@ -47,16 +48,37 @@ class Connection:
     async def get_pgcon(self):
         return await self._protocol.get_pgcon()
 
-    async def execute(self, query, *args, graphql=False, flags={}):
+    async def execute(self, query, *args, graphql=False, flags={},
+                      continuation=None):
         return await self._protocol.execute_script(
             query,
             *args,
             graphql=graphql,
-            flags=flags)
+            flags=flags,
+            continuation=continuation)
 
     def get_last_timings(self):
         return self._protocol._last_timings
 
+    def get_last_continuation(self):
+        """Return the continuation token of the last keyset-paginated query.
+
+        The token is None if the last page has been reached.  Pass it
+        as the *continuation* argument of :meth:`execute` together with
+        the same query to fetch the next page.
+        """
+        return self._protocol._last_continuation
+
+    def cursor(self, query, *, prefetch=100, flags={}):
+        """Create a :class:`~cursor.Cursor` iterating over *query* results.
+
+        :param prefetch: The number of rows to fetch from the server
+                         at a time.
+
+        Cursors can only be used inside a transaction.
+        """
+        return cursor.Cursor(self, query, prefetch, flags)
+
     def close(self):
         self._transport.close()
 
@@ -0,0 +1,96 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import collections
+
+
+class Cursor:
+    """An asynchronous iterator over the results of a query.
+
+    Cursors are created by calling the
+    :meth:`Connection.cursor() <connection.Connection.cursor>`
+    function.  Rows are fetched from a server-side cursor in batches
+    of *prefetch* rows as the iteration proceeds.
+    """
+
+    __slots__ = ('_connection', '_query', '_prefetch', '_flags', '_id',
+                 '_buffer', '_exhausted')
+
+    def __init__(self, connection, query, prefetch, flags):
+        if prefetch <= 0:
+            raise ValueError(
+                'prefetch is expected to be a positive integer, '
+                'got {!r}'.format(prefetch))
+
+        self._connection = connection
+        self._query = query
+        self._prefetch = prefetch
+        self._flags = flags
+        self._id = None
+        self._buffer = collections.deque()
+        self._exhausted = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._buffer:
+            if self._exhausted:
+                raise StopAsyncIteration
+
+            self._buffer.extend(await self._fetch(self._prefetch))
+            if not self._buffer:
+                raise StopAsyncIteration
+
+        return self._buffer.popleft()
+
+    async def fetch(self, count):
+        """Return the next *count* rows."""
+        rows = []
+        while self._buffer and len(rows) < count:
+            rows.append(self._buffer.popleft())
+
+        if len(rows) < count and not self._exhausted:
+            rows.extend(await self._fetch(count - len(rows)))
+
+        return rows
+
+    async def close(self):
+        """Close the cursor."""
+        if self._id is not None and not self._exhausted:
+            await self._connection._protocol.close_cursor(self._id)
+        self._exhausted = True
+        self._buffer.clear()
+
+    async def _fetch(self, count):
+        protocol = self._connection._protocol
+
+        if self._id is None:
+            self._id = await protocol.open_cursor(
+                self._query, flags=self._flags)
+
+        rows, = await protocol.fetch_cursor(self._id, count)
+        if len(rows) < count:
+            await self.close()
+
+        return rows
+
+    def __repr__(self):
+        return '<edgedb.Cursor {!r} at 0x{:x}>'.format(
+            self._query, id(self))
@@ -37,6 +37,31 @@ class ConnectionState(enum.Enum):
 msg_header = struct.Struct('!L')
 
 
+def _decode_native(value, descriptor):
+    """Rebuild shapes and named tuples from a NATIVE format value."""
+    if value is None or descriptor is None:
+        return value
+
+    if descriptor['type'] == 'array':
+        return [_decode_native(v, descriptor['element']) for v in value]
+
+    elements = [_decode_native(v, d)
+                for v, d in zip(value, descriptor['elements'])]
+    if descriptor['names'] is None:
+        return elements
+    else:
+        return dict(zip(descriptor['names'], elements))
+
+
+def _decode_native_results(results, descriptors):
+    decoded = []
+    for result, descriptor in zip(results, descriptors):
+        if isinstance(result, list):
+            result = [_decode_native(row, descriptor) for row in result]
+        decoded.append(result)
+    return decoded
+
+
 class Protocol(asyncio.Protocol):
     def __init__(self, address, connect_waiter,
                  user, password, database, loop):
@@ -53,6 +78,7 @@ class Protocol(asyncio.Protocol):
         self._state = ConnectionState.NOT_CONNECTED
 
         self._last_timings = None
+        self._last_continuation = None
 
         self.buffer = bytearray()
 
@@ -89,7 +115,8 @@ class Protocol(asyncio.Protocol):
 
         return self.send_message(msg)
 
-    def execute_script(self, script, *, graphql=False, flags={}):
+    def execute_script(self, script, *, graphql=False, flags={},
+                       continuation=None):
         msg = {
             '__type__': 'script',
             '__graphql__': graphql,
@@ -97,6 +124,35 @@ class Protocol(asyncio.Protocol):
             'script': script
         }
 
+        if continuation is not None:
+            msg['__continuation__'] = continuation
+
+        return self.send_message(msg)
+
+    def open_cursor(self, query, *, flags={}):
+        msg = {
+            '__type__': 'cursor_open',
+            '__flags__': list(flags),
+            'query': query
+        }
+
+        return self.send_message(msg)
+
+    def fetch_cursor(self, cursor_id, count):
+        msg = {
+            '__type__': 'cursor_fetch',
+            'cursor': cursor_id,
+            'count': count
+        }
+
+        return self.send_message(msg)
+
+    def close_cursor(self, cursor_id):
+        msg = {
+            '__type__': 'cursor_close',
+            'cursor': cursor_id
+        }
+
         return self.send_message(msg)
 
     def _new_waiter(self):
@@ -130,8 +186,13 @@ class Protocol(asyncio.Protocol):
 
         elif message['__type__'] == 'result':
             if self._waiter is not None:
-                self._waiter.set_result(message['result'])
+                result = message['result']
+                if 'descriptors' in message:
+                    result = _decode_native_results(
+                        result, message['descriptors'])
+                self._waiter.set_result(result)
                 self._last_timings = message['timings']
+                self._last_continuation = message.get('continuation')
             self._waiter = None
 
     def _init_connection(self):
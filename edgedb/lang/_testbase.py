@@ -235,19 +235,16 @@ class BaseEdgeQLCompilerTest(BaseDocTest):
 
     @classmethod
     def get_schema_script(cls):
-        if cls.SCHEMA is None:
-            raise ValueError(
-                'compiler test cases must define at least one'
-                ' SCHEMA attribute')
-
         # Always create the test module.
         script = 'CREATE MODULE test;'
+        has_schema = False
 
         # look at all SCHEMA entries and potentially create multiple modules
         #
         for name, val in cls.__dict__.items():
             m = re.match(r'^SCHEMA(?:_(\w+))?', name)
-            if m:
+            if m and val is not None:
+                has_schema = True
                 module_name = (m.group(1) or 'test').lower().replace(
                     '__', '.')
 
@@ -261,6 +258,11 @@ class BaseEdgeQLCompilerTest(BaseDocTest):
                 script += f' TO eschema $${schema}$$;'
                 script += f'\nCOMMIT MIGRATION {module_name}::d1;'
 
+        if not has_schema:
+            raise ValueError(
+                'compiler test cases must define at least one'
+                ' SCHEMA attribute')
+
         return script.strip(' \n')
 
 
@@ -131,6 +131,14 @@ class MetaAST(type):
 
         cls._fields = fields
 
+        # The traversal plan of the class: the names of the non-meta
+        # fields along with their hidden and child_traverse flags, in
+        # field order.  Visitors iterate over it instead of calling
+        # iter_fields() on every node.
+        cls._traversal_plan = tuple(
+            (field.name, field.hidden, field.child_traverse)
+            for field in fields.values() if not field.meta)
+
     def get_field(cls, name):
         return cls._fields.get(name)
 
@@ -138,13 +146,31 @@ class MetaAST(type):
 class AST(object, metaclass=MetaAST):
     __fields = []
 
-    def __init__(self, **kwargs):
-        object.__setattr__(self, 'parent', None)
-        self._init_fields(kwargs)
+    # Parent links are not maintained in fast mode, see
+    # enable_fast_mode() and fix_parent_links().
+    parent = None
 
-        # XXX: use weakref here
-        for arg, value in kwargs.items():
-            if hasattr(self, arg):
+    def __init__(self, **kwargs):
+        cls = self.__class__
+        try:
+            init_fields = _field_initializers[cls]
+        except KeyError:
+            init_fields = _field_initializers[cls] = \
+                _make_field_initializer(cls)
+
+        if not _fast_mode:
+            object.__setattr__(self, 'parent', None)
+
+        if init_fields(self, kwargs) != len(kwargs):
+            for arg in kwargs:
+                if arg not in cls._fields and not hasattr(self, arg):
+                    raise ASTError(
+                        'cannot set attribute "%s" in ast class "%s"' %
+                        (arg, cls.__name__))
+
+        if not _fast_mode:
+            # XXX: use weakref here
+            for value in kwargs.values():
                 if is_ast_node(value):
                     object.__setattr__(value, 'parent', self)
                 elif isinstance(value, list):
@@ -155,32 +181,10 @@ class AST(object, metaclass=MetaAST):
                     for v in value.values():
                         if is_ast_node(v):
                             object.__setattr__(v, 'parent', self)
-            else:
-                raise ASTError(
-                    'cannot set attribute "%s" in ast class "%s"' %
-                    (arg, self.__class__.__name__))
 
         if 'parent' in kwargs:
             object.__setattr__(self, 'parent', kwargs['parent'])
 
-    def _init_fields(self, values):
-        for field_name, field in self.__class__._fields.items():
-            if field_name in values:
-                value = values[field_name]
-            elif field.default is not None:
-                if callable(field.default):
-                    value = field.default()
-                else:
-                    value = field.default
-            else:
-                value = None
-
-            if __debug__:
-                self.check_field_type(field, value)
-
-            # Bypass overloaded setattr
-            object.__setattr__(self, field_name, value)
-
     def __copy__(self):
         copied = self.__class__()
         for field, value in iter_fields(self, include_meta=False):
@@ -194,12 +198,8 @@ class AST(object, metaclass=MetaAST):
         return copied
 
     if __debug__:
-
         def __setattr__(self, name, value):
-            super().__setattr__(name, value)
-            field = self._fields.get(name)
-            if field:
-                self.check_field_type(field, value)
+            _checked_setattr(self, name, value)
 
     def check_field_type(self, field, value):
         def raise_error(field_type_name, value):
@@ -214,6 +214,85 @@ class AST(object, metaclass=MetaAST):
         markup.dump(self)
 
 
+def _checked_setattr(node, name, value):
+    object.__setattr__(node, name, value)
+    field = node._fields.get(name)
+    if field:
+        node.check_field_type(field, value)
+
+
+_fast_mode = False
+_field_initializers = {}
+
+
+def enable_fast_mode(enabled=True):
+    """Enable or disable the fast AST mode.
+
+    In fast mode, field types are not checked, even when Python runs
+    without -O, and nodes do not set the parent link of their children
+    on construction.  Code that needs parent links must call
+    fix_parent_links() on the root of the tree first (the source
+    generators do).  Tests keep the default checked mode.
+    """
+    global _fast_mode
+
+    _fast_mode = enabled
+    _field_initializers.clear()
+
+    if __debug__:
+        if enabled:
+            if '__setattr__' in AST.__dict__:
+                del AST.__setattr__
+        else:
+            AST.__setattr__ = _checked_setattr
+
+
+def is_fast_mode():
+    return _fast_mode
+
+
+def _make_field_initializer(cls):
+    # Generate a function that initializes the fields of a *cls*
+    # instance from the constructor keyword arguments and returns
+    # the number of arguments it consumed.
+    checked = __debug__ and not _fast_mode
+
+    ns = {'_marker': _marker, '_setattr': object.__setattr__}
+    body = []
+
+    for i, (field_name, field) in enumerate(cls._fields.items()):
+        if field.default is None:
+            default = 'None'
+        elif callable(field.default):
+            ns[f'_default_{i}'] = field.default
+            default = f'_default_{i}()'
+        else:
+            ns[f'_default_{i}'] = field.default
+            default = f'_default_{i}'
+
+        body.append(f'    value = values.get({field_name!r}, _marker)')
+        body.append('    if value is _marker:')
+        body.append(f'        value = {default}')
+        body.append('    else:')
+        body.append('        consumed += 1')
+
+        if checked:
+            ns[f'_field_{i}'] = field
+            body.append(f'    self.check_field_type(_field_{i}, value)')
+
+        body.append(f'    _setattr(self, {field_name!r}, value)')
+
+    source = '\n'.join([
+        'def init_fields(self, values):',
+        '    consumed = 0',
+        *body,
+        '    return consumed',
+    ])
+
+    exec(source, ns)
+    return ns['init_fields']
+
+
 class ImmutableASTMixin:
     __frozen = False
 
@@ -281,7 +360,11 @@ def is_container_type(type_):
 
 
 def fix_parent_links(node):
-    for field, value in iter_fields(node):
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if value is None:
+            continue
+
         if is_container(value):
             for n in value:
                 if is_ast_node(n):
@@ -36,11 +36,29 @@ class SourceGenerator(NodeVisitor):
         self.new_lines = 0
         self.current_line = 1
         self.pretty = pretty
+        if not pretty:
+            # Compact output needs no line or indentation tracking.
+            self.write = self._write_compact
+
+    @classmethod
+    def _find_visitor(cls, nodecls):
+        # Unlike NodeVisitor, dispatch on the exact node class: a node
+        # subclass has syntax of its own and must not be rendered with
+        # the visitor of its base.
+        return getattr(cls, 'visit_' + nodecls.__name__, cls.generic_visit)
 
     def node_visit(self, node):
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        visitor = self._get_visitor(node.__class__)
+        return visitor(self, node)
+
+    def _write_compact(self, *x, delimiter=None):
+        if self.new_lines:
+            self.result.append(' ')
+            self.new_lines = 0
+        if delimiter:
+            self.result.append(delimiter.join(x))
+        else:
+            self.result.extend(x)
 
     def write(self, *x, delimiter=None):
         if self.new_lines:
@@ -56,7 +56,7 @@ class NodeTransformer(visitor.NodeVisitor):
     """
 
     def generic_visit(self, node):
-        for field, old_value in base.iter_fields(node, include_meta=False):
+        for field, _, _ in node._traversal_plan:
             old_value = getattr(node, field, None)
 
             if base.is_container(old_value):
@@ -26,7 +26,10 @@ class SkipNode(Exception):
 
 def find_children(node, test_func, *args, force_traversal=False,
                   terminate_early=False, **kwargs):
+    # The visited set is needed: IR trees share subtrees, and each
+    # shared node must be tested and descended into only once.
     visited = set()
+    AST = base.AST
 
     def _find_children(node, test_func):
         result = []
@@ -36,41 +39,43 @@ def find_children(node, test_func, *args, force_traversal=False,
         else:
             visited.add(node)
 
-        for field, value in base.iter_fields(node, include_meta=False):
-            field_spec = node._fields[field]
+        for field, hidden, child_traverse in node._traversal_plan:
+            value = getattr(node, field, None)
+            if value is None:
+                continue
+
+            traverse = child_traverse or force_traversal
 
             if isinstance(value, (list, set, frozenset)):
                 for n in value:
-                    if not base.is_ast_node(n):
+                    if not isinstance(n, AST):
                         continue
 
                     try:
-                        if not field_spec.hidden and test_func(
-                                n, *args, **kwargs):
+                        if not hidden and test_func(n, *args, **kwargs):
                             result.append(n)
                             if terminate_early:
                                 return result
                     except SkipNode:
                         continue
 
-                    if field_spec.child_traverse or force_traversal:
+                    if traverse:
                         _n = _find_children(n, test_func)
                         if _n is not None:
                             result.extend(_n)
                             if terminate_early:
                                 return result
 
-            elif base.is_ast_node(value):
+            elif isinstance(value, AST):
                 try:
-                    if not field_spec.hidden and test_func(
-                            value, *args, **kwargs):
+                    if not hidden and test_func(value, *args, **kwargs):
                         result.append(value)
                         if terminate_early:
                             return result
                 except SkipNode:
                     continue
 
-                if field_spec.child_traverse or force_traversal:
+                if traverse:
                     _n = _find_children(value, test_func)
                     if _n is not None:
                         result.extend(_n)
@@ -129,6 +134,32 @@ class NodeVisitor:
         visitor = cls(**kwargs)
         return visitor.visit(node)
 
+    @classmethod
+    def _get_visitor(cls, nodecls):
+        # Visitor methods are resolved once per (visitor class,
+        # node class) pair.
+        try:
+            visitors = cls.__dict__['_visitors']
+        except KeyError:
+            visitors = {}
+            setattr(cls, '_visitors', visitors)
+
+        try:
+            visitor = visitors[nodecls]
+        except KeyError:
+            visitor = visitors[nodecls] = cls._find_visitor(nodecls)
+
+        return visitor
+
+    @classmethod
+    def _find_visitor(cls, nodecls):
+        for nodebase in nodecls.__mro__:
+            visitor = getattr(cls, 'visit_' + nodebase.__name__, None)
+            if visitor is not None:
+                return visitor
+
+        return cls.generic_visit
+
     def container_visit(self, node):
         result = []
         for elem in node:
@@ -151,14 +182,8 @@ class NodeVisitor:
         else:
             self.memo[node] = None
 
-        for cls in node.__class__.__mro__:
-            method = 'visit_' + cls.__name__
-            visitor = getattr(self, method, None)
-            if visitor is not None:
-                break
-        else:
-            visitor = self.generic_visit
-        result = visitor(node)
+        visitor = self._get_visitor(node.__class__)
+        result = visitor(self, node)
         self.memo[node] = result
         return result
 
@@ -171,7 +196,11 @@ class NodeVisitor:
     def generic_visit(self, node, *, combine_results=None):
         field_results = []
 
-        for field, value in base.iter_fields(node, include_meta=False):
+        for field, _, _ in node._traversal_plan:
+            value = getattr(node, field, None)
+            if value is None:
+                continue
+
             if base.is_container(value):
                 for item in value:
                     if base.is_ast_node(item):
@@ -196,10 +225,10 @@ def nodes_equal(n1, n2):
     if type(n1) is not type(n2):
         return False
 
-    for field, value in base.iter_fields(n1, include_meta=False):
-        if not n1._fields[field].hidden:
-            n1v = getattr(n1, field)
-            n2v = getattr(n2, field)
+    for field, hidden, _ in n1._traversal_plan:
+        if not hidden:
+            n1v = getattr(n1, field, None)
+            n2v = getattr(n2, field, None)
 
             if base.is_container(n1v):
                 n1v = list(n1v)
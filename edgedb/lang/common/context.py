@@ -37,6 +37,8 @@ from edgedb.lang.common import ast, markup
 
 
 class SourcePoint:
+    __slots__ = ('line', 'column', 'pointer')
+
     def __init__(self, line, column, pointer):
         self.line = line
         self.column = column
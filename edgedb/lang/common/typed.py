@@ -51,9 +51,13 @@ class TypedCollectionMeta(abc.ABCMeta):
 
 
 class AbstractTypedCollection(metaclass=TypedCollectionMeta):
+    __slots__ = ()
+
     _TYPE_ARGS = ()
 
     def __init__(self):
+        # Type arguments are class attributes; they are validated here,
+        # but not copied onto the instance to keep collections small.
         for arg in self._TYPE_ARGS:
             _type = getattr(self, arg, None)
             if _type is None:
@@ -61,8 +65,6 @@ class AbstractTypedCollection(metaclass=TypedCollectionMeta):
                     'cannot instantiate typed collection {!r} '
                     'without "type"'.format(self))
 
-            setattr(self, arg, _type)
-
     def _check_type(self, value, _type, name):
         if value is None and self.__typed_accept_none__:
             return
@@ -73,6 +75,8 @@ class AbstractTypedCollection(metaclass=TypedCollectionMeta):
 
 
 class AbstractTypedSequence(AbstractTypedCollection, type=None):
+    __slots__ = ()
+
     _TYPE_ARGS = ('type', )
 
     def _check_item(self, value):
@@ -88,6 +92,8 @@ class AbstractTypedSequence(AbstractTypedCollection, type=None):
 
 
 class AbstractTypedSet(AbstractTypedCollection, type=None):
+    __slots__ = ()
+
     _TYPE_ARGS = ('type', )
 
     def _check_item(self, value):
@@ -104,6 +110,8 @@ class AbstractTypedSet(AbstractTypedCollection, type=None):
 
 class AbstractTypedMapping(
         AbstractTypedCollection, keytype=None, valuetype=None):
+    __slots__ = ()
+
     _TYPE_ARGS = ('keytype', 'valuetype')
 
     def _check_key(self, key):
@@ -120,6 +128,8 @@ class AbstractTypedMapping(
 
 
 class _AbstractTypedDict(AbstractTypedMapping, keytype=None, valuetype=None):
+    __slots__ = ()
+
     _base_dict_cls = None
 
     def __init__(self, *args, **kwargs):
@@ -168,6 +178,8 @@ class TypedDict(
 class OrderedTypedDict(
         _AbstractTypedDict, collections.OrderedDict, keytype=None,
         valuetype=None):
+    __slots__ = ()
+
     _base_dict_cls = collections.OrderedDict
 
 
@@ -269,6 +281,8 @@ class TypedSet(AbstractTypedSet, collections.MutableSet, type=None):
         ValueError
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, inititerable=None):
         AbstractTypedSet.__init__(self)
         if inititerable is not None:
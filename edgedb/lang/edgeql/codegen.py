@@ -46,12 +46,11 @@ class EdgeQLSourceGeneratorError(EdgeDBError):
 
 class EdgeQLSourceGenerator(codegen.SourceGenerator):
     def visit(self, node, **kwargs):
-        method = 'visit_' + node.__class__.__name__
-        if method == 'visit_list':
+        if node.__class__ is list:
             return self.visit_list(node, terminator=';')
         else:
-            visitor = getattr(self, method, self.generic_visit)
-            return visitor(node, **kwargs)
+            visitor = self._get_visitor(node.__class__)
+            return visitor(self, node, **kwargs)
 
     def _needs_parentheses(self, node):
         return (
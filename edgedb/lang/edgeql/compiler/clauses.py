@@ -44,6 +44,12 @@ def compile_where_clause(
             if subctx.stmt.parent_stmt is None:
                 subctx.toplevel_clause = subctx.clause
             ir_expr = dispatch.compile(where, ctx=subctx)
+            if (isinstance(ir_expr, irast.Set) and
+                    isinstance(ir_expr.expr, irast.Constant) and
+                    ir_expr.expr.value is True):
+                # An always-true filter is dropped.
+                return None
+
             bool_t = ctx.schema.get('std::bool')
             ir_set = setgen.scoped_set(ir_expr, typehint=bool_t, ctx=subctx)
 
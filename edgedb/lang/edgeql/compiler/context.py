@@ -57,6 +57,15 @@ class ViewRPtr:
         self.is_update = is_update
 
 
+class ViewCacheEntry:
+    """Schema classes derived for a shape, reusable by other compilations."""
+
+    def __init__(self):
+        self.view_scls = None
+        self.derived = []
+        self.class_shapes = []
+
+
 class StatementMetadata:
     is_unnest_fence: bool
     ignore_offset_limit: bool
@@ -171,6 +180,16 @@ class ContextLevel(compiler.ContextLevel):
     implicit_id_in_shapes: bool
     """Whether to include the id property in object shapes implicitly."""
 
+    view_cache: typing.Optional[typing.MutableMapping[typing.Hashable,
+                                                      ViewCacheEntry]]
+    """Views derived for shapes in earlier compilations against the schema."""
+
+    view_cache_used: typing.Set[typing.Hashable]
+    """Keys of the view cache entries used by this compilation."""
+
+    view_cache_entry: typing.Optional[ViewCacheEntry]
+    """The view cache entry being recorded."""
+
     def __init__(self, prevlevel, mode):
         self.mode = mode
 
@@ -213,6 +232,9 @@ class ContextLevel(compiler.ContextLevel):
             self.view_rptr = None
             self.toplevel_result_view_name = None
             self.implicit_id_in_shapes = True
+            self.view_cache = None
+            self.view_cache_used = set()
+            self.view_cache_entry = None
 
         else:
             self.schema = prevlevel.schema
@@ -239,6 +261,9 @@ class ContextLevel(compiler.ContextLevel):
             self.toplevel_clause = prevlevel.toplevel_clause
             self.toplevel_stmt = prevlevel.toplevel_stmt
             self.implicit_id_in_shapes = prevlevel.implicit_id_in_shapes
+            self.view_cache = prevlevel.view_cache
+            self.view_cache_used = prevlevel.view_cache_used
+            self.view_cache_entry = prevlevel.view_cache_entry
 
             if mode == ContextSwitchMode.SUBQUERY:
                 self.anchors = prevlevel.anchors.copy()
@@ -49,6 +49,11 @@ from . import typegen
 from . import func  # NOQA
 
 
+# Set literals of constants with at least this many elements are
+# compiled as array_unpack() of an array instead of a chain of UNIONs.
+LITERAL_SET_UNPACK_THRESHOLD = 16
+
+
 @dispatch.compile.register(qlast.Path)
 def compile_Path(
         expr: qlast.Base, *, ctx: context.ContextLevel) -> irast.Set:
@@ -115,6 +120,18 @@ def compile_Set(
                 return setgen.scoped_set(ir_set, ctx=scopectx)
         else:
             elements = flatten_set(expr)
+
+            if is_constant_set(elements):
+                # Large sets of constants (typically the iterator of
+                # a bulk FOR .. INSERT) are unpacked from an array,
+                # which produces a single set-returning function scan
+                # instead of a deep UNION tree.
+                unpack = qlast.FunctionCall(
+                    func=('std', 'array_unpack'),
+                    args=[qlast.FuncArg(arg=qlast.Array(elements=elements))]
+                )
+                return dispatch.compile(unpack, ctx=ctx)
+
             # a set literal is just sugar for a UNION
             op = qlast.UNION
 
@@ -234,6 +251,17 @@ def compile_IfElse(
                 if_expr_type.name, else_expr_type.name),
             context=expr.context)
 
+    cond_value = _get_constant_value(condition)
+    if isinstance(cond_value, bool):
+        # The condition is a constant: the expression reduces to
+        # one of the branches, provided that it is of the result
+        # type and is not a bare path.
+        branch, branch_type = (
+            (if_expr, if_expr_type) if cond_value
+            else (else_expr, else_expr_type))
+        if branch_type is result and branch.expr is not None:
+            return branch
+
     return setgen.generated_set(
         irast.IfElseExpr(
             if_expr=if_expr, else_expr=else_expr, condition=condition),
@@ -255,6 +283,13 @@ def compile_UnaryOp(
     unop = irast.UnaryOp(expr=operand, op=expr.op)
     result_type = irutils.infer_type(unop, ctx.schema)
 
+    if expr.op == ast.ops.NOT:
+        value = _get_constant_value(operand)
+        if isinstance(value, bool):
+            return setgen.ensure_set(
+                irast.Constant(value=not value, type=result_type),
+                ctx=ctx)
+
     real_t = ctx.schema.get('std::anyreal')
 
     if (isinstance(operand.expr, irast.Constant) and
@@ -273,6 +308,11 @@ def compile_UnaryOp(
 @dispatch.compile.register(qlast.ExistsPredicate)
 def compile_ExistsPredicate(
         expr: qlast.Base, *, ctx: context.ContextLevel) -> irast.Base:
+    if is_nonempty_literal(expr.expr):
+        return setgen.ensure_set(
+            irast.Constant(value=True, type=ctx.schema.get('std::bool')),
+            ctx=ctx)
+
     with ctx.new() as exctx:
         with exctx.newscope(fenced=True) as opctx:
             operand = setgen.scoped_set(
@@ -299,6 +339,8 @@ def compile_Coalesce(
         pathctx.register_set_in_scope(larg, ctx=ctx)
         pathctx.mark_path_as_optional(larg.path_id, ctx=ctx)
 
+        first_arg = larg
+
         for rarg_ql in expr.args[1:]:
             with newctx.new() as nestedscopectx:
                 with nestedscopectx.newscope(fenced=True) as fencectx:
@@ -319,6 +361,13 @@ def compile_Coalesce(
                     schema=nestedscopectx.schema
                 )
 
+    if _get_constant_value(first_arg) is not None:
+        # A non-empty constant on the left makes the other
+        # operands irrelevant.
+        first_type = irutils.infer_type(first_arg, ctx.schema)
+        if irutils.infer_type(larg, ctx.schema) is first_type:
+            return first_arg
+
     return larg
 
 
@@ -522,11 +571,16 @@ def try_fold_binop(
     op = binop.op
 
     if (isinstance(left.expr, irast.Constant) and
-            isinstance(right.expr, irast.Constant) and
-            result_type.issubclass(real_t)):
+            isinstance(right.expr, irast.Constant)):
 
         # Left and right nodes are constants.
-        folded = try_fold_arithmetic_binop(op, left, right, ctx=ctx)
+        if result_type.issubclass(real_t):
+            folded = try_fold_arithmetic_binop(op, left, right, ctx=ctx)
+        else:
+            folded = try_fold_constant_binop(op, left, right, ctx=ctx)
+
+    elif op in {ast.ops.AND, ast.ops.OR}:
+        folded = try_fold_logical_binop(op, left, right, ctx=ctx)
 
     elif op in {ast.ops.ADD, ast.ops.MUL}:
         # Let's check if we have (CONST + (OTHER_CONST + X))
@@ -561,6 +615,96 @@ def try_fold_binop(
     return folded
 
 
+def try_fold_constant_binop(
+        op: ast.ops.Operator, left: irast.Set, right: irast.Set, *,
+        ctx: context.ContextLevel) -> typing.Optional[irast.Set]:
+    """Try folding a comparison, a boolean operator or a string
+       concatenation of two constants."""
+    schema = ctx.schema
+
+    real_t = schema.get('std::anyreal')
+    str_t = schema.get('std::str')
+    bool_t = schema.get('std::bool')
+
+    left_type = irutils.infer_type(left, schema)
+    right_type = irutils.infer_type(right, schema)
+
+    left = left.expr.value
+    right = right.expr.value
+
+    if left is None or right is None:
+        return
+
+    if left_type is not right_type:
+        # Mixed numeric comparisons are done by Postgres after an
+        # implicit cast (e.g. int8 to float8), which may lose
+        # precision, so their result can differ from Python's.
+        return
+    elif left_type.issubclass(real_t):
+        ordered = True
+    elif left_type in {str_t, bool_t}:
+        # String ordering depends on the database collation,
+        # so only equality is folded for strings.
+        ordered = False
+    else:
+        return
+
+    result_type = bool_t
+
+    if op == ast.ops.EQ:
+        value = left == right
+    elif op == ast.ops.NE:
+        value = left != right
+    elif op == ast.ops.LT and ordered:
+        value = left < right
+    elif op == ast.ops.LE and ordered:
+        value = left <= right
+    elif op == ast.ops.GT and ordered:
+        value = left > right
+    elif op == ast.ops.GE and ordered:
+        value = left >= right
+    elif op == ast.ops.AND and left_type is bool_t:
+        value = left and right
+    elif op == ast.ops.OR and left_type is bool_t:
+        value = left or right
+    elif op == ast.ops.ADD and left_type is str_t:
+        value = left + right
+        result_type = str_t
+    else:
+        return
+
+    return setgen.ensure_set(
+        irast.Constant(value=value, type=result_type), ctx=ctx)
+
+
+def try_fold_logical_binop(
+        op: ast.ops.Operator, left: irast.Set, right: irast.Set, *,
+        ctx: context.ContextLevel) -> typing.Optional[irast.Set]:
+    """Try eliminating a constant operand of AND or OR.
+
+    Only the identity operands (TRUE for AND, FALSE for OR) are
+    eliminated: X AND FALSE is not FALSE when X is an empty set.
+    """
+    identity = op == ast.ops.AND
+
+    if _get_constant_value(left) is identity:
+        other = right
+    elif _get_constant_value(right) is identity:
+        other = left
+    else:
+        return
+
+    # Bare paths are kept under the operator, as replacing
+    # the expression set with a path would change its scoping.
+    if other.expr is not None:
+        return other
+
+
+def _get_constant_value(ir_set: irast.Set) -> typing.Any:
+    if isinstance(ir_set.expr, irast.Constant):
+        return ir_set.expr.value
+
+
 def compile_type_check_op(
         expr: qlast.BinOp, *, ctx: context.ContextLevel) -> irast.BinOp:
     # <Expr> IS <Type>
@@ -611,7 +755,11 @@ def compile_distinct_op(
     with ctx.newscope(fenced=True) as scopectx:
         operand = setgen.scoped_set(
             dispatch.compile(expr.operand, ctx=scopectx), ctx=scopectx)
-    return setgen.generated_set(irast.DistinctOp(expr=operand), ctx=ctx)
+        is_unique = irinference.infer_is_unique(
+            operand, singletons=scopectx.singletons, schema=scopectx.schema)
+
+    return setgen.generated_set(
+        irast.DistinctOp(expr=operand, expr_is_unique=is_unique), ctx=ctx)
 
 
 def compile_equivalence_op(
@@ -651,6 +799,39 @@ def compile_membership_op(
     return setgen.generated_set(op_node, ctx=ctx)
 
 
+def is_constant_set(elements: typing.List[qlast.Expr]) -> bool:
+    if len(elements) < LITERAL_SET_UNPACK_THRESHOLD:
+        return False
+
+    return _is_homogeneous_constant_set(elements)
+
+
+def is_nonempty_literal(expr: qlast.Base) -> bool:
+    # The elements must all be of the same type, otherwise the set
+    # might not have a valid type and must be compiled to report it.
+    if isinstance(expr, qlast.Set):
+        elements = flatten_set(expr)
+    else:
+        elements = [expr]
+
+    return _is_homogeneous_constant_set(elements)
+
+
+def _is_homogeneous_constant_set(elements: typing.List[qlast.Expr]) -> bool:
+    if not elements:
+        return False
+
+    first = elements[0]
+    if not isinstance(first, qlast.Constant) or first.value is None:
+        return False
+
+    const_type = type(first.value)
+    return all(
+        isinstance(el, qlast.Constant) and type(el.value) is const_type
+        for el in elements
+    )
+
+
 def flatten_set(expr: qlast.Set) -> typing.List[qlast.Expr]:
     elements = []
     for el in expr.elements:
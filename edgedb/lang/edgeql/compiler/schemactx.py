@@ -20,7 +20,9 @@
 """EdgeQL compiler schema helpers."""
 
 
+import collections
 import typing
+import weakref
 
 from edgedb.lang.common import parsing
 
@@ -29,6 +31,7 @@ from edgedb.lang.schema import name as sn
 from edgedb.lang.schema import nodes as s_nodes
 from edgedb.lang.schema import objects as s_obj
 from edgedb.lang.schema import pointers as s_pointers
+from edgedb.lang.schema import schema as s_schema
 from edgedb.lang.schema import sources as s_sources
 from edgedb.lang.schema import types as s_types
 from edgedb.lang.schema import utils as s_utils
@@ -39,6 +42,11 @@ from edgedb.lang.edgeql import errors as qlerrors
 from . import context
 
 
+# Views derived for shapes, per schema and schema generation,
+# see viewgen.process_view().
+_view_caches = weakref.WeakKeyDictionary()
+
+
 def get_schema_object(
         name: typing.Union[str, qlast.ObjectRef],
         module: typing.Optional[str]=None, *,
@@ -176,6 +184,18 @@ def derive_view(
             vtype = s_types.ViewType.Select
         derived.view_type = vtype
 
+    register_view(derived, add_to_schema=add_to_schema, ctx=ctx)
+
+    if ctx.view_cache_entry is not None:
+        ctx.view_cache_entry.derived.append((derived, add_to_schema))
+
+    return derived
+
+
+def register_view(
+        derived: s_obj.Object, *,
+        add_to_schema: bool=True,
+        ctx: context.ContextLevel) -> None:
     if (add_to_schema and not isinstance(derived, s_types.Collection) and
             ctx.schema.get(derived.name, None) is None):
         ctx.schema.add(derived)
@@ -183,4 +203,18 @@ def derive_view(
     if isinstance(derived, s_types.Type):
         ctx.view_nodes[derived.name] = derived
 
-    return derived
+
+def get_view_cache(
+        schema: s_schema.Schema) -> typing.Optional[
+            typing.MutableMapping[typing.Hashable, context.ViewCacheEntry]]:
+    if isinstance(schema, s_schema.SchemaOverlay):
+        # Overlays only live as long as a single compilation.
+        return None
+
+    generation = schema._get_generation()
+    cache_generation, cache = _view_caches.get(schema, (None, None))
+    if cache_generation != generation:
+        cache = collections.OrderedDict()
+        _view_caches[schema] = (generation, cache)
+
+    return cache
@@ -38,6 +38,7 @@ from . import astutils
 from . import context
 from . import dispatch
 from . import pathctx
+from . import schemactx
 from . import setgen
 
 
@@ -55,6 +56,7 @@ def init_context(
     stack = context.CompilerContext()
     ctx = stack.current
     ctx.schema = schema.get_overlay(extra=ctx.view_nodes)
+    ctx.view_cache = schemactx.get_view_cache(schema)
 
     if modaliases:
         ctx.modaliases.update(modaliases)
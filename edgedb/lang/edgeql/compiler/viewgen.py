@@ -37,6 +37,7 @@ from edgedb.lang.schema import types as s_types
 from edgedb.lang.edgeql import ast as qlast
 from edgedb.lang.edgeql import errors
 
+from edgedb.lang.common import compiler
 from edgedb.lang.common import exceptions as edgedb_error
 
 from . import astutils
@@ -47,6 +48,19 @@ from . import schemactx
 from . import setgen
 
 
+VIEW_CACHE_SIZE = 1024
+
+
+class _ViewCacheAliasGenerator(compiler.AliasGenerator):
+    # Cached views are shared by compilations, so their names must
+    # not clash with the names of views derived by any of them.
+    def get(self, hint=None):
+        return super().get(f'cached_{hint or "v"}')
+
+
+_view_cache_aliases = _ViewCacheAliasGenerator()
+
+
 def process_view(
         *,
         scls: s_nodes.Node,
@@ -58,16 +72,109 @@ def process_view(
         is_update: bool=False,
         ctx: context.CompilerContext) -> s_nodes.Node:
 
+    cache_key = None
+    if (ctx.view_cache is not None and view_rptr is None and
+            view_name is None and not is_insert and not is_update and
+            ctx.derived_target_module is None):
+        cache_key = _get_view_cache_key(scls, elements, ctx=ctx)
+
+    if cache_key is not None:
+        ctx.view_cache_used.add(cache_key)
+        entry = ctx.view_cache.get(cache_key)
+        if entry is not None:
+            ctx.view_cache.move_to_end(cache_key)
+            return _reuse_view(entry, ctx=ctx)
+
     with ctx.newscope(fenced=True, temporary=True) as scopectx:
         scopectx.path_scope.attach_path(path_id)
 
-        return _process_view(
+        if cache_key is not None:
+            entry = scopectx.view_cache_entry = context.ViewCacheEntry()
+            scopectx.aliases = _view_cache_aliases
+
+        view_scls = _process_view(
             scls=scls, path_id=path_id, elements=elements,
             view_rptr=view_rptr, view_name=view_name,
             is_insert=is_insert, is_update=is_update,
             ctx=scopectx
         )
 
+    if cache_key is not None:
+        entry.view_scls = view_scls
+        ctx.view_cache[cache_key] = entry
+        if len(ctx.view_cache) > VIEW_CACHE_SIZE:
+            ctx.view_cache.popitem(last=False)
+
+    return view_scls
+
+
+def _get_view_cache_key(
+        scls: s_nodes.Node,
+        elements: typing.List[qlast.ShapeElement], *,
+        ctx: context.ContextLevel) -> typing.Optional[typing.Hashable]:
+    """Return the view cache key for a shape, if it can be cached.
+
+    Only shapes made of plain pointer references on a material type
+    are cached, since the classes derived for them depend on nothing
+    but the schema and the shape itself.
+    """
+    if not isinstance(scls, s_sources.Source) or scls.is_view():
+        return None
+
+    signature = _get_shape_signature(elements)
+    if signature is None:
+        return None
+
+    key = (scls, signature, ctx.expr_exposed,
+           frozenset(ctx.modaliases.items()))
+
+    if key in ctx.view_cache_used:
+        # Equal shapes within one query must still produce distinct
+        # views, as views are part of path identity.
+        return None
+
+    return key
+
+
+def _get_shape_signature(
+        elements: typing.List[qlast.ShapeElement]) -> typing.Optional[
+            typing.Tuple]:
+    signature = []
+
+    for shape_el in elements:
+        steps = shape_el.expr.steps
+        if (shape_el.compexpr is not None or shape_el.where is not None or
+                shape_el.orderby or shape_el.offset is not None or
+                shape_el.limit is not None or shape_el.recurse or
+                len(steps) != 1 or steps[0].target is not None):
+            return None
+
+        lexpr = steps[0]
+
+        if shape_el.elements:
+            subshape = _get_shape_signature(shape_el.elements)
+            if subshape is None:
+                return None
+        else:
+            subshape = ()
+
+        signature.append((lexpr.ptr.module, lexpr.ptr.name, lexpr.type,
+                          lexpr.direction, subshape))
+
+    return tuple(signature)
+
+
+def _reuse_view(
+        entry: context.ViewCacheEntry, *,
+        ctx: context.ContextLevel) -> s_nodes.Node:
+    for derived, add_to_schema in entry.derived:
+        schemactx.register_view(derived, add_to_schema=add_to_schema, ctx=ctx)
+
+    for source, ptrcls in entry.class_shapes:
+        ctx.class_shapes[source].append(ptrcls)
+
+    return entry.view_scls
+
 
 def _process_view(
         *,
@@ -153,6 +260,8 @@ def _process_view(
                 view_rptr.derived_ptrcls = source
 
             ctx.class_shapes[source].append(ptrcls)
+            if ctx.view_cache_entry is not None:
+                ctx.view_cache_entry.class_shapes.append((source, ptrcls))
 
     return view_scls
 
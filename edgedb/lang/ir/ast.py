@@ -194,6 +194,8 @@ class ExistPred(Expr):
 
 class DistinctOp(Expr):
     expr: Base
+    # The operand is known to be free of duplicates.
+    expr_is_unique: bool = False
 
 
 class EquivalenceOp(BaseBinOp):
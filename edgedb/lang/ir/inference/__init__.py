@@ -19,3 +19,4 @@
 
 from .cardinality import infer_cardinality  # NOQA
 from .types import amend_empty_set_type, infer_type, is_polymorphic_type  # NOQA
+from .uniqueness import infer_is_unique  # NOQA
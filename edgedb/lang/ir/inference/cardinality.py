@@ -32,6 +32,8 @@ from edgedb.lang.schema import sources as s_sources
 
 from edgedb.lang.ir import ast as irast
 
+from . import stats
+
 
 ONE = irast.Cardinality.ONE
 MANY = irast.Cardinality.MANY
@@ -325,11 +327,17 @@ def __infer_map(ir, singletons, schema):
 
 
 def infer_cardinality(ir, singletons, schema):
-    try:
-        return ir._inferred_cardinality_[frozenset(singletons)]
-    except (AttributeError, KeyError):
-        pass
-
+    # Inference results are memoized on the IR node itself, so that
+    # every subtree is inferred at most once per set of singletons.
+    key = frozenset(singletons)
+    cache = getattr(ir, '_inferred_cardinality_', None)
+    if cache is not None:
+        result = cache.get(key)
+        if result is not None:
+            stats.cardinality.hits += 1
+            return result
+
+    stats.cardinality.misses += 1
     result = _infer_cardinality(ir, singletons, schema)
 
     if result not in {ONE, MANY}:
@@ -338,11 +346,9 @@ def infer_cardinality(ir, singletons, schema):
             'set produced by expression',
             context=ir.context)
 
-    try:
-        cache = ir._inferred_cardinality_
-    except AttributeError:
+    if cache is None:
         cache = ir._inferred_cardinality_ = {}
 
-    cache[frozenset(singletons)] = result
+    cache[key] = result
 
     return result
@@ -0,0 +1,42 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Memoization statistics of IR type and cardinality inference."""
+
+
+class CacheStats:
+    __slots__ = ('hits', 'misses')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self):
+        return self.hits, self.misses
+
+
+types = CacheStats()
+cardinality = CacheStats()
+
+
+def snapshot():
+    """Return the combined (hits, misses) of all inference memo tables."""
+    type_hits, type_misses = types.snapshot()
+    card_hits, card_misses = cardinality.snapshot()
+    return type_hits + card_hits, type_misses + card_misses
@@ -35,6 +35,8 @@ from edgedb.lang.edgeql import errors as ql_errors
 
 from edgedb.lang.ir import ast as irast
 
+from . import stats
+
 
 def is_polymorphic_type(t):
     if isinstance(t, s_types.Collection):
@@ -444,11 +446,12 @@ def __infer_struct_indirection(ir, schema):
 
 
 def infer_type(ir, schema):
-    try:
-        return ir._inferred_type_
-    except AttributeError:
-        pass
+    result = getattr(ir, '_inferred_type_', None)
+    if result is not None:
+        stats.types.hits += 1
+        return result
 
+    stats.types.misses += 1
     result = _infer_type(ir, schema)
 
     if (result is not None and
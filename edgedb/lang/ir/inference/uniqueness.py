@@ -0,0 +1,124 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Inference of whether an IR set is free of duplicate elements."""
+
+
+import functools
+
+from edgedb.lang.schema import objtypes as s_objtypes
+from edgedb.lang.schema import pointers as s_pointers
+
+from edgedb.lang.ir import ast as irast
+
+
+@functools.singledispatch
+def _infer_is_unique(ir, singletons, schema):
+    return False
+
+
+@_infer_is_unique.register(irast.EmptySet)
+def __infer_emptyset(ir, singletons, schema):
+    return True
+
+
+@_infer_is_unique.register(irast.Constant)
+@_infer_is_unique.register(irast.Parameter)
+def __infer_const_or_param(ir, singletons, schema):
+    return True
+
+
+@_infer_is_unique.register(irast.Set)
+def __infer_set(ir, singletons, schema):
+    if _is_singleton(ir, singletons):
+        return True
+    elif ir.rptr is not None:
+        return _is_unique_ptr_ref(ir.rptr, singletons, schema)
+    elif ir.expr is not None:
+        return infer_is_unique(ir.expr, singletons, schema)
+    else:
+        # A reference to the objects of a type or of its view.
+        return isinstance(ir.scls, s_objtypes.ObjectType)
+
+
+@_infer_is_unique.register(irast.SelectStmt)
+def __infer_select_stmt(ir, singletons, schema):
+    # FILTER, ORDER BY, OFFSET and LIMIT never introduce duplicates.
+    return (
+        ir.iterator_stmt is None and
+        infer_is_unique(ir.result, singletons, schema)
+    )
+
+
+@_infer_is_unique.register(irast.DistinctOp)
+def __infer_distinctop(ir, singletons, schema):
+    return True
+
+
+def _is_unique_ptr_ref(rptr, singletons, schema):
+    ptrcls = rptr.ptrcls
+
+    if (ptrcls.is_link_property() or
+            not infer_is_unique(rptr.source, singletons, schema)):
+        return False
+
+    if rptr.direction == s_pointers.PointerDirection.Outbound:
+        reverse = s_pointers.PointerDirection.Inbound
+    else:
+        reverse = s_pointers.PointerDirection.Outbound
+
+    if isinstance(rptr.target.scls, s_objtypes.ObjectType):
+        # Each target object is reached from at most one source.
+        return ptrcls.singular(reverse)
+
+    if ptrcls.is_id_pointer():
+        return True
+
+    # Delegated unique constraints only hold within each concrete
+    # subtype, so the constraint is trusted for leaf types only.
+    source_type = rptr.source.scls.peel_view()
+    if source_type.children(schema):
+        return False
+
+    unique_constr = schema.get('std::unique')
+    return any(
+        c.issubclass(unique_constr) and not c.is_abstract
+        for c in ptrcls.constraints.values()
+    )
+
+
+def _is_singleton(ir_set, singletons):
+    # Unlike infer_cardinality(), which infers the cardinality of an
+    # expression per element of the enclosing scope, this only
+    # recognizes sets that hold at most one element overall.
+    for path_id in ir_set.path_id.iter_weak_namespace_prefixes():
+        if path_id in singletons:
+            return True
+
+    rptr = ir_set.rptr
+    return (
+        rptr is not None and
+        rptr.ptrcls.singular(rptr.direction) and
+        _is_singleton(rptr.source, singletons)
+    )
+
+
+def infer_is_unique(ir, singletons, schema):
+    """Return True if *ir* is known not to contain duplicates."""
+    return _infer_is_unique(ir, singletons, schema)
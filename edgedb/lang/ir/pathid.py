@@ -17,54 +17,99 @@
 #
 
 
+import weakref
+
 from edgedb.lang.schema import scalars as s_scalars
 from edgedb.lang.schema import objtypes as s_objtypes
 from edgedb.lang.schema import pointers as s_pointers
 from edgedb.lang.schema import types as s_types
 
 
+_interned = weakref.WeakValueDictionary()
+
+
 class PathId:
     """Unique identifier of a path in an expression."""
 
-    __slots__ = ('_path', '_norm_path', '_namespace', '_is_ptr')
+    __slots__ = ('_path', '_norm_path', '_namespace', '_is_ptr', '_hash',
+                 '__weakref__')
 
-    def __init__(self, initializer=None, *, namespace=None):
+    def __new__(cls, initializer=None, *, namespace=None):
         if isinstance(initializer, PathId):
-            self._path = initializer._path
-            self._norm_path = initializer._norm_path
             if namespace is not None:
-                self._namespace = frozenset(namespace)
+                namespace = frozenset(namespace)
             else:
-                self._namespace = initializer._namespace
-            self._is_ptr = initializer._is_ptr
+                namespace = initializer._namespace
+            return cls._from_parts(
+                initializer._path, initializer._norm_path, namespace,
+                initializer._is_ptr)
         elif initializer is not None:
             if not isinstance(initializer, s_types.Type):
                 raise ValueError(
                     f'invalid PathId: bad source: {initializer!r}')
-            self._path = (initializer,)
+            path = (initializer,)
             if (initializer.is_view() and
                     initializer.peel_view().name == initializer.name):
                 # The initializer is a view that aliases its base type.
-                self._norm_path = (initializer.peel_view(),)
+                norm_path = (initializer.peel_view(),)
             else:
-                self._norm_path = (initializer,)
-            self._namespace = frozenset(namespace) if namespace else None
-            self._is_ptr = False
+                norm_path = (initializer,)
+        else:
+            path = norm_path = ()
+
+        namespace = frozenset(namespace) if namespace else None
+        return cls._from_parts(path, norm_path, namespace, False)
+
+    @classmethod
+    def _from_parts(cls, path, norm_path, namespace, is_ptr):
+        # PathIds are immutable and interned, so equal path ids are
+        # normally the same object.  The normalized path is derived
+        # from the raw path, so only the latter is part of the intern
+        # key.  Equal path ids may still differ in the raw path (a view
+        # and the type it aliases, or specialized links with the same
+        # shortname), and weak namespaces must not be confused with
+        # strong ones of the same name.
+        if namespace:
+            ns_key = frozenset(
+                (isinstance(ns, WeakNamespace), ns) for ns in namespace)
         else:
-            self._path = ()
-            self._norm_path = ()
-            self._namespace = frozenset(namespace) if namespace else None
-            self._is_ptr = False
+            ns_key = namespace
+
+        key = (cls, path, ns_key, is_ptr)
+        result = _interned.get(key)
+        if result is None:
+            result = object.__new__(cls)
+            result._path = path
+            result._norm_path = norm_path
+            result._namespace = namespace
+            result._is_ptr = is_ptr
+            result._hash = hash((cls, norm_path, namespace, is_ptr))
+            _interned[key] = result
+
+        return result
+
+    def __reduce__(self):
+        return (self._from_parts, (
+            self._path, self._norm_path, self._namespace, self._is_ptr))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __hash__(self):
-        return hash((
-            self.__class__, self._norm_path, self._namespace, self._is_ptr))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
         if not isinstance(other, PathId):
             return NotImplemented
 
         return (
+            self._hash == other._hash and
             self._norm_path == other._norm_path and
             self._namespace == other._namespace and
             self._is_ptr == other._is_ptr
@@ -89,16 +134,12 @@ class PathId:
             if stop_point and isinstance(stop_point[0], tuple):
                 raise KeyError(f'invalid PathId slice: {n!r}')
 
-            result = self.__class__()
-            result._path = self._path[n]
-            result._norm_path = self._norm_path[n]
-            result._namespace = self._namespace
+            # A link property ref may have been chopped off.
+            is_ptr = bool(
+                n.stop < len(self) and self._norm_path[n.stop][2])
 
-            if n.stop < len(self) and self._norm_path[n.stop][2]:
-                # A link property ref has been chopped off.
-                result._is_ptr = True
-
-            return result
+            return self._from_parts(
+                self._path[n], self._norm_path[n], self._namespace, is_ptr)
 
     def __str__(self):
         result = ''
@@ -146,12 +187,9 @@ class PathId:
     __repr__ = __str__
 
     def replace_namespace(self, namespace):
-        result = self.__class__()
-        result._path = self._path
-        result._norm_path = self._norm_path
-        result._namespace = frozenset(namespace) if namespace else None
-        result._is_ptr = self._is_ptr
-        return result
+        return self._from_parts(
+            self._path, self._norm_path,
+            frozenset(namespace) if namespace else None, self._is_ptr)
 
     def merge_namespace(self, namespace):
         if not self._namespace:
@@ -246,9 +284,8 @@ class PathId:
         if not self._is_ptr:
             return self
         else:
-            result = self.__class__(self)
-            result._is_ptr = False
-            return result
+            return self._from_parts(
+                self._path, self._norm_path, self._namespace, False)
 
     def iter_prefixes(self, include_ptr=False):
         yield self[:1]
@@ -269,12 +306,10 @@ class PathId:
         if self.startswith(prefix):
             prefix_len = len(prefix)
             if prefix_len < len(self):
-                result = self.__class__()
-                result._path = replacement._path + self._path[prefix_len:]
-                result._norm_path = \
-                    replacement._norm_path + self._norm_path[prefix_len:]
-                result._namespace = replacement._namespace
-                return result
+                return self._from_parts(
+                    replacement._path + self._path[prefix_len:],
+                    replacement._norm_path + self._norm_path[prefix_len:],
+                    replacement._namespace, False)
             else:
                 return replacement
         else:
@@ -297,22 +332,20 @@ class PathId:
         if is_linkprop and not self._is_ptr:
             raise ValueError('link property path extension on a non-link path')
 
-        result = self.__class__()
-        result._path = self._path + ((link, direction), target)
         lnk = (link.shortname, direction, is_linkprop)
         norm_target = target.material_type()
-        result._norm_path = self._norm_path + (lnk, norm_target)
-        result._namespace = self._namespace
 
-        return result
+        return self._from_parts(
+            self._path + ((link, direction), target),
+            self._norm_path + (lnk, norm_target),
+            self._namespace, False)
 
     def ptr_path(self):
         if self._is_ptr:
             return self
         else:
-            result = self.__class__(self)
-            result._is_ptr = True
-            return result
+            return self._from_parts(
+                self._path, self._norm_path, self._namespace, True)
 
     def is_objtype_path(self):
         return (
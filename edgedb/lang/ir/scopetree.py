@@ -68,15 +68,18 @@ class ScopeTreeNode:
 
     def __init__(self, *, path_id: typing.Optional[pathid.PathId]=None,
                  fenced: bool=False, unique_id: typing.Optional[int]=None):
-        self.unique_id = unique_id
-        self.path_id = path_id
+        self._parent = None
+        self._index = None
+        self._region_index = None
+        self._path_children = {}
+        self._unique_id = unique_id
+        self._path_id = path_id
         self.fenced = fenced
         self.protect_parent = False
         self.unnest_fence = False
         self.optional = False
         self.children = set()
         self.namespaces = set()
-        self._parent = None
 
     def __repr__(self):
         return (f'<{type(self).__name__} '
@@ -97,6 +100,42 @@ class ScopeTreeNode:
 
         return cp
 
+    @property
+    def unique_id(self) -> typing.Optional[int]:
+        return self._unique_id
+
+    @unique_id.setter
+    def unique_id(self, unique_id: typing.Optional[int]) -> None:
+        indexes = self._get_built_indexes()
+        for index in indexes:
+            index.discard(self)
+        self._unique_id = unique_id
+        for index in indexes:
+            index.add(self)
+
+    @property
+    def path_id(self) -> typing.Optional[pathid.PathId]:
+        return self._path_id
+
+    @path_id.setter
+    def path_id(self, path_id: typing.Optional[pathid.PathId]) -> None:
+        parent = self.parent
+        indexes = self._get_built_indexes()
+        for index in indexes:
+            index.discard(self)
+        if parent is not None and self._path_id is not None:
+            _discard(parent._path_children, _index_key(self._path_id), self)
+        self._path_id = path_id
+        if parent is not None and path_id is not None:
+            parent._path_children.setdefault(
+                _index_key(path_id), set()).add(self)
+        for index in indexes:
+            index.add(self)
+
+    def _get_built_indexes(self) -> typing.List['_ScopeTreeIndex']:
+        indexes = [self.root._index, self._region_owner._region_index]
+        return [index for index in indexes if index is not None]
+
     @property
     def name(self):
         if self.path_id is None:
@@ -427,12 +466,13 @@ class ScopeTreeNode:
             -> typing.Optional['ScopeTreeNode']:
         """Find the visible node with the given *path_id*."""
         namespaces = set()
+        key = _index_key(path_id)
 
         for node, ans in self.ancestors_and_namespaces:
             if _paths_equal(node.path_id, path_id, namespaces):
                 return node
 
-            for child in node.children:
+            for child in node._path_children.get(key, ()):
                 if _paths_equal(child.path_id, path_id, namespaces):
                     return child
 
@@ -452,7 +492,7 @@ class ScopeTreeNode:
 
     def find_child(self, path_id: pathid.PathId) \
             -> typing.Optional['ScopeTreeNode']:
-        for child in self.children:
+        for child in self._path_children.get(_index_key(path_id), ()):
             if child.path_id == path_id:
                 return child
 
@@ -473,9 +513,17 @@ class ScopeTreeNode:
         unnest_fence_seen = False
 
         for node, ans in self.ancestors_and_namespaces:
-            for descendant in node.unfenced_descendants:
-                if _paths_equal(descendant.path_id, path_id, namespaces):
-                    return descendant, unnest_fence_seen
+            # The unfenced descendants of a node are all in the region
+            # of its nearest fence.
+            candidates = [
+                candidate for candidate in
+                node._get_region_index().get_by_path_id(path_id)
+                if _paths_equal(candidate.path_id, path_id, namespaces)
+            ]
+
+            descendant = node._find_topmost_descendant(candidates)
+            if descendant is not None:
+                return descendant, unnest_fence_seen
 
             namespaces |= ans
             unnest_fence_seen = unnest_fence_seen or node.unnest_fence
@@ -484,11 +532,65 @@ class ScopeTreeNode:
 
     def find_by_unique_id(self, unique_id: int) \
             -> typing.Optional['ScopeTreeNode']:
-        for node in self.descendants:
-            if node.unique_id == unique_id:
-                return node
+        return self._find_topmost_descendant(
+            self._get_index().get_by_unique_id(unique_id))
 
-        return None
+    def _find_topmost_descendant(
+            self, candidates: typing.Iterable['ScopeTreeNode']) \
+            -> typing.Optional['ScopeTreeNode']:
+        """Return the topmost of *candidates* found in this subtree."""
+        found = None
+        found_depth = None
+
+        for candidate in candidates:
+            if candidate is self:
+                # Nothing can be shallower than self.
+                return self
+
+            depth = 0
+            for node in candidate.ancestors:
+                if node is self:
+                    break
+                depth += 1
+            else:
+                depth = None
+
+            if depth is not None and (found is None or depth < found_depth):
+                found = candidate
+                found_depth = depth
+
+        return found
+
+    def _get_index(self) -> '_ScopeTreeIndex':
+        """Return the index of all nodes of this tree."""
+        root = self.root
+        if root._index is None:
+            root._index = _ScopeTreeIndex()
+            root._index.add_nodes(root.descendants)
+        return root._index
+
+    @property
+    def _region_owner(self) -> 'ScopeTreeNode':
+        """The nearest fence (or the root if there is none)."""
+        node = self
+        while not node.fenced:
+            parent = node.parent
+            if parent is None:
+                break
+            node = parent
+        return node
+
+    def _get_region_index(self) -> '_ScopeTreeIndex':
+        """Return the index of the nodes in the region of this node.
+
+        A region is the set of nodes reachable from a fence without
+        crossing another fence.
+        """
+        owner = self._region_owner
+        if owner._region_index is None:
+            owner._region_index = _ScopeTreeIndex()
+            owner._region_index.add_nodes(owner.unfenced_descendants)
+        return owner._region_index
 
     def copy(self) -> 'ScopeTreeNode':
         """Return a complete copy of this subtree."""
@@ -531,16 +633,135 @@ class ScopeTreeNode:
         if parent is current_parent:
             return
 
+        if self._path_id is not None:
+            key = _index_key(self._path_id)
+        else:
+            key = None
+
         if current_parent is not None:
+            old_root = current_parent.root
             # Make sure no other node refers to us.
             current_parent.children.remove(self)
+            if key is not None:
+                _discard(current_parent._path_children, key, self)
+        else:
+            old_root = self
 
         if parent is not None:
+            new_root = parent.root
             self._parent = weakref.ref(parent)
             parent.children.add(self)
+            if key is not None:
+                parent._path_children.setdefault(key, set()).add(self)
         else:
+            new_root = self
             self._parent = None
 
+        if old_root is not new_root:
+            # The subtree moves to another tree, keep the lookup
+            # indexes of both trees current.
+            self._move_index_entries(
+                '_index', old_root, new_root, self.descendants)
+
+        if not self.fenced:
+            # The unfenced part of the subtree moves to another region.
+            self._move_index_entries(
+                '_region_index',
+                current_parent._region_owner
+                if current_parent is not None else self,
+                parent._region_owner if parent is not None else self,
+                self.unfenced_descendants)
+
+    def _move_index_entries(self, attr, old_owner, new_owner, nodes):
+        if old_owner is new_owner:
+            return
+
+        old_index = getattr(old_owner, attr)
+        new_index = getattr(new_owner, attr)
+
+        if old_owner is self:
+            # Detached subtrees build their own index lazily,
+            # and the old index of this node covers exactly the
+            # nodes being moved.
+            setattr(self, attr, None)
+            if new_index is not None:
+                if old_index is not None:
+                    new_index.update(old_index)
+                else:
+                    new_index.add_nodes(nodes)
+        else:
+            nodes = tuple(nodes)
+            if old_index is not None:
+                old_index.discard_nodes(nodes)
+            if new_index is not None:
+                new_index.add_nodes(nodes)
+
+
+class _ScopeTreeIndex:
+    """Path id and unique id lookup tables of a set of scope nodes.
+
+    The root node of a tree keeps the index of all nodes in the tree,
+    and fences keep the index of the nodes in their region.  Indexes
+    are built lazily and then maintained incrementally as nodes are
+    attached, removed or changed.
+    """
+
+    def __init__(self):
+        self.by_path_id = {}
+        self.by_unique_id = {}
+
+    def get_by_path_id(self, path_id: pathid.PathId) \
+            -> typing.AbstractSet[ScopeTreeNode]:
+        return self.by_path_id.get(_index_key(path_id), frozenset())
+
+    def get_by_unique_id(self, unique_id: int) \
+            -> typing.AbstractSet[ScopeTreeNode]:
+        return self.by_unique_id.get(unique_id, frozenset())
+
+    def add(self, node: ScopeTreeNode) -> None:
+        if node.path_id is not None:
+            self.by_path_id.setdefault(
+                _index_key(node.path_id), set()).add(node)
+        if node.unique_id is not None:
+            self.by_unique_id.setdefault(node.unique_id, set()).add(node)
+
+    def discard(self, node: ScopeTreeNode) -> None:
+        if node.path_id is not None:
+            _discard(self.by_path_id, _index_key(node.path_id), node)
+        if node.unique_id is not None:
+            _discard(self.by_unique_id, node.unique_id, node)
+
+    def add_nodes(self, nodes: typing.Iterable[ScopeTreeNode]) -> None:
+        for node in nodes:
+            self.add(node)
+
+    def discard_nodes(self, nodes: typing.Iterable[ScopeTreeNode]) -> None:
+        for node in nodes:
+            self.discard(node)
+
+    def update(self, other: '_ScopeTreeIndex') -> None:
+        for path_id, nodes in other.by_path_id.items():
+            self.by_path_id.setdefault(path_id, set()).update(nodes)
+        for unique_id, nodes in other.by_unique_id.items():
+            self.by_unique_id.setdefault(unique_id, set()).update(nodes)
+
+
+def _index_key(path_id: pathid.PathId) -> pathid.PathId:
+    # Nodes are indexed by path ids without namespaces, so that
+    # lookups that strip namespaces can use the index too.
+    if path_id.namespace:
+        return path_id.replace_namespace(None)
+    else:
+        return path_id
+
+
+def _discard(table, key, node):
+    nodes = table.get(key)
+    if nodes is not None:
+        nodes.discard(node)
+        if not nodes:
+            del table[key]
+
 
 def _paths_equal(path_id_1: pathid.PathId, path_id_2: pathid.PathId,
                  namespaces: typing.Set[str]) -> bool:
@@ -134,6 +134,7 @@ class DeclarationLoader:
         chain = itertools.chain.from_iterable
         for obj, decl in chain(t.items() for t in objects.values()):
             obj.bases = self._get_bases(obj, decl)
+            self._schema.drop_inheritance_cache(obj)
 
         # Now, with all objects in the declaration in the schema, we can
         # process them in the semantic dependency order.
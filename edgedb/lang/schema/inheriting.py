@@ -205,6 +205,7 @@ class RebaseNamedObject(named.NamedObjectCommand):
             index = {b.name: i for i, b in enumerate(bases)}
 
         scls.bases = bases
+        schema.drop_inheritance_cache(scls)
 
         return scls
 
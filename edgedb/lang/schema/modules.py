@@ -50,7 +50,7 @@ class Module(named.NamedObject):
 
     def copy(self):
         result = self.__class__(name=self.name, imports=self.imports)
-        for obj in self:
+        for obj in self.index_by_name.values():
             result.add(obj.copy())
         return result
 
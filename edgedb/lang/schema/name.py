@@ -17,11 +17,13 @@
 #
 
 
+import weakref
+
 from .error import SchemaNameError
 
 
 class SchemaName(str):
-    __slots__ = ('module', 'name')
+    __slots__ = ('module', 'name', '__weakref__')
 
     def __new__(cls, name, module=None):
         if not name:
@@ -64,6 +66,25 @@ class SchemaName(str):
 Name = SchemaName
 
 
+_interned_names = weakref.WeakValueDictionary()
+
+
+def intern_name(name):
+    """Return the canonical instance of a given SchemaName.
+
+    Schema objects routinely hold many equal, but distinct, name
+    instances (bases, pointer keys, references).  Interning lets them
+    share one.  Values that are not SchemaName instances are returned
+    as is.
+    """
+    if name.__class__ is not SchemaName:
+        return name
+
+    # Key by the components: a key that is the name itself would
+    # keep the weakly referenced value alive forever.
+    return _interned_names.setdefault((name.module, name.name), name)
+
+
 def split_name(name):
     if isinstance(name, SchemaName):
         module = name.module
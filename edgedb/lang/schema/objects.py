@@ -140,10 +140,15 @@ class Object(struct.MixedStruct, metaclass=ObjectMeta):
     def get_canonical_class(cls):
         return cls
 
-    def __init__(self, **kwargs):
-        self._attr_sources = {}
-        self._attr_source_contexts = {}
-        super().__init__(**kwargs)
+    # Allocated on first use: most objects never record source contexts.
+    _attr_sources = None
+    _attr_source_contexts = None
+
+    def _check_field_type(self, field, name, value):
+        value = super()._check_field_type(field, name, value)
+        if value.__class__ is sn.SchemaName:
+            value = sn.intern_name(value)
+        return value
 
     def hash_criteria_fields(self):
         for fn, f in self.__class__.get_fields(sorted=True).items():
@@ -188,7 +193,7 @@ class Object(struct.MixedStruct, metaclass=ObjectMeta):
             changed = current != value
 
         if changed:
-            self._attr_sources[name] = source
+            self._set_attribute_source(name, source)
             setattr(self, name, value)
             if dctx is not None:
                 dctx.current().op.add(sd.AlterObjectProperty(
@@ -197,14 +202,23 @@ class Object(struct.MixedStruct, metaclass=ObjectMeta):
                     source=source
                 ))
             if source_context is not None:
+                if self._attr_source_contexts is None:
+                    self._attr_source_contexts = {}
                 self._attr_source_contexts[name] = source_context
 
     def get_attribute_source_context(self, name):
+        if self._attr_source_contexts is None:
+            return None
         return self._attr_source_contexts.get(name)
 
+    def _set_attribute_source(self, name, source):
+        if self._attr_sources is None:
+            self._attr_sources = {}
+        self._attr_sources[name] = source
+
     def set_default_value(self, field_name, value):
         setattr(self, field_name, value)
-        self._attr_sources[field_name] = 'default'
+        self._set_attribute_source(field_name, 'default')
 
     def persistent_hash(self):
         """Compute object 'snapshot' hash.
@@ -697,7 +711,7 @@ class NamedObject(Object):
             if cached[0] == self.name:
                 return cached[1]
 
-        shortname = self.get_shortname(self.name)
+        shortname = sn.intern_name(self.get_shortname(self.name))
         self._cached_shortname = (self.name, shortname)
         return shortname
 
@@ -771,11 +785,12 @@ class ObjectRef(Object):
 
 
 class ObjectCollection:
-    pass
+    __slots__ = ()
 
 
 class ObjectDict(typed.OrderedTypedDict, ObjectCollection,
                  keytype=str, valuetype=Object):
+    __slots__ = ()
 
     def persistent_hash(self):
         vals = []
@@ -810,6 +825,8 @@ class ObjectDict(typed.OrderedTypedDict, ObjectCollection,
 
 
 class ObjectSet(typed.TypedSet, ObjectCollection, type=Object):
+    __slots__ = ()
+
     @classmethod
     def merge_values(cls, ours, theirs, schema):
         if ours is None and theirs is not None:
@@ -552,7 +552,7 @@ class ReferencingObject(inheriting.InheritingObject,
         local_coll = getattr(self, local_attr)
         all_coll = getattr(self, attr)
 
-        key = obj.get_shortname(obj.name)
+        key = sn.intern_name(obj.get_shortname(obj.name))
         existing = local_coll.get(key)
         if existing is not None and not replace:
             msg = '{} {!r} is already present in {!r}'.format(
@@ -25,6 +25,7 @@ from edgedb.lang.common.persistent_hash import persistent_hash
 from . import error as s_err
 from . import modules as s_modules
 from . import name as schema_name
+from . import objects as so
 
 
 _void = object()
@@ -47,6 +48,9 @@ class Schema(TypeContainer):
         self._policy_schema = None
         self._virtual_inheritance_cache = {}
         self._inheritance_cache = {}
+        self._ptr_specializations_cache = {}
+        self._lookup_cache = {}
+        self._generation = 0
 
     def copy(self):
         result = type(self)()
@@ -65,6 +69,8 @@ class Schema(TypeContainer):
         name = class_module.name
         self.modules[name] = class_module
         self._policy_schema = None
+        self._inheritance_cache.clear()
+        self._invalidate_lookup_cache()
 
     def get_module(self, module):
         return self.modules[module]
@@ -84,6 +90,8 @@ class Schema(TypeContainer):
             module_name = class_module.name
 
         del self.modules[module_name]
+        self._inheritance_cache.clear()
+        self._invalidate_lookup_cache()
 
     def add_delta(self, delta):
         """Add a delta to the schema.
@@ -117,6 +125,8 @@ class Schema(TypeContainer):
                 f'module {obj.name.module!r} is not in this schema') from e
 
         module.add(obj)
+        self._inheritance_cache.pop(obj._type, None)
+        self._invalidate_lookup_cache()
 
     def discard(self, obj):
         try:
@@ -124,6 +134,8 @@ class Schema(TypeContainer):
         except KeyError:
             return
 
+        self._inheritance_cache.pop(obj._type, None)
+        self._invalidate_lookup_cache()
         return module.discard(obj)
 
     def delete(self, obj):
@@ -133,6 +145,8 @@ class Schema(TypeContainer):
             raise s_err.SchemaModuleNotFoundError(
                 f'module {obj.name.module} is not in this schema') from e
 
+        self._inheritance_cache.pop(obj._type, None)
+        self._invalidate_lookup_cache()
         return module.delete(obj)
 
     def clear(self):
@@ -140,6 +154,18 @@ class Schema(TypeContainer):
         self._virtual_inheritance_cache.clear()
         self._inheritance_cache.clear()
         self._policy_schema = None
+        self._invalidate_lookup_cache()
+
+    def _invalidate_lookup_cache(self):
+        self._generation += 1
+        self._lookup_cache.clear()
+        self._drop_inheritance_closure()
+
+    def _get_lookup_cache(self):
+        return self._lookup_cache
+
+    def _get_generation(self):
+        return self._generation
 
     def reorder(self, new_order):
         by_module = {}
@@ -165,7 +191,7 @@ class Schema(TypeContainer):
 
         return modules
 
-    def _get(self, name, *, getter, default, module_aliases):
+    def _get(self, name, *, getter, default, module_aliases, cache_key=None):
         name, module, nqname = schema_name.split_name(name)
         implicit_builtins = module is None
 
@@ -175,6 +201,27 @@ class Schema(TypeContainer):
             if fq_module is not None:
                 module = fq_module
 
+        if cache_key is not None:
+            # Lookups are keyed by the alias-resolved module, so
+            # different alias maps resolving to the same module share
+            # the entry.
+            cache = self._get_lookup_cache()
+            key = (cache_key, module, nqname, implicit_builtins)
+            result = cache.get(key, _void)
+            if result is _void:
+                result = self._get_uncached(
+                    module, nqname, implicit_builtins, getter=getter)
+                cache[key] = result
+        else:
+            result = self._get_uncached(
+                module, nqname, implicit_builtins, getter=getter)
+
+        if result is None:
+            return default
+        else:
+            return result
+
+    def _get_uncached(self, module, nqname, implicit_builtins, *, getter):
         class_modules = self._resolve_module(module)
 
         if class_modules:
@@ -188,7 +235,7 @@ class Schema(TypeContainer):
             if result is not None:
                 return result
 
-        return default
+        return None
 
     def get_functions(self, name, default=_void, *, module_aliases=None):
         def getter(modules, name):
@@ -200,7 +247,8 @@ class Schema(TypeContainer):
         funcs = self._get(name,
                           getter=getter,
                           module_aliases=module_aliases,
-                          default=default)
+                          default=default,
+                          cache_key=('get_functions',))
 
         if funcs is not _void:
             return funcs
@@ -218,7 +266,8 @@ class Schema(TypeContainer):
         obj = self._get(name,
                         getter=getter,
                         module_aliases=module_aliases,
-                        default=default)
+                        default=default,
+                        cache_key=('get', type))
 
         if obj is not _void:
             return obj
@@ -240,15 +289,48 @@ class Schema(TypeContainer):
 
         class_children.update(c.name for c in children if c is not scls)
         scls._virtual_children = set(children)
+        self._drop_inheritance_closure()
 
     def drop_inheritance_cache(self, scls):
-        self._inheritance_cache.pop(scls.name, None)
+        self._inheritance_cache.pop(getattr(scls, '_type', None), None)
+        self._drop_inheritance_closure()
 
     def drop_inheritance_cache_for_child(self, scls):
-        bases = getattr(scls, 'bases', ())
+        self._inheritance_cache.pop(getattr(scls, '_type', None), None)
+        self._drop_inheritance_closure()
+
+    def _drop_inheritance_closure(self):
+        self._ptr_specializations_cache.clear()
 
-        for base in bases:
-            self._inheritance_cache.pop(base.name, None)
+    def _get_inheritance_index(self, type):
+        """Return a {base name: {child names}} map for the given type.
+
+        The index is built in a single pass over all non-derived objects
+        of *type* and is kept until an object of that type is added,
+        removed or rebased.
+        """
+        try:
+            index = self._inheritance_cache[type]
+        except KeyError:
+            index = self._inheritance_cache[type] = \
+                self._build_inheritance_index(type)
+
+        return index
+
+    def _build_inheritance_index(self, type):
+        index = {}
+
+        for obj in self.get_objects(type=type):
+            for base in getattr(obj, 'bases', None) or ():
+                if isinstance(base, so.ObjectRef):
+                    continue
+                try:
+                    child_names = index[base.name]
+                except KeyError:
+                    child_names = index[base.name] = set()
+                child_names.add(obj.name)
+
+        return index
 
     def _get_descendants(self, scls, *, max_depth=None, depth=0):
         result = set()
@@ -256,12 +338,8 @@ class Schema(TypeContainer):
         try:
             children = scls._virtual_children
         except AttributeError:
-            try:
-                child_names = self._inheritance_cache[scls.name]
-                raise KeyError
-            except KeyError:
-                child_names = self._find_children(scls)
-                self._inheritance_cache[scls.name] = child_names
+            index = self._get_inheritance_index(scls._type)
+            child_names = index.get(scls.name, ())
         else:
             child_names = [c.material_type().name for c in children]
 
@@ -276,10 +354,38 @@ class Schema(TypeContainer):
         result.update(children)
         return result
 
-    def _find_children(self, scls):
-        flt = lambda p: scls in p.bases
-        it = self.get_objects(type=scls._type)
-        return {c.name for c in filter(flt, it)}
+    def get_pointer_specializations(self, source, name):
+        """Return material pointers *name* of *source* and its descendants.
+
+        The result is a tuple of distinct pointer classes in which the
+        pointer defined on *source* itself (if any) comes first.
+        """
+        if source.is_derived:
+            return self._find_pointer_specializations(source, name)
+
+        key = (source.name, name)
+        try:
+            result = self._ptr_specializations_cache[key]
+        except KeyError:
+            result = self._ptr_specializations_cache[key] = \
+                self._find_pointer_specializations(source, name)
+
+        return result
+
+    def _find_pointer_specializations(self, source, name):
+        result = []
+        descendants = sorted(source.descendants(self), key=lambda s: s.name)
+
+        for src in [source] + descendants:
+            try:
+                ptrcls = src.pointers[name].material_type()
+            except KeyError:
+                continue
+            else:
+                if ptrcls not in result:
+                    result.append(ptrcls)
+
+        return tuple(result)
 
     def get_event_policy(self, subject_class, event_class):
         from . import policy as spol
@@ -330,9 +436,12 @@ class SchemaOverlay(Schema):
         self._local_vic = {}
         self._virtual_inheritance_cache = collections.ChainMap(
             self._local_vic, schema._virtual_inheritance_cache)
-        self._local_ic = {}
-        self._inheritance_cache = collections.ChainMap(
-            self._local_ic, schema._inheritance_cache)
+        self._inheritance_cache = {}
+        self._ptr_specializations_cache = {}
+        self._has_local_material = False
+        self._lookup_cache = {}
+        self._lookup_cache_gen = schema._get_generation()
+        self._generation = 0
 
         if extra:
             for v in extra.values():
@@ -342,6 +451,18 @@ class SchemaOverlay(Schema):
     def has_module(self, module):
         return module in self.modules
 
+    def _get_lookup_cache(self):
+        # Results may come from the underlying schema, so the cache
+        # must be dropped whenever that schema changes as well.
+        generation = self.schema._get_generation()
+        if self._lookup_cache_gen != generation:
+            self._lookup_cache.clear()
+            self._lookup_cache_gen = generation
+        return self._lookup_cache
+
+    def _get_generation(self):
+        return (self._generation, self.schema._get_generation())
+
     def get_modules(self):
         yield from self.local_modules.values()
         yield from self.schema.get_modules()
@@ -350,8 +471,25 @@ class SchemaOverlay(Schema):
         if obj.name.module not in self.local_modules:
             self.local_modules[obj.name.module] = s_modules.Module(
                 name=obj.name.module)
+        if not getattr(obj, 'is_derived', None):
+            self._has_local_material = True
         super().add(obj)
 
+    def _get_inheritance_index(self, type):
+        # Derived objects never participate in the inheritance index,
+        # so unless the overlay holds material objects of its own,
+        # the (longer-lived) index of the underlying schema applies.
+        if self._has_local_material:
+            return self._build_inheritance_index(type)
+        else:
+            return self.schema._get_inheritance_index(type)
+
+    def get_pointer_specializations(self, source, name):
+        if self._has_local_material:
+            return self._find_pointer_specializations(source, name)
+        else:
+            return self.schema.get_pointer_specializations(source, name)
+
     def _resolve_module(self, module_name) -> typing.List[s_modules.Module]:
         modules = []
         if module_name is not None:
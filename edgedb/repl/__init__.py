@@ -392,6 +392,9 @@ class Cli:
             buf['EdgeQL->IR'] = r(timings.get('compile_eql_to_ir'))
         if timings.get('compile_ir_to_sql'):
             buf['IR->SQL'] = r(timings.get('compile_ir_to_sql'))
+        if timings.get('inference_cache_hit_rate') is not None:
+            buf['Inference cache'] = \
+                f"{timings['inference_cache_hit_rate']:.0%} hits"
         if timings.get('execution'):
             buf['Exec'] = r(timings.get('execution'))
 
@@ -133,6 +133,9 @@ def _init_cluster(data_dir_or_pg_cluster=None, *,
     else:
         _env = {}
 
+    # Keep the AST consistency checks on in the server under test.
+    _env['EDGEDB_AST_CHECKS'] = '1'
+
     if data_dir_or_pg_cluster is None:
         cluster = edgedb_cluster.TempCluster(env=_env)
         destroy = True
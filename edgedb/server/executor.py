@@ -24,6 +24,7 @@ from edgedb.lang.schema import delta as s_delta
 from edgedb.lang.schema import deltas as s_deltas
 from edgedb.lang.common import exceptions
 from edgedb.server import query as edgedb_query
+from edgedb.server.pgsql import common
 
 from . import planner
 
@@ -39,24 +40,36 @@ async def execute_plan(plan, protocol):
 
     elif isinstance(plan, planner.TransactionStatement):
         if plan.op == 'start':
-            protocol.transactions.append(backend.connection.transaction())
-            await protocol.transactions[-1].start()
+            transaction = backend.connection.transaction()
+            await transaction.start()
+            # Remember the schema version the transaction (or savepoint)
+            # started with to avoid reloading the schema on rollback
+            # unless it was actually changed.
+            protocol.transactions.append(
+                (transaction, backend.schema_version))
 
         elif plan.op == 'commit':
             if not protocol.transactions:
                 raise exceptions.NoActiveTransactionError(
                     'there is no transaction in progress')
-            transaction = protocol.transactions.pop()
-            await transaction.commit()
+            transaction, _ = protocol.transactions.pop()
+            try:
+                await transaction.commit()
+            finally:
+                _end_cursors(protocol, transaction, committed=True)
 
         elif plan.op == 'rollback':
             if not protocol.transactions:
                 raise exceptions.NoActiveTransactionError(
                     'there is no transaction in progress')
-            transaction = protocol.transactions.pop()
-            await transaction.rollback()
-            await backend.invalidate_schema_cache()
-            await backend.getschema()
+            transaction, schema_version = protocol.transactions.pop()
+            try:
+                await transaction.rollback()
+            finally:
+                _end_cursors(protocol, transaction, committed=False)
+            if backend.schema_version != schema_version:
+                await backend.invalidate_schema_cache()
+                await backend.getschema()
 
         else:
             raise exceptions.InternalError(
@@ -68,11 +81,7 @@ async def execute_plan(plan, protocol):
             return [r[0] for r in await ps.fetch()]
 
         except asyncpg.PostgresError as e:
-            _error = await backend.translate_pg_error(plan, e)
-            if _error is not None:
-                raise _error from e
-            else:
-                raise
+            await _raise_translated_error(backend, plan, e)
 
     elif isinstance(plan, irast.SessionStateCmd):
         # SET command
@@ -81,3 +90,79 @@ async def execute_plan(plan, protocol):
 
     else:
         raise exceptions.InternalError('unexpected plan: {!r}'.format(plan))
+
+
+async def open_cursor(plan, name, protocol):
+    """Declare a Postgres cursor *name* for the query *plan*.
+
+    The cursor lives until the end of the outermost transaction, unless
+    the savepoint it was declared in is rolled back.
+    """
+    backend = protocol.backend
+
+    if not isinstance(plan, edgedb_query.Query):
+        raise exceptions.InternalError(
+            'unexpected cursor plan: {!r}'.format(plan))
+
+    if not protocol.transactions:
+        raise exceptions.NoActiveTransactionError(
+            'cursors can only be used inside a transaction')
+
+    try:
+        await backend.connection.execute(
+            'DECLARE {} NO SCROLL CURSOR FOR {}'.format(
+                common.quote_ident(name), plan.text))
+
+    except asyncpg.PostgresError as e:
+        await _raise_translated_error(backend, plan, e)
+
+
+async def fetch_cursor(plan, name, count, protocol):
+    """Fetch the next *count* rows from a cursor declared by open_cursor()."""
+    backend = protocol.backend
+
+    try:
+        return [r[0] for r in await backend.connection.fetch(
+            'FETCH FORWARD {:d} FROM {}'.format(
+                count, common.quote_ident(name)))]
+
+    except asyncpg.PostgresError as e:
+        await _raise_translated_error(backend, plan, e)
+
+
+async def close_cursor(plan, name, protocol):
+    """Close a cursor declared by open_cursor()."""
+    backend = protocol.backend
+
+    try:
+        await backend.connection.execute(
+            'CLOSE {}'.format(common.quote_ident(name)))
+
+    except asyncpg.PostgresError as e:
+        await _raise_translated_error(backend, plan, e)
+
+
+def _end_cursors(protocol, transaction, *, committed):
+    # Postgres closes the cursors declared in a savepoint when it is
+    # rolled back, and all cursors when the transaction ends.  A cursor
+    # declared in a released savepoint stays open and now belongs to the
+    # enclosing transaction.
+    if committed and protocol.transactions:
+        parent, _ = protocol.transactions[-1]
+    else:
+        parent = None
+
+    for cursor_id, (name, plan, owner) in list(protocol.cursors.items()):
+        if owner is transaction or not protocol.transactions:
+            if parent is not None:
+                protocol.cursors[cursor_id] = (name, plan, parent)
+            else:
+                del protocol.cursors[cursor_id]
+
+
+async def _raise_translated_error(backend, plan, error):
+    _error = await backend.translate_pg_error(plan, error)
+    if _error is not None:
+        raise _error from error
+    else:
+        raise error
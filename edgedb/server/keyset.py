@@ -0,0 +1,321 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Keyset pagination of ordered SELECT queries.
+
+A paginated query is always ordered by its ORDER BY keys followed by
+the object id, which makes the order total.  The continuation token
+returned for a page references the last object of that page.  The next
+page is selected by looking that object up by id (an index seek) and
+filtering the query with a row comparison against its sort keys, so
+fetching a deep page costs the same as fetching the first one.
+
+If the anchor object has been deleted, the row comparison has nothing
+to compare against, so the page must be rejected instead.  Object ids
+are never reused, which makes checking that the anchor still exists
+after the page is fetched sufficient.
+"""
+
+
+import base64
+import copy
+import hashlib
+import json
+
+from edgedb.lang.common import ast
+from edgedb.lang.edgeql import ast as qlast
+from edgedb.lang.edgeql import codegen as qlcodegen
+from edgedb.lang.edgeql import errors
+
+
+ANCHOR_ALIAS = '__keyset_anchor__'
+
+
+class Page:
+    """Pagination state of a single SELECT statement."""
+
+    def __init__(self, fingerprint, limit, strip_id, anchor_check=None):
+        self.fingerprint = fingerprint
+        self.limit = limit
+        self.strip_id = strip_id
+        # A query returning whether the anchor object of the
+        # continuation token still exists.
+        self.anchor_check = anchor_check
+
+    def check_anchor(self, rows):
+        """Raise an error unless *rows* of :attr:`anchor_check` are true."""
+        if rows != [True]:
+            raise errors.EdgeQLError(
+                'continuation anchor no longer exists')
+
+    def get_continuation(self, rows):
+        """Return the continuation token for the page in *rows*.
+
+        Returns None when *rows* is known to be the last page.  The
+        object ids injected into the shape by :func:`paginate` are
+        removed from *rows* in place.
+        """
+        if not rows:
+            return None
+
+        last = rows[-1]
+        last_id = last['id'] if isinstance(last, dict) else last
+
+        if self.strip_id:
+            for row in rows:
+                row.pop('id', None)
+
+        if self.limit is not None and len(rows) < self.limit:
+            return None
+
+        return encode_continuation(self.fingerprint, last_id)
+
+
+def encode_continuation(fingerprint, object_id):
+    token = json.dumps([fingerprint, str(object_id)]).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('ascii')
+
+
+def decode_continuation(token):
+    try:
+        fingerprint, object_id = json.loads(
+            base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, TypeError, AttributeError):
+        raise errors.EdgeQLError('invalid continuation token') from None
+
+    return fingerprint, object_id
+
+
+def paginate(stmt, continuation=None):
+    """Prepare *stmt* for keyset pagination.
+
+    Returns a rewritten copy of *stmt* and its :class:`Page` state.  If
+    *continuation* is given, the returned statement selects the page
+    that follows the one the token was returned for.
+    """
+    if type(stmt) is not qlast.SelectQuery:
+        raise errors.EdgeQLError(
+            'keyset pagination is only supported for SELECT queries',
+            context=stmt.context)
+
+    root = _get_result_root(stmt)
+    fingerprint = _fingerprint(stmt)
+
+    stmt = copy.deepcopy(stmt)
+    id_key = _id_path(partial=True)
+    keys = [(sortexpr.path, sortexpr.direction, sortexpr.nones_order)
+            for sortexpr in stmt.orderby]
+    keys.append((id_key, qlast.SortAsc, None))
+    stmt.orderby = list(stmt.orderby) + [
+        qlast.SortExpr(path=id_key, direction=qlast.SortAsc)]
+
+    strip_id = False
+    if isinstance(stmt.result, qlast.Shape):
+        if not any(_is_id_element(el) for el in stmt.result.elements):
+            stmt.result.elements.append(
+                qlast.ShapeElement(expr=_id_path()))
+            strip_id = True
+
+    if isinstance(stmt.limit, qlast.Constant):
+        limit = stmt.limit.value
+    else:
+        limit = None
+
+    anchor_check = None
+
+    if continuation is not None:
+        token_fingerprint, anchor_id = decode_continuation(continuation)
+        if token_fingerprint != fingerprint:
+            raise errors.EdgeQLError(
+                'continuation token does not match the query',
+                context=stmt.context)
+
+        stmt.aliases = list(stmt.aliases or []) + [
+            qlast.AliasedExpr(
+                alias=ANCHOR_ALIAS,
+                expr=_anchor_query(root, anchor_id))]
+
+        seek = _seek_condition(
+            [(key, _anchor_key(key, root, stmt.result_alias),
+              direction, nones_order)
+             for key, direction, nones_order in keys])
+
+        if stmt.where is not None:
+            stmt.where = qlast.BinOp(
+                left=stmt.where, op=qlast.AND, right=seek)
+        else:
+            stmt.where = seek
+
+        # OFFSET only applies to the first page.
+        stmt.offset = None
+
+        anchor_check = qlast.SelectQuery(
+            aliases=[copy.deepcopy(alias) for alias in stmt.aliases
+                     if isinstance(alias, qlast.ModuleAliasDecl)],
+            result=qlast.ExistsPredicate(
+                expr=_anchor_query(root, anchor_id)))
+
+    return stmt, Page(fingerprint, limit, strip_id, anchor_check)
+
+
+def _get_result_root(stmt):
+    result = stmt.result
+    if isinstance(result, qlast.Shape):
+        result = result.expr
+
+    if (not isinstance(result, qlast.Path) or len(result.steps) != 1 or
+            not isinstance(result.steps[0], qlast.ObjectRef)):
+        raise errors.EdgeQLError(
+            'keyset pagination requires a SELECT of an object type',
+            context=stmt.result.context)
+
+    return result.steps[0]
+
+
+def _fingerprint(stmt):
+    # The page size may change between pages, the query may not.
+    stmt = copy.copy(stmt)
+    stmt.offset = stmt.limit = None
+    source = qlcodegen.generate_source(stmt)
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+def _id_path(*, partial=False):
+    return qlast.Path(
+        steps=[qlast.Ptr(ptr=qlast.ObjectRef(name='id'))],
+        partial=partial)
+
+
+def _is_id_element(element):
+    return (
+        element.compexpr is None and
+        isinstance(element.expr, qlast.Path) and
+        len(element.expr.steps) == 1 and
+        isinstance(element.expr.steps[0], qlast.Ptr) and
+        element.expr.steps[0].ptr.name == 'id' and
+        element.expr.steps[0].ptr.module in {None, 'std'}
+    )
+
+
+def _anchor_query(root, anchor_id):
+    return qlast.SelectQuery(
+        result=qlast.DetachedExpr(
+            expr=qlast.Path(
+                steps=[qlast.ObjectRef(name=root.name, module=root.module)])),
+        where=qlast.BinOp(
+            left=_id_path(partial=True),
+            op=ast.ops.EQ,
+            right=qlast.TypeCast(
+                expr=qlast.Constant(value=anchor_id),
+                type=qlast.TypeName(
+                    maintype=qlast.ObjectRef(name='uuid', module='std')))),
+        limit=qlast.Constant(value=1))
+
+
+def _anchor_key(key, root, result_alias):
+    """Rewrite the sort key *key* to refer to the anchor object."""
+    anchor = qlast.ObjectRef(name=ANCHOR_ALIAS)
+
+    if isinstance(key, qlast.Path):
+        if key.partial:
+            return qlast.Path(steps=[anchor] + copy.deepcopy(key.steps))
+
+        first = key.steps[0]
+        if isinstance(first, qlast.ObjectRef) and (
+                (first.module is None and first.name == result_alias) or
+                (first.module == root.module and first.name == root.name)):
+            return qlast.Path(steps=[anchor] + copy.deepcopy(key.steps[1:]))
+
+    raise errors.EdgeQLError(
+        'keyset pagination requires ORDER BY keys to be paths '
+        'on the selected object', context=key.context)
+
+
+def _seek_condition(keys):
+    # (k1, k2, ...) > (a1, a2, ...) expanded to
+    # k1 > a1 OR (k1 = a1 AND (k2 > a2 OR (...))), with the comparison
+    # flipped for descending keys.  The last key is always the object
+    # id, other keys may be empty, so their terms follow the placement
+    # of empty keys in the ORDER BY.
+    condition = None
+
+    for i, (key, anchor_key, direction, nones_order) in \
+            enumerate(reversed(keys)):
+        if i == 0:
+            step = _key_after(key, anchor_key, direction)
+        else:
+            step = _optional_key_after(
+                key, anchor_key, direction, nones_order)
+
+        if condition is not None:
+            tie = qlast.BinOp(
+                left=_optional_key_tie(key, anchor_key),
+                op=qlast.AND,
+                right=condition)
+            step = qlast.BinOp(left=step, op=qlast.OR, right=tie)
+
+        condition = step
+
+    return condition
+
+
+def _key_after(key, anchor_key, direction):
+    op = ast.ops.LT if direction == qlast.SortDesc else ast.ops.GT
+    return qlast.BinOp(
+        left=copy.deepcopy(key), op=op, right=copy.deepcopy(anchor_key))
+
+
+def _optional_key_after(key, anchor_key, direction, nones_order):
+    # (k > a) ?? False, OR-ed with the case of exactly one of the keys
+    # being empty: empty keys sort first in ascending order by default.
+    if nones_order is None:
+        empty_first = direction != qlast.SortDesc
+    else:
+        empty_first = nones_order == qlast.NonesFirst
+
+    if empty_first:
+        empty, nonempty = anchor_key, key
+    else:
+        empty, nonempty = key, anchor_key
+
+    return qlast.BinOp(
+        left=qlast.Coalesce(args=[
+            _key_after(key, anchor_key, direction),
+            qlast.Constant(value=False)]),
+        op=qlast.OR,
+        right=qlast.BinOp(
+            left=qlast.ExistsPredicate(expr=copy.deepcopy(nonempty)),
+            op=qlast.AND,
+            right=_not_exists(empty)))
+
+
+def _optional_key_tie(key, anchor_key):
+    # (k = a) ?? (NOT EXISTS k AND NOT EXISTS a)
+    return qlast.Coalesce(args=[
+        qlast.BinOp(
+            left=copy.deepcopy(key), op=ast.ops.EQ,
+            right=copy.deepcopy(anchor_key)),
+        qlast.BinOp(
+            left=_not_exists(key), op=qlast.AND,
+            right=_not_exists(anchor_key))])
+
+
+def _not_exists(expr):
+    return qlast.UnaryOp(
+        op=qlast.NOT,
+        operand=qlast.ExistsPredicate(expr=copy.deepcopy(expr)))
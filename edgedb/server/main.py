@@ -29,6 +29,7 @@ import sys
 import click
 from asyncpg import cluster as pg_cluster
 
+from edgedb.lang.common import ast
 from edgedb.lang.common import exceptions
 
 from . import cluster as edgedb_cluster
@@ -204,10 +205,17 @@ def run_server(args):
     '--daemon-user', type=int)
 @click.option(
     '--daemon-group', type=int)
+@click.option(
+    '--ast-checks', is_flag=True, envvar='EDGEDB_AST_CHECKS',
+    help=('check the field types of AST nodes and maintain their parent '
+          'links (slow, meant for the test suite)'))
 def main(**kwargs):
     logsetup.setup_logging(kwargs['log_level'], kwargs['log_to'])
     exceptions.install_excepthook()
 
+    if not kwargs['ast_checks']:
+        ast.enable_fast_mode()
+
     if kwargs['background']:
         daemon_opts = {'detach_process': True}
         pidfile = os.path.join(
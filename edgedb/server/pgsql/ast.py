@@ -311,7 +311,8 @@ class Query(BaseRelation, EdgeQLPathInfo):
 
     # Ignore the below fields in AST visitor/transformer.
     __ast_meta__ = {'ptr_join_map', 'path_rvar_map', 'path_namespace',
-                    'view_path_id_map', 'argnames', 'nullable'}
+                    'view_path_id_map', 'argnames', 'nullable',
+                    'output_descriptor'}
 
     view_path_id_map: typing.Dict[irast.PathId, irast.PathId]
     # Map of RangeVars corresponding to pointer relations.
@@ -322,6 +323,8 @@ class Query(BaseRelation, EdgeQLPathInfo):
     path_namespace: dict
 
     argnames: typing.Dict[str, int]
+    # Descriptor of the NATIVE format output of the top-level query.
+    output_descriptor: typing.Optional[dict]
 
     ctes: typing.List[CommonTableExpr]
 
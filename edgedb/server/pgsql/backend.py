@@ -155,10 +155,10 @@ class Query(backend_query.Query):
         self.text = ''.join(self.chunks)
 
     def get_output_format_info(self):
-        if self.output_format == 'json':
-            return ('json', 1)
-        else:
+        if self.output_format == compiler.OutputFormat.NATIVE:
             return ('edgedbobj', 1)
+        else:
+            return ('json', 1)
 
     def get_output_metadata(self):
         return {'record_info': self.record_info}
@@ -292,6 +292,8 @@ class Backend(s_deltarepo.DeltaProvider):
 
     def __init__(self, connection):
         self.schema = None
+        # Incremented whenever the schema is modified or reloaded.
+        self.schema_version = 0
         self.modaliases = {None: 'default'}
 
         self._constr_mech = schemamech.ConstraintMech()
@@ -449,7 +451,11 @@ class Backend(s_deltarepo.DeltaProvider):
 
         delta = self.adapt_delta(delta)
         context = delta_cmds.CommandContext(self.connection)
-        delta.apply(schema, context)
+        try:
+            delta.apply(schema, context)
+        finally:
+            # The delta may have altered pointers of *schema* in place.
+            types.invalidate_pointer_storage_info()
 
         if debug.flags.delta_pgsql_plan:
             debug.header('PgSQL Delta Plan')
@@ -475,7 +481,11 @@ class Backend(s_deltarepo.DeltaProvider):
                 result = s_ddl.ddl_text_from_delta(schema, delta)
 
             elif isinstance(delta_cmd, s_deltas.CreateDelta):
-                delta_cmd.apply(schema, context)
+                try:
+                    delta_cmd.apply(schema, context)
+                finally:
+                    # Even a partially applied delta changes the schema.
+                    self.schema_version += 1
 
             else:
                 raise RuntimeError(
@@ -513,34 +523,41 @@ class Backend(s_deltarepo.DeltaProvider):
         canonical_ddl_plan = ddl_plan.copy()
         canonical_ddl_plan.apply(test_schema, context=context)
 
-        # Apply and adapt delta, build native delta plan, which
-        # will also update the schema.
-        plan = self.process_delta(canonical_ddl_plan, schema)
+        try:
+            # Apply and adapt delta, build native delta plan, which
+            # will also update the schema.
+            plan = self.process_delta(canonical_ddl_plan, schema)
 
-        context = delta_cmds.CommandContext(self.connection)
+            context = delta_cmds.CommandContext(self.connection)
 
-        try:
-            if not isinstance(plan, (s_db.CreateDatabase, s_db.DropDatabase)):
-                async with self.connection.transaction():
-                    # Execute all pgsql/delta commands.
+            try:
+                if not isinstance(
+                        plan, (s_db.CreateDatabase, s_db.DropDatabase)):
+                    async with self.connection.transaction():
+                        # Execute all pgsql/delta commands.
+                        await plan.execute(context)
+                else:
                     await plan.execute(context)
-            else:
-                await plan.execute(context)
-        except Exception as e:
-            raise RuntimeError('failed to apply delta to data backend') from e
+            except Exception as e:
+                raise RuntimeError(
+                    'failed to apply delta to data backend') from e
         finally:
-            # Exception or not, re-read the schema from Postgres.
+            # Exception or not, re-read the schema from Postgres,
+            # the delta may have been applied to it partially.
             await self.invalidate_schema_cache()
             await self.getschema()
 
     async def invalidate_schema_cache(self):
         self.schema = None
+        self.schema_version += 1
         self.invalidate_transient_cache()
 
     def invalidate_transient_cache(self):
         self._constr_mech.invalidate_schema_cache()
         self._type_mech.invalidate_schema_cache()
 
+        types.invalidate_pointer_storage_info()
+
         self.link_cache.clear()
         self.link_property_cache.clear()
         self.objtype_cache.clear()
@@ -579,6 +596,23 @@ class Backend(s_deltarepo.DeltaProvider):
 
         return objtype_id
 
+    def get_pointer_id(self, ptrcls):
+        # Properties of object types are loaded along with link
+        # properties, is_link_property() is False for them.
+        if isinstance(ptrcls, s_props.Property):
+            pointer_cache = self.link_property_cache
+        else:
+            pointer_cache = self.link_cache
+
+        ptr_id = pointer_cache.get(ptrcls.name)
+
+        if ptr_id is None:
+            msg = 'could not determine backend id for pointer in this context'
+            details = 'Pointer: {}'.format(ptrcls.name)
+            raise s_err.SchemaError(msg, details=details)
+
+        return ptr_id
+
     def source_name_from_relid(self, table_oid):
         return self.table_id_to_class_name_cache.get(table_oid)
 
@@ -586,7 +620,7 @@ class Backend(s_deltarepo.DeltaProvider):
         return self.classname_to_table_id_cache.get(source_name)
 
     def compile(self, query_ir, scrolling_cursor=False, context=None, *,
-                output_format=None, timer=None):
+                output_format=None, json_format=None, timer=None):
         if scrolling_cursor:
             offset = query_ir.offset
             limit = query_ir.limit
@@ -600,7 +634,8 @@ class Backend(s_deltarepo.DeltaProvider):
         qchunks, argmap, arg_index, query_type, record_info = \
             compiler.compile_ir_to_sql(
                 query_ir, backend=self, schema=self.schema,
-                output_format=output_format, timer=timer)
+                output_format=output_format, json_format=json_format,
+                timer=timer)
 
         if scrolling_cursor:
             query_ir.offset = offset
@@ -724,6 +759,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 pass
             else:
                 scalar.bases = [schema.get(sn.Name(basename[0]))]
+                schema.drop_inheritance_cache(scalar)
 
         sequence = schema.get('std::sequence', None)
         for scalar in schema.get_objects(type='ScalarType'):
@@ -837,6 +873,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 pass
             else:
                 constraint.bases = [schema.get(b) for b in bases]
+                schema.drop_inheritance_cache(constraint)
 
         for constraint in schema.get_objects(type='constraint'):
             constraint.acquire_ancestor_inheritance(schema)
@@ -1044,6 +1081,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 cardinality = None
 
             basemap[name] = bases
+            self.link_cache[name] = r['id']
 
             link = s_links.Link(
                 name=name, source=source, target=target,
@@ -1087,6 +1125,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 pass
             else:
                 link.bases = [schema.get(b) for b in bases]
+                schema.drop_inheritance_cache(link)
 
         for link in schema.get_objects(type='link'):
             link.acquire_ancestor_inheritance(schema)
@@ -1131,6 +1170,7 @@ class Backend(s_deltarepo.DeltaProvider):
             required = r['required']
             target = self.unpack_typeref(r['target'], schema)
             basemap[name] = bases
+            self.link_property_cache[name] = r['id']
 
             if r['cardinality']:
                 cardinality = s_pointers.PointerCardinality(r['cardinality'])
@@ -1170,6 +1210,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 prop.bases = [
                     schema.get(b, type=s_props.Property) for b in bases
                 ]
+                schema.drop_inheritance_cache(prop)
 
     async def order_link_properties(self, schema):
         g = {}
@@ -1262,6 +1303,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 pass
             else:
                 event.bases = [schema.get(b) for b in bases]
+                schema.drop_inheritance_cache(event)
 
         for event in schema.get_objects(type='event'):
             event.acquire_ancestor_inheritance(schema)
@@ -1358,6 +1400,7 @@ class Backend(s_deltarepo.DeltaProvider):
                 pass
             else:
                 objtype.bases = [schema.get(b) for b in bases]
+                schema.drop_inheritance_cache(objtype)
 
         derived = await datasources.schema.objtypes.fetch_derived(
             self.connection)
@@ -1473,7 +1516,63 @@ class Backend(s_deltarepo.DeltaProvider):
             self, self._constr_mech, self._type_mech, error)
 
 
+def _trunc_divmod(a, b):
+    # divmod() rounding towards zero, like integer division in C.
+    q = abs(a) // b
+    if a < 0:
+        q = -q
+    return q, a - q * b
+
+
+def _decode_interval(parts):
+    """Format an interval the way Postgres outputs it.
+
+    The interval is decoded from its (months, days, microseconds)
+    parts, as datetime.timedelta cannot represent months and
+    normalizes the days and the time to the same sign.  The output
+    matches the default "postgres" IntervalStyle.
+    """
+    months, days, microseconds = parts
+    years, months = _trunc_divmod(months, 12)
+
+    result = []
+    is_before = False
+
+    for value, unit in ((years, 'year'), (months, 'mon'), (days, 'day')):
+        if value:
+            sign = '+' if is_before and value > 0 else ''
+            plural = '' if value == 1 else 's'
+            result.append(f'{sign}{value} {unit}{plural}')
+            is_before = value < 0
+
+    if microseconds or not result:
+        if microseconds < 0:
+            sign = '-'
+        else:
+            sign = '+' if is_before else ''
+
+        seconds, fraction = divmod(abs(microseconds), 1000000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+
+        clock = f'{sign}{hours:02d}:{minutes:02d}:{seconds:02d}'
+        if fraction:
+            clock += f'.{fraction:06d}'.rstrip('0')
+        result.append(clock)
+
+    return ' '.join(result)
+
+
+def _encode_interval(value):
+    return (0, value.days, value.seconds * 1000000 + value.microseconds)
+
+
 async def open_database(pgconn):
+    # Intervals are returned in the same text form as in JSON output.
+    await pgconn.set_type_codec(
+        'interval', schema='pg_catalog', format='tuple',
+        decoder=_decode_interval, encoder=_encode_interval)
+
     bk = Backend(pgconn)
     await bk.getschema()
     return bk
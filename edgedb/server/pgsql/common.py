@@ -17,6 +17,7 @@
 #
 
 
+import functools
 import hashlib
 import base64
 
@@ -37,6 +38,7 @@ def _quote_ident(string):
     return '"' + string.replace('"', '""') + '"'
 
 
+@functools.lru_cache(maxsize=4096)
 def quote_ident(string, *, force=False):
     return _quote_ident(string) if needs_quoting(string) or force else string
 
@@ -51,6 +53,7 @@ def needs_quoting(string):
     )
 
 
+@functools.lru_cache(maxsize=4096)
 def qname(*parts):
     return '.'.join([quote_ident(q) for q in parts])
 
@@ -78,6 +81,7 @@ def edgedb_module_name_to_schema_name(module, prefix='edgedb_'):
     return edgedb_name_to_pg_name(prefix + module, len(prefix))
 
 
+@functools.lru_cache(maxsize=4096)
 def edgedb_name_to_pg_name(name, prefix_length=0):
     """Convert EdgeDB name to a valid PostgresSQL column name.
 
@@ -99,6 +103,7 @@ def edgedb_name_to_pg_name(name, prefix_length=0):
     return name
 
 
+@functools.lru_cache(maxsize=4096)
 def convert_name(name, suffix, catenate=True, prefix='edgedb_'):
     schema = edgedb_module_name_to_schema_name(name.module, prefix=prefix)
     name = edgedb_name_to_pg_name('%s_%s' % (name.name, suffix))
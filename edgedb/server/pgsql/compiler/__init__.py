@@ -33,14 +33,16 @@ from . import stmt as _stmt_compiler  # NOQA
 from . import context
 from . import dispatch
 from . import errors
+from . import output
 
-from .context import OutputFormat  # NOQA
+from .context import OutputFormat, JSONFormat  # NOQA
 
 
 def compile_ir_to_sql_tree(
         ir_expr: irast.Base, *,
         schema, backend=None,
         output_format: typing.Optional[OutputFormat]=None,
+        json_format: typing.Optional[JSONFormat]=None,
         ignore_shapes: bool=False,
         singleton_mode: bool=False) -> pgast.Base:
     try:
@@ -55,10 +57,12 @@ def compile_ir_to_sql_tree(
             ir_expr = ir_expr.expr
         else:
             views = {}
+        if json_format is None and output_format == OutputFormat.JSON:
+            json_format = output.get_json_format(ir_expr)
         ctx.env = context.Environment(
             schema=schema, output_format=output_format,
-            backend=backend, singleton_mode=singleton_mode,
-            views=views)
+            json_format=json_format, backend=backend,
+            singleton_mode=singleton_mode, views=views)
         if ignore_shapes:
             ctx.expr_exposed = False
         qtree = dispatch.compile(ir_expr, ctx=ctx)
@@ -80,17 +84,20 @@ def compile_ir_to_sql(
         ir_expr: irast.Base, *,
         schema, backend=None,
         output_format: typing.Optional[OutputFormat]=None,
-        ignore_shapes: bool=False, timer=None):
+        json_format: typing.Optional[JSONFormat]=None,
+        ignore_shapes: bool=False, pretty: bool=False, timer=None):
 
     if timer is None:
         qtree = compile_ir_to_sql_tree(
             ir_expr, schema=schema, backend=backend,
-            output_format=output_format, ignore_shapes=ignore_shapes)
+            output_format=output_format, json_format=json_format,
+            ignore_shapes=ignore_shapes)
     else:
         with timer.timeit('compile_ir_to_sql'):
             qtree = compile_ir_to_sql_tree(
                 ir_expr, schema=schema, backend=backend,
-                output_format=output_format, ignore_shapes=ignore_shapes)
+                output_format=output_format, json_format=json_format,
+                ignore_shapes=ignore_shapes)
 
     if debug.flags.edgeql_compile:  # pragma: no cover
         debug.header('SQL Tree')
@@ -98,12 +105,15 @@ def compile_ir_to_sql(
 
     argmap = qtree.argnames
 
-    # Generate query text
+    # Generate query text.  The text is normally only consumed by
+    # Postgres, so skip the layout unless it is going to be read.
+    pretty = pretty or debug.flags.edgeql_compile
+
     if timer is None:
-        codegen = _run_codegen(qtree)
+        codegen = _run_codegen(qtree, pretty=pretty)
     else:
         with timer.timeit('compile_ir_to_sql'):
-            codegen = _run_codegen(qtree)
+            codegen = _run_codegen(qtree, pretty=pretty)
 
     qchunks = codegen.result
     arg_index = codegen.param_index
@@ -112,11 +122,12 @@ def compile_ir_to_sql(
         debug.header('SQL')
         debug.dump_code(''.join(qchunks), lexer='sql')
 
-    return qchunks, argmap, arg_index, type(qtree), tuple()
+    return (qchunks, argmap, arg_index, type(qtree),
+            getattr(qtree, 'output_descriptor', None))
 
 
-def _run_codegen(qtree):
-    codegen = pgcodegen.SQLSourceGenerator()
+def _run_codegen(qtree, *, pretty=True):
+    codegen = pgcodegen.SQLSourceGenerator(pretty=pretty)
     try:
         codegen.visit(qtree)
     except pgcodegen.SQLSourceGeneratorError as e:  # pragma: no cover
@@ -19,9 +19,12 @@
 
 import typing
 
+from edgedb.lang.common import ast
 from edgedb.lang.ir import ast as irast
+from edgedb.lang.ir import utils as irutils
 from edgedb.server.pgsql import ast as pgast
 
+from . import astutils
 from . import context
 from . import dispatch
 from . import output
@@ -85,6 +88,8 @@ def compile_output(
                 newctx.stmt is newctx.toplevel_stmt):
             val = pathctx.get_path_serialized_output(
                 ctx.rel, path_id, env=ctx.env)
+            newctx.toplevel_stmt.output_descriptor = \
+                ctx.env.output_descriptors.get(path_id)
         else:
             if path_id.is_objtype_path():
                 val = pathctx.get_path_identity_output(
@@ -109,22 +114,96 @@ def compile_filter_clause(
         ctx1.expr_exposed = False
         ctx1.shape_format = context.ShapeFormat.SERIALIZED
 
+        conjuncts = get_independent_conjuncts(ir_set, ctx=ctx1)
+        if conjuncts:
+            # The filter is a conjunction of expressions that share
+            # no paths, so instead of evaluating the conjunction over
+            # the cartesian product of their sets, check each one
+            # with a separate semi-join:
+            #    EXISTS(SELECT FROM A WHERE A.value)
+            #    AND EXISTS(SELECT FROM B WHERE B.value)
+            where_clause = None
+
+            for conjunct in conjuncts:
+                with ctx1.subrel() as subctx:
+                    relctx.update_scope(ir_set, subctx.rel, ctx=subctx)
+                    where_clause = astutils.extend_binop(
+                        where_clause,
+                        _compile_filter_sublink(conjunct, ctx=subctx))
+
+            return where_clause
+
         # In WHERE we compile ir.Set as a boolean disjunction:
         #    EXISTS(SELECT FROM SetRel WHERE SetRel.value)
         with ctx1.subrel() as subctx:
-            dispatch.compile(ir_set, ctx=subctx)
-            wrapper = subctx.rel
-            wrapper.where_clause = pathctx.get_path_value_var(
-                wrapper, ir_set.path_id, env=subctx.env)
-
-        where_clause = pgast.SubLink(
-            type=pgast.SubLinkType.EXISTS,
-            expr=wrapper
-        )
+            where_clause = _compile_filter_sublink(ir_set, ctx=subctx)
 
     return where_clause
 
 
+def _compile_filter_sublink(
+        ir_set: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> pgast.Expr:
+    dispatch.compile(ir_set, ctx=ctx)
+    wrapper = ctx.rel
+    wrapper.where_clause = pathctx.get_path_value_var(
+        wrapper, ir_set.path_id, env=ctx.env)
+
+    return pgast.SubLink(
+        type=pgast.SubLinkType.EXISTS,
+        expr=wrapper
+    )
+
+
+def get_independent_conjuncts(
+        ir_set: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> typing.List[irast.Set]:
+    """Split a filter expression into independent AND operands.
+
+    Return an empty list if *ir_set* is not a conjunction, or if any
+    path bound in the filter scope is referenced by more than one
+    operand, in which case the operands are correlated and must be
+    evaluated together.
+    """
+    if not _is_conjunction(ir_set) or ir_set.path_scope_id is None:
+        return []
+
+    conjuncts = []
+    operands = [ir_set.expr.left, ir_set.expr.right]
+    while operands:
+        operand = operands.pop(0)
+        if _is_conjunction(operand) and operand.path_scope_id is None:
+            operands[:0] = [operand.expr.left, operand.expr.right]
+        else:
+            conjuncts.append(operand)
+
+    scope = relctx.get_scope(ir_set, ctx=ctx)
+    if scope is None:
+        return []
+
+    bound_paths = {p.path_id for p in scope.path_children}
+    seen = set()
+
+    for conjunct in conjuncts:
+        refs = {s.path_id for s in ast.find_children(
+            conjunct, lambda n: isinstance(n, irast.Set))}
+        refs.add(conjunct.path_id)
+        refs &= bound_paths
+        if refs & seen:
+            return []
+        seen |= refs
+
+    return conjuncts
+
+
+def _is_conjunction(ir_set: irast.Set) -> bool:
+    return (
+        isinstance(ir_set.expr, irast.BinOp) and
+        ir_set.expr.op == ast.ops.AND and
+        not irutils.is_subquery_set(ir_set)
+    )
+
+
 def compile_orderby_clause(
         ir_exprs: typing.List[irast.Base], *,
         ctx: context.CompilerContextLevel) -> pgast.Expr:
@@ -47,6 +47,14 @@ class OutputFormat(enum.Enum):
     JSON = enum.auto()
 
 
+class JSONFormat(enum.Enum):
+    # Build the output with jsonb_* functions.
+    JSONB = enum.auto()
+    # Build the output as text with json_* functions, which avoids
+    # the conversion to and from the binary jsonb representation.
+    TEXT = enum.auto()
+
+
 NO_VOLATILITY = object()
 
 
@@ -138,7 +146,7 @@ class CompilerContext(compiler.CompilerContext):
 class Environment:
     """Static compilation environment."""
 
-    def __init__(self, *, schema, output_format, backend,
+    def __init__(self, *, schema, output_format, json_format, backend,
                  singleton_mode, views):
         self.backend = backend
         self.singleton_mode = singleton_mode
@@ -146,4 +154,9 @@ class Environment:
         self.root_rels = set()
         self.rel_overlays = collections.defaultdict(list)
         self.output_format = output_format
+        self.json_format = json_format
+        self.output_descriptors = {}
         self.schema = schema.get_overlay(extra=views)
+        # Aggregates compiled once and shared by every identical
+        # call in the statement that binds their arguments.
+        self.shared_aggregates = {}
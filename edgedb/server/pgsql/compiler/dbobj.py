@@ -202,21 +202,19 @@ def range_for_ptrcls(
 
     set_ops = []
 
-    ptrclses = set()
-
-    for source in {endpoint} | set(endpoint.descendants(env.schema)):
-        # Sift through the descendants to see who has this link
-        try:
-            src_ptrcls = source.pointers[linkname].material_type()
-        except KeyError:
-            # This source has no such link, skip it
-            continue
-        else:
-            if src_ptrcls in ptrclses:
-                # Seen this link already
-                continue
-            ptrclses.add(src_ptrcls)
-
+    ptrclses = env.schema.get_pointer_specializations(endpoint, linkname)
+
+    if len(ptrclses) > 1:
+        parent_ptrcls = _get_parent_ptrcls(
+            ptrclses, tgt_col, include_overlays=include_overlays, env=env)
+        if parent_ptrcls is not None:
+            # The union of specialized link tables is exactly the
+            # content of the generic link table they all inherit from,
+            # so let Postgres do the append instead of spelling out
+            # a UNION of every table.
+            ptrclses = (parent_ptrcls,)
+
+    for src_ptrcls in ptrclses:
         table = table_from_ptrcls(src_ptrcls, env=env)
 
         qry = pgast.SelectStmt()
@@ -259,6 +257,44 @@ def range_for_ptrcls(
     return rvar
 
 
+def _get_parent_ptrcls(
+        ptrclses: typing.Sequence[s_links.Link], tgt_col: str, *,
+        include_overlays: bool,
+        env: context.Environment) -> typing.Optional[s_links.Link]:
+    """Return a generic link whose table can stand in for *ptrclses*.
+
+    Each specialized link table inherits from the table of its generic
+    link, so selecting from the latter is equivalent to a UNION of
+    *ptrclses* as long as no other specializations exist, every link
+    property column is defined on the generic link, and no overlays
+    need to be applied.
+    """
+    if not all(isinstance(p, s_links.Link) for p in ptrclses):
+        return None
+
+    if tgt_col != 'std::target':
+        return None
+
+    generic = ptrclses[0].bases[0]
+    if generic.shortname.module == 'schema':
+        return None
+
+    if include_overlays and env.rel_overlays.get(generic.shortname):
+        return None
+
+    children = frozenset(generic.children(env.schema))
+    if children != frozenset(ptrclses):
+        return None
+
+    for ptrcls in ptrclses:
+        for prop in ptrcls.pointers.values():
+            if (not prop.is_special_pointer() and
+                    prop.shortname not in generic.pointers):
+                return None
+
+    return generic
+
+
 def range_for_pointer(
         pointer: s_links.Link, *,
         env: context.Environment) -> pgast.BaseRangeVar:
@@ -293,22 +293,15 @@ def process_insert_body(
         iterator_cte = None
         iterator_id = None
 
+    # The type id is known at compile time, so there is no need
+    # to look it up in the catalog on every INSERT.
+    objtype = ctx.env.schema.get(ir_stmt.subject.scls.shortname)
     values.append(
         pgast.ResTarget(
-            val=pgast.SelectStmt(
-                target_list=[
-                    pgast.ResTarget(
-                        val=pgast.ColumnRef(name=['id']))
-                ],
-                from_clause=[
-                    pgast.RangeVar(relation=pgast.Relation(
-                        name='objecttype', schemaname='edgedb'))
-                ],
-                where_clause=astutils.new_binop(
-                    op=ast.ops.EQ,
-                    lexpr=pgast.ColumnRef(name=['name']),
-                    rexpr=pgast.Constant(val=ir_stmt.subject.scls.shortname)
-                )
+            val=pgast.TypeCast(
+                arg=pgast.Constant(
+                    val=ctx.env.backend.get_objtype_id(objtype)),
+                type_name=pgast.TypeName(name=('uuid',))
             )
         )
     )
@@ -593,14 +586,6 @@ def process_link_update(
     """
     toplevel = ctx.toplevel_stmt
 
-    edgedb_ptr_tab = pgast.RangeVar(
-        relation=pgast.Relation(
-            schemaname='edgedb', name='pointer'
-        ),
-        alias=pgast.Alias(aliasname=ctx.env.aliases.get(hint='ptr')))
-
-    ltab_alias = edgedb_ptr_tab.alias.aliasname
-
     rptr = ir_expr.rptr
     ptrcls = rptr.ptrcls
     target_is_scalar = isinstance(ptrcls.target, s_scalars.ScalarType)
@@ -613,27 +598,9 @@ def process_link_update(
     # base material type.
     mptrcls = ptrcls.material_type()
 
-    # Lookup link class id by link name.
-    lname_to_id = pgast.CommonTableExpr(
-        query=pgast.SelectStmt(
-            from_clause=[
-                edgedb_ptr_tab
-            ],
-            target_list=[
-                pgast.ResTarget(
-                    val=pgast.ColumnRef(name=[ltab_alias, 'id']))
-            ],
-            where_clause=astutils.new_binop(
-                lexpr=pgast.ColumnRef(name=[ltab_alias, 'name']),
-                rexpr=pgast.Constant(val=mptrcls.name),
-                op=ast.ops.EQ
-            )
-        ),
-        name=ctx.env.aliases.get(hint='lid')
-    )
-
-    lname_to_id_rvar = pgast.RangeVar(relation=lname_to_id)
-    toplevel.ctes.append(lname_to_id)
+    # The link class id is known at compile time, so inline it
+    # instead of looking it up by link name in the catalog.
+    ptr_id = ctx.env.backend.get_pointer_id(mptrcls)
 
     target_rvar = dbobj.range_for_ptrcls(
         mptrcls, '>', include_overlays=False, env=ctx.env)
@@ -659,11 +626,9 @@ def process_link_update(
     )
 
     col_data = {
-        'ptr_item_id': pgast.ColumnRef(
-            name=[
-                lname_to_id.name,
-                'id'
-            ]
+        'ptr_item_id': pgast.TypeCast(
+            arg=pgast.Constant(val=ptr_id),
+            type_name=pgast.TypeName(name=('uuid',))
         ),
         'std::source': pathctx.get_rvar_path_identity_var(
             dml_cte_rvar, ir_stmt.subject.path_id, env=ctx.env)
@@ -703,7 +668,7 @@ def process_link_update(
     # into a subquery returning records for the link table.
     data_cte = process_link_values(
         ir_stmt, ir_expr, target_tab_name, tab_cols, col_data,
-        dml_cte_rvar, [lname_to_id_rvar],
+        dml_cte_rvar, [],
         props_only, target_is_scalar, iterator_cte, ctx=ctx)
 
     toplevel.ctes.append(data_cte)
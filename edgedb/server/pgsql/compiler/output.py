@@ -20,15 +20,69 @@
 """Compilation helpers for output formatting and serialization."""
 
 
+import typing
+
+from edgedb.lang.common import ast
+from edgedb.lang.edgeql import ast as qlast
+from edgedb.lang.ir import ast as irast
+from edgedb.lang.ir import utils as irutils
+
 from edgedb.server.pgsql import ast as pgast
 
 from . import context
 
 
+def _needs_json_equality(ir):
+    if isinstance(ir, irast.DistinctOp):
+        return not ir.expr_is_unique
+    elif isinstance(ir, irast.EquivalenceOp):
+        return True
+    elif irutils.is_set_membership_expr(ir):
+        return True
+    elif isinstance(ir, irast.FunctionCall):
+        return bool(
+            ir.agg_sort or
+            ir.agg_set_modifier == qlast.SetModifier.DISTINCT)
+    else:
+        return False
+
+
+def get_json_format(ir_expr: irast.Base) -> context.JSONFormat:
+    """Pick the JSON serialization strategy for the query.
+
+    Textual json is cheaper to build, but, unlike jsonb, it does not
+    support equality and ordering, so fall back to jsonb for queries
+    that might compare or sort serialized values.
+    """
+    if (_needs_json_equality(ir_expr) or
+            ast.find_children(ir_expr, _needs_json_equality)):
+        return context.JSONFormat.JSONB
+    else:
+        return context.JSONFormat.TEXT
+
+
+def _json_func(name, *, env):
+    if env.json_format == context.JSONFormat.TEXT:
+        return (name.format(json='json'),)
+    else:
+        return (name.format(json='jsonb'),)
+
+
+def _get_element_name(element):
+    rptr = element.path_id.rptr()
+    if rptr is None:
+        name = element.path_id[-1].name.name
+    else:
+        name = rptr.shortname.name
+        if rptr.is_link_property():
+            name = '@' + name
+    return name
+
+
 def tuple_var_as_json_object(tvar, *, env):
     if not tvar.named:
         return pgast.FuncCall(
-            name=('jsonb_build_array',),
+            name=_json_func('{json}_build_array', env=env),
             args=[serialize_expr(t.val, nested=True, env=env)
                   for t in tvar.elements],
             null_safe=True, nullable=tvar.nullable)
@@ -36,13 +90,7 @@ def tuple_var_as_json_object(tvar, *, env):
         keyvals = []
 
         for element in tvar.elements:
-            rptr = element.path_id.rptr()
-            if rptr is None:
-                name = element.path_id[-1].name.name
-            else:
-                name = rptr.shortname.name
-                if rptr.is_link_property():
-                    name = '@' + name
+            name = _get_element_name(element)
             keyvals.append(pgast.Constant(val=name))
             if isinstance(element.val, pgast.TupleVar):
                 val = serialize_expr(element.val, env=env)
@@ -51,15 +99,77 @@ def tuple_var_as_json_object(tvar, *, env):
             keyvals.append(val)
 
         return pgast.FuncCall(
-            name=('jsonb_build_object',),
+            name=_json_func('{json}_build_object', env=env),
             args=keyvals, null_safe=True, nullable=tvar.nullable)
 
 
+def tuple_var_as_record(tvar, *, env):
+    args = []
+
+    for element in tvar.elements:
+        if isinstance(element.val, pgast.TupleVar):
+            val = serialize_expr(element.val, env=env)
+        else:
+            val = element.val
+        args.append(val)
+
+    return pgast.RowExpr(args=args, nullable=tvar.nullable)
+
+
+def describe_tuple_var(tvar, *, env):
+    """Return a descriptor of a record produced by tuple_var_as_record().
+
+    The descriptor is a JSON-compatible structure that allows the client
+    to reconstruct shapes and named tuples from the positional records
+    returned in the NATIVE output format.
+    """
+    if tvar.named:
+        names = [_get_element_name(el) for el in tvar.elements]
+    else:
+        names = None
+
+    elements = []
+    for element in tvar.elements:
+        if isinstance(element.val, pgast.TupleVar):
+            eldesc = describe_tuple_var(element.val, env=env)
+        else:
+            eldesc = env.output_descriptors.get(element.path_id)
+        elements.append(eldesc)
+
+    return {'type': 'record', 'names': names, 'elements': elements}
+
+
+def describe_array(
+        path_id: irast.PathId, *,
+        env: context.Environment) -> None:
+    if env.output_format == context.OutputFormat.NATIVE:
+        env.output_descriptors[path_id] = {
+            'type': 'array',
+            'element': env.output_descriptors.get(path_id),
+        }
+
+
+def aggregate_as_array(
+        val: pgast.Base, *,
+        ctx: context.CompilerContextLevel) -> pgast.Base:
+    if (ctx.env.json_format == context.JSONFormat.TEXT and
+            ctx.env.output_format == context.OutputFormat.JSON and
+            in_serialization_ctx(ctx)):
+        # Build the JSON array directly instead of going through
+        # an intermediate array of json values.
+        name = ('json_agg',)
+    else:
+        name = ('array_agg',)
+
+    return pgast.FuncCall(name=name, args=[val])
+
+
 def in_serialization_ctx(
         ctx: context.CompilerContextLevel) -> bool:
     return (
         (ctx.expr_exposed is None or ctx.expr_exposed) and
-        ctx.env.output_format == context.OutputFormat.JSON
+        ctx.env.output_format in {context.OutputFormat.JSON,
+                                  context.OutputFormat.NATIVE}
     )
 
 
@@ -88,6 +198,7 @@ def serialize_expr_if_needed(
 
 def serialize_expr(
         expr: pgast.Base, *,
+        path_id: typing.Optional[irast.PathId]=None,
         nested: bool=False,
         env: context.Environment) -> pgast.Base:
     if env.output_format == context.OutputFormat.JSON:
@@ -95,11 +206,20 @@ def serialize_expr(
             val = tuple_var_as_json_object(expr, env=env)
         elif isinstance(expr, pgast.ImplicitRowExpr):
             val = pgast.FuncCall(
-                name=('jsonb_build_array',), args=expr.args,
-                null_safe=True)
+                name=_json_func('{json}_build_array', env=env),
+                args=expr.args, null_safe=True)
         elif not nested:
             val = pgast.FuncCall(
-                name=('to_jsonb',), args=[expr], null_safe=True)
+                name=_json_func('to_{json}', env=env),
+                args=[expr], null_safe=True)
+        else:
+            val = expr
+    elif env.output_format == context.OutputFormat.NATIVE:
+        if isinstance(expr, pgast.TupleVar):
+            val = tuple_var_as_record(expr, env=env)
+            if path_id is not None:
+                env.output_descriptors[path_id] = describe_tuple_var(
+                    expr, env=env)
         else:
             val = expr
     else:
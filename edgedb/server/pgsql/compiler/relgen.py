@@ -86,6 +86,21 @@ def get_set_rvar(
         rvar = relctx.maybe_get_path_rvar(
             ctx.rel, path_id, aspect='value', ctx=ctx)
 
+    shared_key = None
+    if rvar is None and scope_stmt is None:
+        shared_key, anchor_stmt = get_shared_aggregate_key(ir_set, ctx=ctx)
+        if shared_key is not None:
+            shared = ctx.env.shared_aggregates.get(shared_key)
+            if shared is not None:
+                # An identical aggregate has already been compiled
+                # into the anchor statement, refer to its output.
+                rvar, shared_path_id = shared
+                rvar.query.view_path_id_map[path_id] = shared_path_id
+                pathctx.put_path_rvar(
+                    anchor_stmt, path_id, rvar, aspect='value', env=ctx.env)
+            else:
+                scope_stmt = anchor_stmt
+
     if rvar is not None:
         pathctx.put_path_rvar_if_not_exists(
             ctx.rel, path_id, rvar, aspect='value', env=ctx.env)
@@ -212,9 +227,69 @@ def get_set_rvar(
         pathctx.put_path_rvar_if_not_exists(
             ctx.rel, path_id, rvars.main, aspect=rvars.aspect, env=ctx.env)
 
+    if shared_key is not None:
+        ctx.env.shared_aggregates[shared_key] = rvars.main, path_id
+
     return rvars.main
 
 
+def get_shared_aggregate_key(
+        ir_set: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> typing.Tuple[
+            typing.Optional[tuple], typing.Optional[pgast.Query]]:
+    """Return the common subexpression key of an aggregate call.
+
+    Calls of an aggregate over the same plain paths compute the same
+    value in every clause of the statement that binds the longest
+    visible prefix of the paths.  Such calls are compiled once, as
+    a LATERAL range of that statement, and are shared through the
+    returned key.  Only aggregates with an initial value qualify, as
+    these always produce exactly one row and so cannot filter out the
+    rows of the anchor statement.
+    """
+    expr = ir_set.expr
+
+    if (not isinstance(expr, irast.FunctionCall) or
+            expr.initial_value is None or
+            expr.agg_sort or expr.agg_filter is not None or
+            expr.partition or expr.window or expr.kwargs or
+            ctx.group_by_rels or
+            irutils.is_polymorphic_type(expr.func.returntype) or
+            not any(k == irast.SetQualifier.SET_OF
+                    for k in expr.func.paramkinds)):
+        return None, None
+
+    anchor_stmt = None
+    arg_keys = []
+
+    for arg in expr.args:
+        prefix = arg
+        while True:
+            if prefix.expr is not None:
+                return None, None
+
+            stmt = relctx.maybe_get_scope_stmt(prefix.path_id, ctx=ctx)
+            if stmt is not None:
+                break
+            elif prefix.rptr is None:
+                return None, None
+            else:
+                prefix = prefix.rptr.source
+
+        if anchor_stmt is None:
+            anchor_stmt = stmt
+        elif stmt is not anchor_stmt:
+            return None, None
+
+        arg_keys.append((arg.path_id, prefix.path_id))
+
+    if anchor_stmt is None:
+        return None, None
+
+    key = (anchor_stmt, expr.func, expr.agg_set_modifier, tuple(arg_keys))
+    return key, anchor_stmt
+
+
 def set_as_subquery(
         ir_set: irast.Set, *,
         as_value: bool=False,
@@ -281,18 +356,18 @@ def set_to_array(
         if val is None:
             val = pathctx.get_path_value_var(
                 result, ir_set.path_id, env=ctx.env)
-            val = output.serialize_expr(val, env=ctx.env)
+            val = output.serialize_expr(
+                val, path_id=ir_set.path_id, env=ctx.env)
             pathctx.put_path_serialized_var(
                 result, ir_set.path_id, val, force=True, env=ctx.env)
+
+        output.describe_array(ir_set.path_id, env=ctx.env)
     else:
         val = pathctx.get_path_value_var(result, ir_set.path_id, env=ctx.env)
 
     result.target_list = [
         pgast.ResTarget(
-            val=pgast.FuncCall(
-                name=('array_agg',),
-                args=[val],
-            )
+            val=output.aggregate_as_array(val, ctx=ctx)
         )
     ]
 
@@ -830,11 +905,12 @@ def process_set_as_distinct(
 
     relctx.include_rvar(stmt, subrvar, ir_set.path_id, ctx=ctx)
 
-    value_var = pathctx.get_rvar_path_var(
-        subrvar, ir_set.path_id, aspect='value', env=ctx.env)
+    if not expr.expr_is_unique:
+        value_var = pathctx.get_rvar_path_var(
+            subrvar, ir_set.path_id, aspect='value', env=ctx.env)
 
-    stmt.distinct_clause = pathctx.get_rvar_output_var_as_col_list(
-        subrvar, value_var, aspect='value', env=ctx.env)
+        stmt.distinct_clause = pathctx.get_rvar_output_var_as_col_list(
+            subrvar, value_var, aspect='value', env=ctx.env)
 
     rvar = dbobj.rvar_for_rel(stmt, lateral=True, env=ctx.env)
     return SetRVars(main=rvar, new=[(rvar, ir_set.path_id, 'value')])
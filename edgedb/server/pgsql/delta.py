@@ -2297,6 +2297,7 @@ class AlterLink(LinkMetaCommand, adapts=s_links.AlterLink):
         self.old_link = old_link = schema.get(self.classname).copy()
         link = s_links.AlterLink.apply(self, schema, context)
         LinkMetaCommand.apply(self, schema, context)
+        types.invalidate_pointer_storage_info(link)
 
         with context(s_links.LinkCommandContext(self, link)):
             rec, updates = self.record_metadata(
@@ -2570,6 +2571,7 @@ class AlterProperty(
             self.classname, type=metaclass).copy()
         prop = s_props.AlterProperty.apply(self, schema, context)
         PropertyMetaCommand.apply(self, schema, context)
+        types.invalidate_pointer_storage_info(prop)
 
         with context(s_props.PropertyCommandContext(self, prop)):
             rec, updates = self.record_metadata(
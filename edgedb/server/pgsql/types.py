@@ -17,8 +17,8 @@
 #
 
 
-import functools
 import typing
+import weakref
 
 from edgedb.lang.ir import utils as irutils
 
@@ -273,11 +273,43 @@ class PointerStorageInfo:
                 self.table_type, self.column_name, self.column_type, id(self))
 
 
-@functools.lru_cache()
+# Storage info is cached per pointer object.  Schema objects are
+# recreated whenever the schema is reloaded after DDL, so entries for
+# an old schema version go away together with it.  DDL mutates the
+# pointers of the current schema in place while the delta is applied,
+# so delta commands must invalidate the entries of the pointers they
+# alter.
+_pointer_storage_info_cache = weakref.WeakKeyDictionary()
+
+
+def invalidate_pointer_storage_info(pointer=None):
+    """Drop the cached storage info of *pointer* (of all pointers if None)."""
+    if pointer is None:
+        _pointer_storage_info_cache.clear()
+    else:
+        _pointer_storage_info_cache.pop(pointer, None)
+
+
 def get_pointer_storage_info(
         pointer, *, schema=None, source=None, resolve_type=True,
         link_bias=False):
     assert not pointer.generic(), "only specialized pointers can be stored"
-    return PointerStorageInfo(
-        schema, pointer, source=source, resolve_type=resolve_type,
-        link_bias=link_bias)
+
+    if source is not None:
+        return PointerStorageInfo(
+            schema, pointer, source=source, resolve_type=resolve_type,
+            link_bias=link_bias)
+
+    try:
+        cache = _pointer_storage_info_cache[pointer]
+    except KeyError:
+        cache = _pointer_storage_info_cache[pointer] = {}
+
+    key = (resolve_type, link_bias)
+    try:
+        info = cache[key]
+    except KeyError:
+        info = cache[key] = PointerStorageInfo(
+            schema, pointer, resolve_type=resolve_type, link_bias=link_bias)
+
+    return info
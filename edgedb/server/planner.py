@@ -19,6 +19,7 @@
 
 from edgedb.lang.edgeql import ast as qlast
 from edgedb.lang.edgeql import compiler as ql_compiler
+from edgedb.lang.ir.inference import stats as inference_stats
 from edgedb.lang.schema import ddl as s_ddl
 
 from edgedb.server.pgsql import compiler
@@ -71,10 +72,34 @@ def plan_statement(stmt, backend, flags={}, *, timer):
 
     else:
         # Queries
+        hits, misses = inference_stats.snapshot()
+
         with timer.timeit('compile_eql_to_ir'):
             ir = ql_compiler.compile_ast_to_ir(
                 stmt, schema=schema, modaliases=modaliases,
                 implicit_id_in_shapes=False)
 
-        return backend.compile(ir, output_format=compiler.OutputFormat.JSON,
-                               timer=timer)
+        if flags and 'native' in flags:
+            # Return Postgres records decoded by asyncpg and a type
+            # descriptor instead of building JSON on the Postgres side.
+            output_format = compiler.OutputFormat.NATIVE
+        else:
+            output_format = compiler.OutputFormat.JSON
+
+        if flags and 'jsonb' in flags:
+            # Force jsonb serialization instead of picking the
+            # strategy based on the query.
+            json_format = compiler.JSONFormat.JSONB
+        else:
+            json_format = None
+
+        plan = backend.compile(ir, output_format=output_format,
+                               json_format=json_format, timer=timer)
+
+        # IR inference is memoized, both compilation phases share
+        # the memo tables of the IR nodes.
+        new_hits, new_misses = inference_stats.snapshot()
+        timer.count('inference_cache_hits', new_hits - hits)
+        timer.count('inference_cache_misses', new_misses - misses)
+
+        return plan
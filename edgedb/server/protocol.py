@@ -19,18 +19,26 @@
 
 import asyncio
 import contextlib
+import datetime
+import decimal
 import enum
+import itertools
 import json
 import struct
 import time
 import traceback
+import uuid
+
+import asyncpg
 
 from edgedb.lang import edgeql
 from edgedb.lang import graphql as graphql_compiler
 
 from edgedb.server import pgsql as backend
 from edgedb.server import executor
+from edgedb.server import keyset
 from edgedb.server import planner
+from edgedb.server import query as edgedb_query
 
 from edgedb.lang.schema import database as s_db
 from edgedb.lang.schema import delta as s_delta
@@ -45,14 +53,87 @@ from edgedb.lang.common import parsing
 msg_header = struct.Struct('!L')
 
 
+def _encode_native(obj):
+    # Encode values decoded by asyncpg in the NATIVE output format.
+    if isinstance(obj, asyncpg.Record):
+        return list(obj.values())
+    elif isinstance(obj, uuid.UUID):
+        return str(obj)
+    elif isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    elif isinstance(obj, decimal.Decimal):
+        # Handled by MessageEncoder.
+        raise _DecimalValue
+    else:
+        raise TypeError(
+            f'{type(obj).__name__!r} object is not JSON serializable')
+
+
+class _DecimalValue(Exception):
+    pass
+
+
+class MessageEncoder(json.JSONEncoder):
+    """JSON encoder of protocol messages.
+
+    Decimals are encoded as JSON numbers with all their digits, the way
+    Postgres outputs them in JSON.  The C encoder cannot do that, so
+    messages containing decimals are encoded in Python.
+    """
+
+    def default(self, obj):
+        return _encode_native(obj)
+
+    def encode(self, obj):
+        try:
+            return super().encode(obj)
+        except _DecimalValue:
+            return ''.join(self._iterencode_decimals(obj))
+
+    def _iterencode_decimals(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            if obj.is_finite():
+                yield format(obj, 'f')
+            else:
+                # Not a valid JSON number, Postgres quotes these.
+                yield super().encode(str(obj))
+
+        elif isinstance(obj, dict):
+            yield '{'
+            for i, (key, value) in enumerate(obj.items()):
+                if i:
+                    yield self.item_separator
+                yield super().encode(key)
+                yield self.key_separator
+                yield from self._iterencode_decimals(value)
+            yield '}'
+
+        elif isinstance(obj, (list, tuple, asyncpg.Record)):
+            if isinstance(obj, asyncpg.Record):
+                obj = obj.values()
+            yield '['
+            for i, value in enumerate(obj):
+                if i:
+                    yield self.item_separator
+                yield from self._iterencode_decimals(value)
+            yield ']'
+
+        else:
+            yield super().encode(obj)
+
+
 class Timer:
     __slots__ = ('parse_eql', 'compile_eql_to_ir', 'compile_ir_to_sql',
-                 'graphql_translation', 'execution')
+                 'graphql_translation', 'execution',
+                 'inference_cache_hits', 'inference_cache_misses')
 
     def __init__(self):
         for attr in self.__slots__:
             setattr(self, attr, 0)
 
+    def count(self, name, value):
+        setattr(self, name, getattr(self, name) + value)
+
     @contextlib.contextmanager
     def timeit(self, name):
         start = time.monotonic()
@@ -64,7 +145,16 @@ class Timer:
             setattr(self, name, prev + delta)
 
     def as_dict(self):
-        return {k: getattr(self, k) for k in self.__slots__}
+        result = {k: getattr(self, k) for k in self.__slots__}
+
+        lookups = self.inference_cache_hits + self.inference_cache_misses
+        if lookups:
+            result['inference_cache_hit_rate'] = (
+                self.inference_cache_hits / lookups)
+        else:
+            result['inference_cache_hit_rate'] = None
+
+        return result
 
 
 class ConnectionState(enum.Enum):
@@ -77,6 +167,16 @@ class ProtocolError(Exception):
     pass
 
 
+def _load_rows(rows):
+    loaded = []
+    for row in rows:
+        if isinstance(row, str):
+            # JSON result
+            row = json.loads(row)
+        loaded.append(row)
+    return loaded
+
+
 def is_ddl(plan):
     return isinstance(plan, s_delta.Command) and \
         not isinstance(plan, s_db.DatabaseCommand) and \
@@ -90,6 +190,8 @@ class Protocol(asyncio.Protocol):
         self.pgconn = None
         self.state = ConnectionState.NOT_CONNECTED
         self.transactions = []
+        self.cursors = {}
+        self._cursor_ids = itertools.count(1)
         self.buffer = bytearray()
 
     def connection_made(self, transport):
@@ -158,8 +260,39 @@ class Protocol(asyncio.Protocol):
                 raise ProtocolError('invalid script message')
 
             fut = self._loop.create_task(
-                self._run_script(script, graphql=message.get('__graphql__'),
-                                 flags=message.get('__flags__')))
+                self._run_script(
+                    script, graphql=message.get('__graphql__'),
+                    flags=message.get('__flags__'),
+                    continuation=message.get('__continuation__')))
+            fut.add_done_callback(self._on_script_done)
+
+        elif message['__type__'] == 'cursor_open':
+            if self.state != ConnectionState.READY:
+                raise ProtocolError('unexpected message: cursor_open')
+
+            query = message.get('query')
+            if not query:
+                raise ProtocolError('invalid cursor_open message')
+
+            fut = self._loop.create_task(
+                self._open_cursor(query, flags=message.get('__flags__')))
+            fut.add_done_callback(self._on_script_done)
+
+        elif message['__type__'] == 'cursor_fetch':
+            if self.state != ConnectionState.READY:
+                raise ProtocolError('unexpected message: cursor_fetch')
+
+            count = message.get('count')
+            if not isinstance(count, int) or count <= 0:
+                raise ProtocolError('invalid cursor_fetch message')
+
+            fut = self._loop.create_task(
+                self._fetch_cursor(message.get('cursor'), count))
+            fut.add_done_callback(self._on_script_done)
+
+        elif message['__type__'] == 'cursor_close':
+            fut = self._loop.create_task(
+                self._close_cursor(message.get('cursor')))
             fut.add_done_callback(self._on_script_done)
 
         elif message['__type__'] == 'list_dbs':
@@ -171,7 +304,7 @@ class Protocol(asyncio.Protocol):
             fut.add_done_callback(self._on_script_done)
 
     def send_message(self, msg):
-        msg = json.dumps(msg).encode('utf-8')
+        msg = MessageEncoder().encode(msg).encode('utf-8')
         self.transport.write(msg_header.pack(len(msg)) + msg)
 
     def send_error(self, err):
@@ -214,7 +347,7 @@ class Protocol(asyncio.Protocol):
         with timer.timeit('execution'):
             result = self._pg_cluster.get_connection_spec()
 
-        return result, timer.as_dict()
+        return result, timer.as_dict(), None, None
 
     async def _list_dbs(self):
         timer = Timer()
@@ -230,9 +363,10 @@ class Protocol(asyncio.Protocol):
             ''')
 
         result = [r['datname'] for r in result]
-        return result, timer.as_dict()
+        return result, timer.as_dict(), None, None
 
-    async def _run_script(self, script, *, graphql=False, flags={}):
+    async def _run_script(self, script, *, graphql=False, flags={},
+                          continuation=None):
         timer = Timer()
 
         if graphql:
@@ -250,8 +384,20 @@ class Protocol(asyncio.Protocol):
             statements = edgeql.parse_block(script)
 
         results = []
+        descriptors = []
+        page = None
+        next_continuation = None
+
+        paginated = continuation is not None or (flags and 'keyset' in flags)
+        if paginated and flags and 'native' in flags:
+            raise ProtocolError('keyset pagination requires JSON output')
+
+        for i, statement in enumerate(statements):
+            if paginated and i == len(statements) - 1:
+                # Keyset pagination applies to the last statement
+                # of the script.
+                statement, page = keyset.paginate(statement, continuation)
 
-        for statement in statements:
             plan = planner.plan_statement(
                 statement, self.backend, flags, timer=timer)
 
@@ -259,16 +405,102 @@ class Protocol(asyncio.Protocol):
                 result = await executor.execute_plan(plan, self)
 
             if result is not None and isinstance(result, list):
-                loaded = []
-                for row in result:
-                    if isinstance(row, str):
-                        # JSON result
-                        row = json.loads(row)
-                    loaded.append(row)
-                result = loaded
+                result = _load_rows(result)
+                if page is not None:
+                    await self._check_anchor(page, timer=timer)
+                    next_continuation = page.get_continuation(result)
             results.append(result)
 
-        return results, timer.as_dict()
+            if isinstance(plan, edgedb_query.Query):
+                descriptors.append(plan.get_output_metadata()['record_info'])
+            else:
+                descriptors.append(None)
+
+        if flags and 'native' in flags:
+            return results, timer.as_dict(), descriptors, next_continuation
+        else:
+            return results, timer.as_dict(), None, next_continuation
+
+    async def _check_anchor(self, page, *, timer):
+        if page.anchor_check is None:
+            return
+
+        plan = planner.plan_statement(
+            page.anchor_check, self.backend, timer=timer)
+
+        with timer.timeit('execution'):
+            result = await executor.execute_plan(plan, self)
+
+        page.check_anchor(_load_rows(result))
+
+    async def _open_cursor(self, query, *, flags={}):
+        timer = Timer()
+
+        with timer.timeit('parse_eql'):
+            statements = edgeql.parse_block(query)
+
+        if len(statements) != 1:
+            raise ProtocolError('a cursor query must be a single statement')
+
+        plan = planner.plan_statement(
+            statements[0], self.backend, flags, timer=timer)
+
+        if not isinstance(plan, edgedb_query.Query):
+            raise ProtocolError('a cursor can only be opened for a query')
+
+        cursor_id = next(self._cursor_ids)
+        # Cursor ids are never reused on a connection, neither are
+        # the names of the Postgres cursors.
+        name = 'edgedb_cursor_{}'.format(cursor_id)
+
+        with timer.timeit('execution'):
+            await executor.open_cursor(plan, name, self)
+
+        transaction, _ = self.transactions[-1]
+        self.cursors[cursor_id] = (name, plan, transaction)
+
+        return cursor_id, timer.as_dict(), None, None
+
+    async def _fetch_cursor(self, cursor_id, count):
+        timer = Timer()
+        name, plan = self._get_cursor(cursor_id)
+
+        with timer.timeit('execution'):
+            result = await executor.fetch_cursor(plan, name, count, self)
+
+        # The rows are returned as the result of a single-statement
+        # script, so that clients can decode them the same way.
+        results = [_load_rows(result)]
+
+        if plan.get_output_format_info()[0] == 'edgedbobj':
+            descriptors = [plan.get_output_metadata()['record_info']]
+        else:
+            descriptors = None
+
+        return results, timer.as_dict(), descriptors, None
+
+    async def _close_cursor(self, cursor_id):
+        timer = Timer()
+
+        try:
+            name, plan, _ = self.cursors.pop(cursor_id)
+        except (KeyError, TypeError):
+            # Already closed, possibly by the end of its transaction.
+            return None, timer.as_dict(), None, None
+
+        with timer.timeit('execution'):
+            await executor.close_cursor(plan, name, self)
+
+        return None, timer.as_dict(), None, None
+
+    def _get_cursor(self, cursor_id):
+        try:
+            name, plan, _ = self.cursors[cursor_id]
+        except (KeyError, TypeError):
+            raise exceptions.InvalidTransactionStateError(
+                'cursor {!r} does not exist'.format(cursor_id)) from None
+
+        return name, plan
 
     def _on_pg_connect(self, fut):
         try:
@@ -298,7 +530,7 @@ class Protocol(asyncio.Protocol):
 
     def _on_script_done(self, fut):
         try:
-            result, timings = fut.result()
+            result, timings, descriptors, continuation = fut.result()
         except asyncio.CancelledError:
             return
         except Exception as e:
@@ -307,5 +539,10 @@ class Protocol(asyncio.Protocol):
 
         self.state = ConnectionState.READY
 
-        self.send_message({'__type__': 'result', 'result': result,
-                           'timings': timings})
+        msg = {'__type__': 'result', 'result': result, 'timings': timings}
+        if descriptors is not None:
+            msg['descriptors'] = descriptors
+        if continuation is not None:
+            msg['continuation'] = continuation
+
+        self.send_message(msg)
@@ -19,3 +19,4 @@
 
 from .et import etcommands  # noqa
 from . import test  # noqa
+from . import bench  # noqa
@@ -0,0 +1,761 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Benchmarks of the EdgeQL compiler pipeline and the schema.
+
+The "compile" suite compiles the queries found in the EdgeQL test
+suite against the schemas of the test cases that contain them.  The
+schemas are loaded into an in-memory schema, no database is needed.
+
+INSERT, UPDATE and DELETE statements are not benchmarked: compiling
+DML to SQL needs the backend ids of types and pointers and the
+columns of the database tables, which only a connected backend has.
+
+The "schema" and "pathid" suites measure schema name lookups, schema
+memory use and the compilation of queries with nested shapes.  The
+"json" suite runs a query with nested shapes on a temporary cluster
+to compare the JSON serialization strategies.
+"""
+
+
+import ast
+import asyncio
+import gc
+import glob
+import json
+import os
+import platform
+import re
+import statistics
+import time
+import tracemalloc
+
+import click
+
+import edgedb
+from edgedb.lang import _testbase as tb
+from edgedb.lang import edgeql
+from edgedb.lang.common import ast as common_ast
+from edgedb.lang.edgeql import ast as qlast
+from edgedb.lang.edgeql import codegen as qlcodegen
+from edgedb.lang.edgeql import compiler as qlcompiler
+from edgedb.lang.schema import declarative as s_decl
+from edgedb.lang.schema import std as s_std
+from edgedb.server import cluster as edgedb_cluster
+from edgedb.server.pgsql import compiler as pgcompiler
+from edgedb.tools import etcommands
+
+
+PHASES = ('parse', 'ir', 'sql')
+
+PERCENTILES = (50, 90, 99)
+
+SUITES = ('compile', 'schema', 'pathid', 'json')
+
+# Queries with nested shapes, which create many path ids.
+SHAPE_QUERIES = [
+    r'''
+        WITH MODULE test
+        SELECT User {
+            name,
+            deck: {
+                name,
+                element,
+                cost,
+                @count
+            } ORDER BY .name,
+            friends: {
+                name,
+                @nickname
+            }
+        }
+        FILTER .deck.cost > 1
+        ORDER BY .name;
+    ''',
+    r'''
+        WITH MODULE test
+        SELECT Card {
+            name,
+            owners: {
+                name,
+                deck_cost
+            },
+            decks := Card.<deck[IS User] {
+                name
+            }
+        }
+        FILTER EXISTS .owners OR .element = 'Fire';
+    ''',
+    r'''
+        WITH
+            MODULE test,
+            U2 := User
+        SELECT User {
+            name,
+            foo := (
+                SELECT U2 {
+                    name
+                }
+                FILTER U2.deck.name = User.deck.name
+                ORDER BY U2.name
+            )
+        };
+    ''',
+]
+
+DEEP_SHAPE_QUERY = r'''
+    WITH MODULE test
+    SELECT User {
+        name,
+        deck: {
+            name,
+            element,
+            cost,
+            @count,
+            owners: {
+                name,
+                friends: {
+                    name,
+                    @nickname
+                } ORDER BY .name
+            } ORDER BY .name
+        } ORDER BY .name,
+        friends: {
+            name,
+            deck: {
+                name
+            } ORDER BY .name
+        } ORDER BY .name
+    } ORDER BY .name;
+'''
+
+_QUERY_TYPES = (qlast.SelectQuery,)
+
+_DML_TYPES = (qlast.InsertQuery, qlast.UpdateQuery, qlast.DeleteQuery)
+
+_QUERY_RE = re.compile(r'\b(SELECT|GROUP|FOR|INSERT|UPDATE|DELETE)\b')
+
+_STR_NODES = tuple(
+    getattr(ast, name) for name in ('Constant', 'Str') if hasattr(ast, name))
+
+
+class Query:
+
+    def __init__(self, source, schema, origin):
+        self.source = source
+        self.schema = schema
+        self.origin = origin
+
+    def parse(self):
+        stmt, = edgeql.parse_block(self.source)
+        return stmt
+
+    def compile_to_ir(self, stmt):
+        # Same options as the server planner uses for queries.
+        return qlcompiler.compile_ast_to_ir(
+            stmt, schema=self.schema, implicit_id_in_shapes=False)
+
+    def compile_to_sql(self, ir):
+        return pgcompiler.compile_ir_to_sql(
+            ir, schema=self.schema,
+            output_format=pgcompiler.OutputFormat.JSON)
+
+
+def _get_string_literals(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, _STR_NODES):
+            value = ast.literal_eval(node)
+            if isinstance(value, str):
+                yield value
+
+
+def _get_schema_files(classdef, dirname):
+    # Mirrors BaseEdgeQLCompilerTest.get_schema_script(): SCHEMA
+    # declares the "test" module and SCHEMA_<NAME> other modules.
+    files = {}
+
+    for stmt in classdef.body:
+        if not isinstance(stmt, ast.Assign):
+            continue
+
+        for target in stmt.targets:
+            if (isinstance(target, ast.Name) and
+                    re.match(r'^SCHEMA(?:_(\w+))?', target.id)):
+                parts = list(_get_string_literals(stmt.value))
+                if parts and parts[-1].endswith('.eschema'):
+                    files[target.id] = os.path.join(dirname, *parts)
+
+    return files
+
+
+def _load_schema(schema_files):
+    testcase = type('BenchSchema', (tb.BaseEdgeQLCompilerTest,), schema_files)
+    return testcase.load_schemas()
+
+
+def collect_queries(files, *, verbose=False):
+    """Collect queries from the test cases in *files*.
+
+    Returns a list of :class:`Query` objects that compile, the number
+    of collected queries that did not compile and the number of DML
+    statements, which are not collected.
+    """
+    schemas = {}
+    queries = []
+    seen = set()
+    skipped = 0
+    dml = 0
+
+    for filename in files:
+        with open(filename, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename)
+
+        dirname = os.path.dirname(filename)
+
+        for classdef in tree.body:
+            if not isinstance(classdef, ast.ClassDef):
+                continue
+
+            schema_files = _get_schema_files(classdef, dirname)
+            if not schema_files:
+                continue
+
+            schema_key = tuple(sorted(schema_files.items()))
+            if schema_key not in schemas:
+                schemas[schema_key] = _load_schema(schema_files)
+            schema = schemas[schema_key]
+
+            for text in _get_string_literals(classdef):
+                if not _QUERY_RE.search(text):
+                    continue
+
+                try:
+                    stmts = edgeql.parse_block(text)
+                except Exception:
+                    continue
+
+                for stmt in stmts:
+                    if isinstance(stmt, _DML_TYPES):
+                        dml += 1
+                        continue
+                    elif not isinstance(stmt, _QUERY_TYPES):
+                        continue
+
+                    source = qlcodegen.generate_source(stmt) + ';'
+                    if (schema_key, source) in seen:
+                        continue
+                    seen.add((schema_key, source))
+
+                    query = Query(source, schema, origin=os.path.basename(
+                        filename))
+
+                    # Drop the queries that fail to compile: the ones
+                    # from the error tests, and the ones that need a
+                    # backend, such as DML nested in a SELECT or type
+                    # checks.  This also serves as the warm-up run.
+                    try:
+                        query.compile_to_sql(
+                            query.compile_to_ir(query.parse()))
+                    except Exception as e:
+                        skipped += 1
+                        if verbose:
+                            click.secho(
+                                f'{query.origin}: skipped: '
+                                f'{type(e).__name__}: {e}', fg='yellow')
+                    else:
+                        queries.append(query)
+
+    return queries, skipped, dml
+
+
+def percentile(values, pct):
+    """Return the *pct*-th percentile of *values* (nearest rank)."""
+    values = sorted(values)
+    rank = max(round(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def run_timings(queries, iterations):
+    timings = {phase: [] for phase in PHASES}
+    totals = {phase: [] for phase in PHASES}
+
+    for _ in range(iterations):
+        gc.collect()
+        run_totals = dict.fromkeys(PHASES, 0.0)
+
+        for query in queries:
+            started_at = time.perf_counter()
+            stmt = query.parse()
+            parsed_at = time.perf_counter()
+            ir = query.compile_to_ir(stmt)
+            compiled_at = time.perf_counter()
+            query.compile_to_sql(ir)
+            finished_at = time.perf_counter()
+
+            for phase, elapsed in (('parse', parsed_at - started_at),
+                                   ('ir', compiled_at - parsed_at),
+                                   ('sql', finished_at - compiled_at)):
+                timings[phase].append(elapsed)
+                run_totals[phase] += elapsed
+
+        for phase, total in run_totals.items():
+            totals[phase].append(total)
+
+    return timings, totals
+
+
+def run_tracemalloc(queries):
+    # Each phase is traced separately over all queries with its
+    # results kept alive, so the traced blocks are the ones allocated
+    # by the phase and still referenced at its end.
+    memory = {}
+    inputs = queries
+
+    for phase, func in (('parse', lambda q, _: q.parse()),
+                        ('ir', Query.compile_to_ir),
+                        ('sql', Query.compile_to_sql)):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            results = [func(q, arg) for q, arg in zip(queries, inputs)]
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        stats = snapshot.statistics('filename')
+        memory[phase] = {
+            'blocks': sum(stat.count for stat in stats),
+            'bytes': sum(stat.size for stat in stats),
+            'peak_bytes': peak,
+        }
+
+        inputs = results
+
+    return memory
+
+
+def make_report(queries, skipped, dml, iterations, timings, totals, memory):
+    report = {
+        'python': platform.python_version(),
+        'ast_fast_mode': common_ast.is_fast_mode(),
+        'iterations': iterations,
+        'queries': len(queries),
+        'skipped': skipped,
+        'dml_skipped': dml,
+        'phases': {},
+    }
+
+    for phase in PHASES:
+        samples = timings[phase]
+        best_total = min(totals[phase])
+
+        stats = {
+            'total_ms': best_total * 1000,
+            'queries_per_sec': len(queries) / best_total,
+        }
+        for pct in PERCENTILES:
+            stats[f'p{pct}_ms'] = percentile(samples, pct) * 1000
+        stats['max_ms'] = max(samples) * 1000
+
+        if memory is not None:
+            stats.update(memory[phase])
+
+        report['phases'][phase] = stats
+
+    return report
+
+
+def print_report(report):
+    headers = ['phase', 'total ms', 'q/s']
+    headers += [f'p{pct} ms' for pct in PERCENTILES]
+    headers += ['max ms']
+
+    with_memory = 'blocks' in report['phases'][PHASES[0]]
+    if with_memory:
+        headers += ['blocks/q', 'KiB/q', 'peak KiB']
+
+    rows = []
+    for phase, stats in report['phases'].items():
+        row = [phase, f'{stats["total_ms"]:.1f}',
+               f'{stats["queries_per_sec"]:.0f}']
+        row += [f'{stats[f"p{pct}_ms"]:.3f}' for pct in PERCENTILES]
+        row += [f'{stats["max_ms"]:.3f}']
+
+        if with_memory:
+            n = report['queries']
+            row += [f'{stats["blocks"] / n:.0f}',
+                    f'{stats["bytes"] / n / 1024:.1f}',
+                    f'{stats["peak_bytes"] / 1024:.0f}']
+
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in [headers] + rows)
+              for i in range(len(headers))]
+
+    click.echo(
+        f'{report["queries"]} queries ({report["skipped"]} skipped, '
+        f'{report["dml_skipped"]} DML statements not benchmarked), '
+        f'{report["iterations"]} iterations, '
+        f'Python {report["python"]}')
+    click.echo()
+    for row in [headers] + rows:
+        click.echo('  '.join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))))
+
+
+def _get_tests_dir():
+    project_root = os.path.dirname(list(edgedb.__path__)[0])
+    return os.path.join(project_root, 'tests')
+
+
+def _get_cards_schema_path():
+    return os.path.join(_get_tests_dir(), 'schemas', 'cards.eschema')
+
+
+def _summarize_runs(runs):
+    return {
+        'median_ms': statistics.median(runs) * 1000,
+        'min_ms': min(runs) * 1000,
+        'runs': len(runs),
+    }
+
+
+def bench_compile(files, *, include, iterations, memory, verbose):
+    if not files:
+        files = [_get_tests_dir()]
+
+    test_files = []
+    for file in files:
+        if os.path.isdir(file):
+            test_files.extend(
+                sorted(glob.glob(os.path.join(file, 'test_edgeql_*.py'))))
+        elif os.path.exists(file):
+            test_files.append(file)
+        else:
+            click.secho(
+                f'Warning: {file}: no such file or directory.', fg='yellow')
+
+    if include:
+        test_files = [
+            f for f in test_files
+            if any(re.search(r, os.path.basename(f)) for r in include)]
+
+    queries, skipped, dml = collect_queries(test_files, verbose=verbose)
+    if not queries:
+        raise click.ClickException('no queries to benchmark')
+
+    timings, totals = run_timings(queries, iterations)
+
+    if memory:
+        memory_stats = run_tracemalloc(queries)
+    else:
+        memory_stats = None
+
+    return make_report(
+        queries, skipped, dml, iterations, timings, totals, memory_stats)
+
+
+def bench_schema(*, iterations, num_types):
+    """Measure schema name lookups and the memory used by a schema."""
+    schema = _load_schema({'SCHEMA': _get_cards_schema_path()})
+
+    aliases = {None: 'test'}
+    lookups = [
+        ('User', aliases), ('Card', aliases), ('test::User', None),
+        ('str', aliases), ('int64', aliases), ('std::str', None),
+        ('Object', aliases), ('Missing', aliases),
+    ]
+    functions = [('count', aliases), ('std::len', None)]
+
+    def run_lookups():
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            for name, module_aliases in lookups:
+                schema.get(name, None, module_aliases=module_aliases)
+            for name, module_aliases in functions:
+                schema.get_functions(name, module_aliases=module_aliases)
+        elapsed = time.perf_counter() - started_at
+        return iterations * (len(lookups) + len(functions)) / elapsed
+
+    class NoCache(dict):
+        def __setitem__(self, key, value):
+            pass
+
+    cache = schema._lookup_cache
+    schema._lookup_cache = NoCache()
+    try:
+        uncached = run_lookups()
+    finally:
+        schema._lookup_cache = cache
+
+    # Warm up.
+    run_lookups()
+    cached = run_lookups()
+
+    decls = []
+    for i in range(num_types):
+        decl = f'type Type{i}:\n'
+        for j in range(8):
+            decl += f'    property prop{j} -> str\n'
+        decl += f'    link next -> Type{(i + 1) % num_types}\n'
+        decls.append(decl)
+    source = '\n'.join(decls)
+
+    # Warm up the parsers, so that their tables are not counted.
+    s_decl.parse_module_declarations(
+        s_std.load_std_schema(), [('test', 'type Foo')])
+
+    schema = s_std.load_graphql_schema(s_std.load_std_schema())
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        schema = s_decl.parse_module_declarations(schema, [('test', source)])
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'suite': 'schema',
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'lookups_per_sec': {
+            'uncached': uncached,
+            'cached': cached,
+        },
+        'memory': {
+            'types': num_types,
+            'retained_bytes': retained - baseline,
+            'peak_bytes': peak - baseline,
+        },
+    }
+
+
+def bench_pathid(*, iterations):
+    """Measure the compilation of queries with nested shapes."""
+    schema = _load_schema({'SCHEMA': _get_cards_schema_path()})
+    queries = [Query(q, schema, origin='pathid') for q in SHAPE_QUERIES]
+
+    def run(query):
+        query.compile_to_sql(query.compile_to_ir(query.parse()))
+
+    for query in queries:
+        # Warm up.
+        run(query)
+
+    runs = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        for query in queries:
+            run(query)
+        runs.append(time.perf_counter() - started_at)
+
+    return {
+        'suite': 'pathid',
+        'python': platform.python_version(),
+        'ast_fast_mode': common_ast.is_fast_mode(),
+        'iterations': iterations,
+        'queries': len(queries),
+        'compile': _summarize_runs(runs),
+    }
+
+
+def _get_setup_script():
+    # Mirrors DatabaseTestCase.get_setup_script() for the cards tests.
+    with open(_get_cards_schema_path(), encoding='utf-8') as f:
+        schema = f.read()
+
+    with open(os.path.join(_get_tests_dir(), 'schemas', 'cards_setup.eql'),
+              encoding='utf-8') as f:
+        setup = f.read()
+
+    return (
+        f'CREATE MODULE test;\n'
+        f'CREATE MIGRATION test::d1 TO eschema $${schema}$$;\n'
+        f'COMMIT MIGRATION test::d1;\n'
+        f'{setup}'
+    )
+
+
+async def _run_json_bench(cluster, iterations, *, loop):
+    dbname = 'bench_json'
+
+    con = await cluster.connect(user='edgedb', loop=loop)
+    try:
+        await con.execute(f'CREATE DATABASE {dbname};')
+    finally:
+        con.close()
+
+    con = await cluster.connect(database=dbname, user='edgedb', loop=loop)
+    try:
+        await con.execute(_get_setup_script())
+
+        timings = {}
+        for name, flags in [('text', set()), ('jsonb', {'jsonb'})]:
+            # Warm up.
+            await con.execute(DEEP_SHAPE_QUERY, flags=flags)
+
+            runs = []
+            for _ in range(iterations):
+                await con.execute(DEEP_SHAPE_QUERY, flags=flags)
+                runs.append(con.get_last_timings()['execution'])
+
+            timings[name] = _summarize_runs(runs)
+    finally:
+        con.close()
+
+    return timings
+
+
+def bench_json(*, iterations, ast_checks):
+    """Measure the execution of a query with nested shapes.
+
+    The query is executed with the text json and the jsonb
+    serialization on a temporary cluster.
+    """
+    env = {'EDGEDB_LOG_LEVEL': 'silent'}
+    if ast_checks:
+        env['EDGEDB_AST_CHECKS'] = '1'
+
+    cluster = edgedb_cluster.TempCluster(env=env)
+    cluster.init()
+    try:
+        cluster.start(port='dynamic', timezone='UTC')
+        loop = asyncio.new_event_loop()
+        try:
+            timings = loop.run_until_complete(
+                _run_json_bench(cluster, iterations, loop=loop))
+        finally:
+            loop.close()
+    finally:
+        cluster.stop()
+        cluster.destroy()
+
+    return {
+        'suite': 'json',
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'execution': timings,
+    }
+
+
+def print_schema_report(report):
+    lookups = report['lookups_per_sec']
+    memory = report['memory']
+
+    click.echo(
+        f'{report["iterations"]} iterations, '
+        f'Python {report["python"]}')
+    click.echo()
+    click.echo(f'uncached lookups/sec  {lookups["uncached"]:,.0f}')
+    click.echo(f'  cached lookups/sec  {lookups["cached"]:,.0f}')
+    click.echo(
+        f'{memory["types"]} types: retained '
+        f'{memory["retained_bytes"] / 1024 / 1024:.1f} MiB, '
+        f'peak {memory["peak_bytes"] / 1024 / 1024:.1f} MiB')
+
+
+def _print_runs(name, stats):
+    click.echo(
+        f'{name}: median {stats["median_ms"]:.3f} ms, '
+        f'min {stats["min_ms"]:.3f} ms over {stats["runs"]} runs')
+
+
+def print_pathid_report(report):
+    click.echo(
+        f'{report["queries"]} queries, Python {report["python"]}')
+    click.echo()
+    _print_runs('compile', report['compile'])
+
+
+def print_json_report(report):
+    click.echo(f'Python {report["python"]}')
+    click.echo()
+    for name, stats in report['execution'].items():
+        _print_runs(f'{name:>5}', stats)
+
+
+@etcommands.command()
+@click.argument('files', nargs=-1, metavar='[file or directory]...')
+@click.option('--suite', type=click.Choice(SUITES), default='compile',
+              help='the benchmark to run (default: compile)')
+@click.option('-n', '--iterations', type=int,
+              help='number of times to run every benchmark (default: 5 '
+                   'for the compile suite, 200 for the others)')
+@click.option('-k', '--include', type=str, multiple=True, metavar='REGEXP',
+              help='only use test files which match the given '
+                   'regular expression')
+@click.option('--memory/--no-memory', default=True,
+              help='trace memory allocations with tracemalloc '
+                   '(enabled by default)')
+@click.option('--schema-types', type=int, default=300,
+              help='number of types in the schema generated by the '
+                   'schema suite')
+@click.option('--ast-checks', is_flag=True,
+              help='check AST field types as the test suite does '
+                   '(the server runs without checks)')
+@click.option('--json', 'json_output', type=click.File('w'), metavar='FILE',
+              help='write the results as JSON to FILE ("-" for stdout)')
+@click.option('-v', '--verbose', is_flag=True,
+              help='report the queries that fail to compile')
+def bench(*, files, suite, iterations, include, memory, schema_types,
+          ast_checks, json_output, verbose):
+    """Run EdgeDB benchmarks.
+
+    The compile suite measures parsing, EdgeQL to IR and IR to SQL
+    compilation of the queries in the specified test files or
+    directories.  If no files or directories are specified, the EdgeQL
+    tests of the project are used.
+
+    The schema suite measures schema name lookups and the memory used
+    by a generated schema.  The pathid suite measures the compilation
+    of queries with nested shapes.  The json suite measures the
+    execution of a query with nested shapes with the text json and the
+    jsonb serialization on a temporary cluster.
+    """
+    if not ast_checks:
+        common_ast.enable_fast_mode()
+
+    if suite == 'compile':
+        report = bench_compile(
+            files, include=include, iterations=iterations or 5,
+            memory=memory, verbose=verbose)
+        print_suite_report = print_report
+    elif suite == 'schema':
+        report = bench_schema(
+            iterations=iterations or 200, num_types=schema_types)
+        print_suite_report = print_schema_report
+    elif suite == 'pathid':
+        report = bench_pathid(iterations=iterations or 200)
+        print_suite_report = print_pathid_report
+    else:
+        report = bench_json(
+            iterations=iterations or 200, ast_checks=ast_checks)
+        print_suite_report = print_json_report
+
+    if json_output is not None:
+        json.dump(report, json_output, indent=4)
+        json_output.write('\n')
+
+    if json_output is None or json_output.name != '<stdout>':
+        print_suite_report(report)
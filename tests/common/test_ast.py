@@ -166,6 +166,74 @@ class ASTBaseTests(unittest.TestCase):
             class Node5(ast.AST):
                 field: list = list
 
+    def test_common_ast_fast_mode(self):
+        class Node(ast.AST):
+            field_str: str
+            field_list: typing.List[ast.AST]
+
+        ast.enable_fast_mode()
+        try:
+            # No type checks and no parent links in fast mode.
+            child = Node()
+            node = Node(field_str=1, field_list=[child])
+            node.field_str = 2
+            self.assertEqual(node.field_str, 2)
+            self.assertIsNone(child.parent)
+
+            ast.fix_parent_links(node)
+            self.assertIs(child.parent, node)
+
+            with self.assertRaises(ast.ASTError):
+                Node(unknown=1)
+        finally:
+            ast.enable_fast_mode(False)
+
+        child = Node()
+        node = Node(field_list=[child])
+        self.assertIs(child.parent, node)
+        with self.assertRaises(TypeError):
+            Node(field_str=1)
+        with self.assertRaises(TypeError):
+            node.field_str = 1
+
+    def test_common_ast_visitor(self):
+        class Node(ast.AST):
+            __ast_meta__ = {'meta'}
+            __ast_hidden__ = {'hidden'}
+
+            value: object
+            args: list
+            hidden: object
+            meta: object
+
+        self.assertEqual(
+            Node._traversal_plan,
+            (('value', False, True), ('args', False, True),
+             ('hidden', True, True)))
+
+        class Visitor(ast.NodeVisitor):
+            def visit_Base(self, node):
+                return 'base'
+
+            def visit_Constant(self, node):
+                return node.value
+
+        tree = tast.BinOp(
+            left=tast.Constant(value=1),
+            right=tast.FunctionCall(name='f', args=[tast.Constant(value=2)]))
+
+        self.assertEqual(Visitor.run(tree.left), 1)
+        # Dispatch goes through the node class MRO.
+        self.assertEqual(Visitor.run(tree), 'base')
+        self.assertEqual(Visitor().generic_visit(tree), [1, 'base'])
+
+        self.assertEqual(
+            ast.find_children(tree, lambda n: isinstance(n, tast.Constant)),
+            [tree.left, tree.right.args[0]])
+        self.assertTrue(ast.visitor.nodes_equal(tree, copy.deepcopy(tree)))
+        self.assertFalse(ast.visitor.nodes_equal(
+            tree, tast.BinOp(left=tast.Constant(value=1))))
+
 
 class ASTMatchTests(unittest.TestCase):
     tree1 = tast.BinOp(
@@ -31,6 +31,10 @@ class StrDict(TypedDict, keytype=str, valuetype=int):
     pass
 
 
+class StrSet(TypedSet, type=str):
+    pass
+
+
 class TypedTests(unittest.TestCase):
 
     def test_common_typeddict_basics(self):
@@ -182,3 +186,12 @@ class TypedTests(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             tl ^= {42}
+
+    def test_common_typedset_pickling(self):
+        ts = StrSet(('1', '2'))
+
+        ts = pickle.loads(pickle.dumps(ts))
+
+        assert ts.type is str
+        assert type(ts) is StrSet
+        assert set(ts) == {'1', '2'}
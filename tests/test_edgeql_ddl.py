@@ -453,3 +453,56 @@ class TestEdgeQLDDL(tb.DDLTestCase):
                 ]},
             ]
         ])
+
+    async def test_edgeql_ddl_19(self):
+        # Storage of a pointer used by a query must be recomputed
+        # when the pointer is altered.
+        await self.con.execute("""
+            CREATE TYPE test::TargetA;
+            CREATE TYPE test::TargetB;
+
+            CREATE TYPE test::Owner19 {
+                CREATE PROPERTY test::name -> std::str;
+                CREATE LINK test::tgt -> test::TargetA;
+                CREATE PROPERTY test::tags -> std::str;
+            };
+
+            INSERT test::TargetB;
+        """)
+
+        await self.assert_query_result(r"""
+            WITH MODULE test
+            SELECT Owner19 { tgt, tags };
+        """, [
+            [],
+        ])
+
+        await self.con.execute("""
+            ALTER TYPE test::Owner19 {
+                ALTER LINK test::tgt {
+                    ALTER TYPE test::TargetB;
+                };
+                ALTER PROPERTY test::tags {
+                    SET cardinality := '1*';
+                };
+            };
+        """)
+
+        await self.assert_query_result(r"""
+            WITH MODULE test
+            INSERT Owner19 {
+                name := 'owner',
+                tgt := (SELECT TargetB LIMIT 1),
+                tags := {'a', 'b'}
+            };
+
+            WITH MODULE test
+            SELECT Owner19 {
+                name,
+                has_tgt := EXISTS .tgt,
+                tags
+            };
+        """, [
+            [1],
+            [{'name': 'owner', 'has_tgt': True, 'tags': {'a', 'b'}}],
+        ])
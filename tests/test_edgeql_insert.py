@@ -141,6 +141,33 @@ class TestInsert(tb.QueryTestCase):
             [{'num': 101}, {'num': 102}, {'num': 103}],
         )
 
+    async def test_edgeql_insert_multi_property_01(self):
+        res = await self.con.execute('''
+            WITH MODULE test
+            INSERT MultiPropTest {
+                name := 'multi 1',
+                tags := {'a', 'b'}
+            };
+
+            WITH MODULE test
+            UPDATE MultiPropTest
+            FILTER .name = 'multi 1'
+            SET {
+                tags := {'b', 'c', 'd'}
+            };
+
+            WITH MODULE test
+            SELECT MultiPropTest {
+                name,
+                tags
+            };
+        ''')
+
+        self.assert_data_shape(
+            res[-1],
+            [{'name': 'multi 1', 'tags': {'b', 'c', 'd'}}],
+        )
+
     async def test_edgeql_insert_nested_01(self):
         res = await self.con.execute('''
             INSERT test::Subordinate {
@@ -587,6 +614,28 @@ class TestInsert(tb.QueryTestCase):
             res[-1], [0, 0, 0, 0, 0]
         )
 
+    async def test_edgeql_insert_for_04(self):
+        res = await self.con.execute(r'''
+            # A large literal set is compiled as a single array
+            # unpack rather than a chain of UNIONs.
+            WITH MODULE test
+            FOR x IN {1, 2, 3, 4, 5, 6, 7, 8, 9, 10,
+                      11, 12, 13, 14, 15, 16, 17, 18, 19, 20}
+            UNION (INSERT InsertTest {
+                name := 'insert for 4',
+                l2 := x,
+            });
+
+            WITH MODULE test
+            SELECT InsertTest.l2
+            FILTER InsertTest.name = 'insert for 4'
+            ORDER BY InsertTest.l2;
+        ''')
+
+        self.assert_data_shape(
+            res[-1], list(range(1, 21))
+        )
+
     async def test_edgeql_insert_default_01(self):
         res = await self.con.execute(r'''
             # create 10 DefaultTest3 objects, each object is defined
@@ -26,6 +26,9 @@ from edgedb.lang.edgeql import compiler
 
 from edgedb.lang.ir import ast as irast
 from edgedb.lang.ir import inference as irinference
+from edgedb.lang.ir.inference import stats as inference_stats
+
+from edgedb.server import protocol
 
 
 class TestEdgeQLCardinalityInference(tb.BaseEdgeQLCompilerTest):
@@ -44,6 +47,36 @@ class TestEdgeQLCardinalityInference(tb.BaseEdgeQLCompilerTest):
         self.assertEqual(cardinality, expected_cardinality,
                          'unexpected cardinality:\n' + source)
 
+    def test_edgeql_ir_card_inference_stats_01(self):
+        timer = protocol.Timer()
+        self.assertIsNone(timer.as_dict()['inference_cache_hit_rate'])
+
+        hits, misses = inference_stats.snapshot()
+
+        ir = compiler.compile_to_ir(r'''
+            WITH MODULE test
+            SELECT User {
+                name,
+                deck: {
+                    name
+                }
+            }
+            FILTER User.name = 'Alice'
+        ''', self.schema)
+
+        # The root cardinality was inferred during compilation.
+        irinference.infer_cardinality(ir, set(), self.schema)
+
+        new_hits, new_misses = inference_stats.snapshot()
+        self.assertGreater(new_hits, hits)
+        self.assertGreater(new_misses, misses)
+
+        timer.count('inference_cache_hits', new_hits - hits)
+        timer.count('inference_cache_misses', new_misses - misses)
+        self.assertEqual(
+            timer.as_dict()['inference_cache_hit_rate'],
+            (new_hits - hits) / (new_hits - hits + new_misses - misses))
+
     def test_edgeql_ir_card_inference_01(self):
         """
         WITH MODULE test
@@ -0,0 +1,112 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+
+from edgedb.lang import _testbase as tb
+
+from edgedb.lang.edgeql import compiler
+from edgedb.lang.ir import ast as irast
+from edgedb.lang.schema import error as s_err
+
+
+class TestEdgeQLIRFolding(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for constant folding of IR expressions."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.eschema')
+
+    def _compile(self, source):
+        return compiler.compile_to_ir(source, self.schema).expr.expr
+
+    def _assert_folds_to(self, source, value):
+        result = self._compile(source).result.expr
+        self.assertIsInstance(result, irast.Constant)
+        self.assertEqual(result.value, value)
+
+    def test_edgeql_ir_folding_01(self):
+        self._assert_folds_to('SELECT 40 >= 2', True)
+        self._assert_folds_to('SELECT 40 = 2', False)
+        self._assert_folds_to('SELECT 2.5 < 4.0', True)
+        self._assert_folds_to("SELECT 'foo' != 'bar'", True)
+        self._assert_folds_to("SELECT 'foo' + 'bar'", 'foobar')
+        self._assert_folds_to('SELECT true AND false', False)
+        self._assert_folds_to('SELECT NOT (1 > 2)', True)
+
+    def test_edgeql_ir_folding_02(self):
+        self._assert_folds_to('SELECT EXISTS {1, 2}', True)
+        self._assert_folds_to('SELECT EXISTS {1, {2, 3}}', True)
+        self._assert_folds_to('SELECT NOT EXISTS 1', False)
+        self._assert_folds_to("SELECT 'a' IF 1 = 1 ELSE 'b'", 'a')
+        self._assert_folds_to("SELECT 'a' ?? {} ?? 'b'", 'a')
+
+    def test_edgeql_ir_folding_03(self):
+        # String ordering depends on the collation, and coalescing
+        # to a different type must keep the operator.
+        result = self._compile("SELECT 'a' < 'b'").result.expr
+        self.assertIsInstance(result, irast.BinOp)
+
+        result = self._compile('SELECT 1 ?? 2.5').result.expr
+        self.assertIsInstance(result, irast.Coalesce)
+
+    def test_edgeql_ir_folding_04(self):
+        stmt = self._compile(r'''
+            WITH MODULE test
+            SELECT User FILTER true AND 1 < 2
+        ''')
+        self.assertIsNone(stmt.where)
+
+        stmt = self._compile(r'''
+            WITH MODULE test
+            SELECT User FILTER true AND User.name = 'Alice'
+        ''')
+        self.assertIsInstance(stmt.where.expr, irast.BinOp)
+        self.assertEqual(stmt.where.expr.right.expr.value, 'Alice')
+
+        # FALSE is absorbing only for non-empty operands.
+        stmt = self._compile(r'''
+            WITH MODULE test
+            SELECT User FILTER false AND User.name = 'Alice'
+        ''')
+        self.assertEqual(stmt.where.expr.op, 'and')
+
+    def test_edgeql_ir_folding_05(self):
+        # Postgres compares mixed numeric types after an implicit
+        # cast, so the result may differ from Python's comparison.
+        result = self._compile(
+            'SELECT 9007199254740993 = 9007199254740992.0').result.expr
+        self.assertIsInstance(result, irast.BinOp)
+
+        result = self._compile('SELECT 1 < 2.5').result.expr
+        self.assertIsInstance(result, irast.BinOp)
+
+        result = self._compile('SELECT EXISTS {1, 2.5}').result.expr
+        self.assertIsInstance(result, irast.ExistPred)
+
+    def test_edgeql_ir_folding_06(self):
+        # EXISTS of an invalid set must fail the same way the set does.
+        with self.assertRaisesRegex(
+                s_err.SchemaError,
+                'cannot set multiple scalar children'):
+            self._compile("SELECT {1, 'a'}")
+
+        with self.assertRaisesRegex(
+                s_err.SchemaError,
+                'cannot set multiple scalar children'):
+            self._compile("SELECT EXISTS {1, 'a'}")
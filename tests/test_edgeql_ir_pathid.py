@@ -0,0 +1,69 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import copy
+import os.path
+
+from edgedb.lang import _testbase as tb
+from edgedb.lang.ir import ast as irast
+from edgedb.lang.ir import pathid
+
+
+class TestEdgeQLIRPathId(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for PathId interning."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.eschema')
+
+    def test_edgeql_ir_pathid_intern_01(self):
+        card = self.schema.get('test::Card')
+        deck = self.schema.get('test::User').resolve_pointer(
+            self.schema, 'deck')
+
+        user_id = irast.PathId(self.schema.get('test::User'))
+        self.assertIs(user_id, irast.PathId(self.schema.get('test::User')))
+        self.assertIs(user_id.extend(deck), user_id.extend(deck))
+        self.assertIs(user_id.extend(deck)[:1], user_id)
+        self.assertIs(
+            user_id.extend(deck).ptr_path().tgt_path(), user_id.extend(deck))
+        self.assertIsNot(irast.PathId(card), user_id)
+
+        ns_id = user_id.replace_namespace({'ns'})
+        self.assertIsNot(ns_id, user_id)
+        self.assertIs(ns_id.replace_namespace(None), user_id)
+        self.assertIs(irast.PathId(user_id, namespace={'ns'}), ns_id)
+
+    def test_edgeql_ir_pathid_intern_02(self):
+        user_id = irast.PathId(self.schema.get('test::User'))
+
+        strong = user_id.replace_namespace({'ns'})
+        weak = user_id.replace_namespace({pathid.WeakNamespace('ns')})
+
+        # Weak and strong namespaces with the same name compare
+        # equal, but must not be interned as the same path id.
+        self.assertEqual(strong, weak)
+        self.assertIsNot(strong, weak)
+        self.assertIs(weak.strip_weak_namespaces(), user_id)
+        self.assertEqual(str(weak), '[ns]@@(test::User)')
+
+    def test_edgeql_ir_pathid_intern_03(self):
+        user_id = irast.PathId(self.schema.get('test::User'))
+
+        self.assertIs(copy.copy(user_id), user_id)
+        self.assertIs(copy.deepcopy(user_id), user_id)
@@ -0,0 +1,100 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2012-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+import textwrap
+
+from edgedb.lang import _testbase as tb
+
+from edgedb.lang.edgeql import compiler
+
+from edgedb.lang.ir import inference as irinference
+
+
+class TestEdgeQLUniquenessInference(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for uniqueness inference."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.eschema')
+
+    def run_test(self, *, source, spec, expected):
+        ir = compiler.compile_to_ir(source, self.schema)
+
+        is_unique = irinference.infer_is_unique(
+            ir.expr, set(), self.schema)
+        expected_is_unique = {'unique': True, 'not unique': False}[
+            textwrap.dedent(expected).strip(' \n')]
+        self.assertEqual(is_unique, expected_is_unique,
+                         'unexpected uniqueness:\n' + source)
+
+    def test_edgeql_ir_uniqueness_inference_01(self):
+        """
+        WITH MODULE test
+        SELECT Card FILTER Card.cost > 1
+% OK %
+        unique
+        """
+
+    def test_edgeql_ir_uniqueness_inference_02(self):
+        """
+        WITH MODULE test
+        SELECT User.name
+% OK %
+        unique
+        """
+
+    def test_edgeql_ir_uniqueness_inference_03(self):
+        """
+        WITH MODULE test
+        SELECT Named.name
+% OK %
+        not unique
+        """
+
+    def test_edgeql_ir_uniqueness_inference_04(self):
+        """
+        WITH MODULE test
+        SELECT User.deck
+% OK %
+        not unique
+        """
+
+    def test_edgeql_ir_uniqueness_inference_05(self):
+        """
+        WITH MODULE test
+        SELECT Card.element
+% OK %
+        not unique
+        """
+
+    def test_edgeql_ir_uniqueness_inference_06(self):
+        """
+        WITH MODULE test
+        SELECT User UNION User
+% OK %
+        not unique
+        """
+
+    def test_edgeql_ir_uniqueness_inference_07(self):
+        """
+        WITH MODULE test
+        SELECT len(User.name)
+% OK %
+        not unique
+        """
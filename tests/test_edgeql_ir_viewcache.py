@@ -0,0 +1,81 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+
+from edgedb.lang import _testbase as tb
+
+from edgedb.lang.edgeql import compiler
+
+
+class TestEdgeQLIRViewCache(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for reuse of views derived for shapes."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.eschema')
+
+    def _get_views(self, source):
+        ir = compiler.compile_to_ir(source, self.schema)
+        return ir.expr.scls, ir.views
+
+    def test_edgeql_ir_view_cache_01(self):
+        query = r'''
+            WITH MODULE test
+            SELECT User {
+                name,
+                deck: {
+                    name,
+                    @count
+                }
+            }
+        '''
+
+        view1, views1 = self._get_views(query)
+        view2, views2 = self._get_views(query)
+
+        self.assertIs(view1, view2)
+        self.assertEqual(views1, views2)
+        self.assertEqual(
+            view1.pointers['test::deck'].target.peel_view().name,
+            'test::Card')
+
+    def test_edgeql_ir_view_cache_02(self):
+        # Views are part of path identity, so equal shapes in one
+        # query must not share them.
+        ir = compiler.compile_to_ir(r'''
+            WITH MODULE test
+            SELECT (User { name }, User { name })
+        ''', self.schema)
+
+        elements = ir.expr.expr.result.expr.elements
+        self.assertIsNot(elements[0].val.scls, elements[1].val.scls)
+
+    def test_edgeql_ir_view_cache_03(self):
+        query = r'''
+            WITH MODULE test
+            SELECT User {
+                name,
+                deck_size := count(User.deck)
+            }
+        '''
+
+        view1, _ = self._get_views(query)
+        view2, _ = self._get_views(query)
+
+        self.assertIsNot(view1, view2)
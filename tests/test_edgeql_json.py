@@ -0,0 +1,81 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+
+from edgedb.server import _testbase as tb
+
+
+DEEP_SHAPE_QUERY = r'''
+    WITH MODULE test
+    SELECT User {
+        name,
+        deck: {
+            name,
+            element,
+            cost,
+            @count,
+            owners: {
+                name,
+                friends: {
+                    name,
+                    @nickname
+                } ORDER BY .name
+            } ORDER BY .name
+        } ORDER BY .name,
+        friends: {
+            name,
+            deck: {
+                name
+            } ORDER BY .name
+        } ORDER BY .name
+    } ORDER BY .name;
+'''
+
+
+class TestEdgeQLJSON(tb.QueryTestCase):
+    '''Tests for JSON output serialization strategies.'''
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.eschema')
+
+    SETUP = os.path.join(os.path.dirname(__file__), 'schemas',
+                         'cards_setup.eql')
+
+    async def test_edgeql_json_format_01(self):
+        text_res = await self.con.execute(DEEP_SHAPE_QUERY)
+        jsonb_res = await self.con.execute(
+            DEEP_SHAPE_QUERY, flags={'jsonb'})
+
+        self.assertEqual(text_res, jsonb_res)
+
+    async def test_edgeql_json_format_02(self):
+        # DISTINCT requires comparable serialized values,
+        # make sure it still works.
+        await self.assert_query_result(r'''
+            WITH MODULE test
+            SELECT _ := DISTINCT (
+                SELECT User.deck FILTER User.deck.element = 'Water'
+            ) {
+                name
+            }
+            ORDER BY _.name;
+        ''', [
+            [{'name': 'Bog monster'}, {'name': 'Giant turtle'}],
+        ])
@@ -1292,3 +1292,21 @@ class TestEdgeQLScope(tb.QueryTestCase):
         """, [[
             {'name': 'Bog monster'}
         ]])
+
+    async def test_edgeql_scope_aggregate_01(self):
+        # Identical aggregate calls in the shape, FILTER and ORDER BY
+        # must all be evaluated for the same User.
+        await self.assert_query_result(r"""
+            WITH
+                MODULE test
+            SELECT User {
+                name,
+                total := sum(User.deck.cost)
+            }
+            FILTER sum(User.deck.cost) > 10
+            ORDER BY sum(User.deck.cost) DESC;
+        """, [[
+            {'name': 'Dave', 'total': 20},
+            {'name': 'Carol', 'total': 16},
+            {'name': 'Alice', 'total': 11},
+        ]])
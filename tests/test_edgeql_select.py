@@ -17,10 +17,13 @@
 #
 
 
+import decimal
+import json
 import os.path
 import unittest
 
 from edgedb.server import _testbase as tb
+from edgedb.server import protocol
 from edgedb.client import exceptions as exc
 
 
@@ -833,6 +836,123 @@ class TestEdgeQLSelect(tb.QueryTestCase):
                 OFFSET <int64>User.<owner[IS Issue].number;
             """)
 
+    async def test_edgeql_select_keyset_01(self):
+        query = r'''
+            WITH MODULE test
+            SELECT
+                Issue { number }
+            ORDER BY Issue.owner.name THEN .number DESC
+            LIMIT 2;
+        '''
+
+        pages = []
+        res = await self.con.execute(query, flags={'keyset'})
+        pages.append(res[-1])
+        continuation = self.con.get_last_continuation()
+
+        while continuation is not None:
+            res = await self.con.execute(query, continuation=continuation)
+            pages.append(res[-1])
+            continuation = self.con.get_last_continuation()
+
+        self.assertEqual(pages, [
+            [{'number': '4'}, {'number': '1'}],
+            [{'number': '3'}, {'number': '2'}],
+            [],
+        ])
+
+    async def test_edgeql_select_keyset_02(self):
+        query = r'''
+            WITH MODULE test
+            SELECT
+                Issue { number }
+            ORDER BY .number;
+        '''
+
+        await self.con.execute(query, flags={'keyset'})
+
+        with self.assertRaisesRegex(
+                exc.EdgeQLError,
+                r'continuation token does not match the query'):
+            await self.con.execute(
+                query.replace('Issue { number }', 'Issue { name }'),
+                continuation=self.con.get_last_continuation())
+
+    async def test_edgeql_select_keyset_03(self):
+        # Only Issue 1 has a time_estimate.
+        async def fetch_pages(query):
+            pages = []
+            res = await self.con.execute(query, flags={'keyset'})
+            pages.append([r['number'] for r in res[-1]])
+            continuation = self.con.get_last_continuation()
+
+            while continuation is not None:
+                res = await self.con.execute(
+                    query, continuation=continuation)
+                pages.append([r['number'] for r in res[-1]])
+                continuation = self.con.get_last_continuation()
+
+            return pages
+
+        self.assertEqual(await fetch_pages(r'''
+            WITH MODULE test
+            SELECT
+                Issue { number }
+            ORDER BY .time_estimate THEN .number
+            LIMIT 2;
+        '''), [['2', '3'], ['4', '1'], []])
+
+        self.assertEqual(await fetch_pages(r'''
+            WITH MODULE test
+            SELECT
+                Issue { number }
+            ORDER BY .time_estimate EMPTY LAST THEN .number
+            LIMIT 2;
+        '''), [['1', '2'], ['3', '4'], []])
+
+        self.assertEqual(await fetch_pages(r'''
+            WITH MODULE test
+            SELECT
+                Issue { number }
+            ORDER BY .time_estimate DESC THEN .number
+            LIMIT 3;
+        '''), [['1', '2', '3'], ['4']])
+
+    async def test_edgeql_select_keyset_04(self):
+        query = r'''
+            WITH MODULE test
+            SELECT
+                Status { name }
+            ORDER BY .name
+            LIMIT 1;
+        '''
+
+        await self.con.execute('START TRANSACTION;')
+
+        try:
+            await self.con.execute(r'''
+                WITH MODULE test
+                INSERT Status {
+                    name := 'Archived'
+                };
+            ''')
+
+            res = await self.con.execute(query, flags={'keyset'})
+            self.assertEqual(res[-1], [{'name': 'Archived'}])
+            continuation = self.con.get_last_continuation()
+
+            await self.con.execute(r'''
+                WITH MODULE test
+                DELETE (SELECT Status FILTER Status.name = 'Archived');
+            ''')
+
+            with self.assertRaisesRegex(
+                    exc.EdgeQLError,
+                    r'continuation anchor no longer exists'):
+                await self.con.execute(query, continuation=continuation)
+        finally:
+            await self.con.execute('ROLLBACK;')
+
     async def test_edgeql_select_specialized_01(self):
         await self.assert_query_result(r'''
             WITH MODULE test
@@ -2315,6 +2435,33 @@ class TestEdgeQLSelect(tb.QueryTestCase):
             [{'number': '2'}, {'number': '3'}],
         ])
 
+    async def test_edgeql_select_and_09(self):
+        await self.assert_query_result(r'''
+            WITH MODULE test
+            SELECT Issue{number}
+            FILTER
+                Issue.watchers.name = 'Elvis'   # [2, 3]
+                AND
+                Issue.related_to.number = '2'   # [3]
+            ORDER BY Issue.number;
+        ''', [
+            [{'number': '3'}],
+        ])
+
+    async def test_edgeql_select_and_10(self):
+        await self.assert_query_result(r'''
+            WITH MODULE test
+            SELECT Issue{number}
+            FILTER
+                # both operands refer to the same watcher
+                Issue.watchers.name = 'Elvis'
+                AND
+                Issue.watchers.name != 'Elvis'
+            ORDER BY Issue.number;
+        ''', [
+            [],
+        ])
+
     async def test_edgeql_select_or_01(self):
         res = await self.con.execute(r'''
             WITH MODULE test
@@ -4185,6 +4332,70 @@ class TestEdgeQLSelect(tb.QueryTestCase):
             [True],
         ])
 
+    async def test_edgeql_select_native_01(self):
+        query = r'''
+            WITH MODULE test
+            SELECT Issue {
+                number,
+                owner: {
+                    name
+                },
+                watchers: {
+                    name
+                } ORDER BY .name,
+                status: {
+                    name
+                },
+                time_estimate
+            } ORDER BY .number;
+
+            WITH MODULE test
+            SELECT (a := Issue.number, b := (Issue.owner.name, 1))
+            ORDER BY .a;
+
+            WITH MODULE test
+            SELECT User.todo@rank ORDER BY User.todo@rank;
+        '''
+
+        json_res = await self.con.execute(query)
+        native_res = await self.con.execute(query, flags={'native'})
+
+        self.assertEqual(native_res, json_res)
+
+    async def test_edgeql_select_native_02(self):
+        query = r'''
+            SELECT <decimal>'3.14159265358979323846264338327950288';
+            SELECT <decimal>'1.10';
+            SELECT (<decimal>'-0.000001', <decimal>'100');
+
+            SELECT <timedelta>'1 day 2 hours';
+            SELECT <timedelta>'3 days';
+            SELECT <timedelta>'0 seconds';
+            SELECT <timedelta>'-22 hours';
+            SELECT <timedelta>'-2 days -3 hours -1.5 milliseconds';
+            SELECT (<timedelta>'0.5 seconds', <timedelta>'1 day');
+            SELECT <timedelta>'1 month';
+            SELECT <timedelta>'-1 year -2 months';
+            SELECT <timedelta>'-1 day 2 hours';
+            SELECT <timedelta>'36 hours';
+        '''
+
+        json_res = await self.con.execute(query)
+        native_res = await self.con.execute(query, flags={'native'})
+
+        self.assertEqual(native_res, json_res)
+        self.assertEqual(native_res[3:6], [
+            ['1 day 02:00:00'],
+            ['3 days'],
+            ['00:00:00'],
+        ])
+        self.assertEqual(native_res[9:13], [
+            ['1 mon'],
+            ['-1 years -2 mons'],
+            ['-1 days +02:00:00'],
+            ['36:00:00'],
+        ])
+
     async def test_edgeql_select_bad_reference_01(self):
         with self.assertRaisesRegex(
                 exc.EdgeQLError,
@@ -4208,3 +4419,29 @@ class TestEdgeQLSelect(tb.QueryTestCase):
                 WITH MODULE test
                 SELECT User.nam;
             """)
+
+
+class TestNativeOutputEncoding(unittest.TestCase):
+
+    def test_edgeql_select_native_encoding_01(self):
+        D = decimal.Decimal
+
+        msg = {
+            'result': [
+                [D('3.14159265358979323846264338327950288'), D('1.10')],
+                [(D('-0.000001'), D('NaN')), '\0' + '"1.5"'],
+            ],
+            'timings': {'execution': 0.5},
+        }
+
+        encoded = protocol.MessageEncoder().encode(msg)
+        self.assertIn('3.14159265358979323846264338327950288', encoded)
+        self.assertIn('1.10', encoded)
+
+        self.assertEqual(json.loads(encoded, parse_float=D), {
+            'result': [
+                [D('3.14159265358979323846264338327950288'), D('1.10')],
+                [[D('-0.000001'), 'NaN'], '\0"1.5"'],
+            ],
+            'timings': {'execution': D('0.5')},
+        })
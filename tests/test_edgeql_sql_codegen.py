@@ -0,0 +1,149 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2018-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+
+from edgedb.lang import _testbase as tb
+
+from edgedb.lang.edgeql import compiler
+from edgedb.server.pgsql import ast as pgast
+from edgedb.server.pgsql import compiler as pgcompiler
+from edgedb.server.pgsql.compiler import context as pgcontext
+from edgedb.server.pgsql.compiler import dbobj
+
+
+class TestEdgeQLSQLCodegen(tb.BaseEdgeQLCompilerTest):
+    """Tests for the shape of the SQL generated for EdgeQL queries."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.eschema')
+
+    def _compile_to_sql(self, source):
+        ir = compiler.compile_to_ir(source, self.schema)
+        sql, *_ = pgcompiler.compile_ir_to_sql(
+            ir, schema=self.schema,
+            output_format=pgcompiler.OutputFormat.NATIVE)
+        return ''.join(sql)
+
+    def test_edgeql_sql_codegen_shared_aggregate_01(self):
+        sql = self._compile_to_sql(r'''
+            WITH MODULE test
+            SELECT User { name }
+            FILTER count(User.deck) > 1
+            ORDER BY count(User.deck)
+        ''')
+
+        self.assertEqual(sql.count('count('), 1)
+
+    def test_edgeql_sql_codegen_shared_aggregate_02(self):
+        sql = self._compile_to_sql(r'''
+            WITH MODULE test
+            SELECT (User.name, count(User.deck), count(User.friends))
+            FILTER count(User.deck) > count(User.friends)
+        ''')
+
+        # Different arguments are not shared.
+        self.assertEqual(sql.count('count('), 2)
+
+    def test_edgeql_sql_codegen_shared_aggregate_03(self):
+        sql = self._compile_to_sql(r'''
+            WITH MODULE test
+            SELECT User {
+                name,
+                total := sum(User.deck.cost)
+            }
+            ORDER BY sum(User.deck.cost) THEN count(User.deck)
+        ''')
+
+        self.assertEqual(sql.count('sum('), 1)
+        self.assertEqual(sql.count('count('), 1)
+
+
+class TestEdgeQLSQLCodegenLinks(tb.BaseEdgeQLCompilerTest):
+    """Tests for the link tables used by polymorphic link steps."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'polylinks.eschema')
+
+    def _compile_to_sql(self, source):
+        ir = compiler.compile_to_ir(source, self.schema)
+        sql, *_ = pgcompiler.compile_ir_to_sql(
+            ir, schema=self.schema,
+            output_format=pgcompiler.OutputFormat.NATIVE)
+        return ''.join(sql)
+
+    def test_edgeql_sql_codegen_polymorphic_link_01(self):
+        sql = self._compile_to_sql(r'''
+            WITH MODULE test
+            SELECT Taggable.tagged
+        ''')
+
+        # Every specialization of the link is a child of the generic
+        # link, so its table is used instead of a UNION.
+        self.assertIn('edgedb_test.tagged_link', sql)
+        self.assertNotIn('test|tagged@@', sql)
+        self.assertNotIn(' union ', sql)
+
+    def test_edgeql_sql_codegen_polymorphic_link_02(self):
+        sql = self._compile_to_sql(r'''
+            WITH MODULE test
+            SELECT Taggable.rated
+        ''')
+
+        # Photo.rated adds a link property, which the generic link
+        # table has no column for.
+        self.assertNotIn('edgedb_test.rated_link', sql)
+        self.assertIn('"test|rated@@test|Taggable_link"', sql)
+        self.assertIn('"test|rated@@test|Photo_link"', sql)
+        self.assertIn(' union ', sql)
+
+    def test_edgeql_sql_codegen_polymorphic_link_03(self):
+        ptrcls = self.schema.get('test::Taggable').resolve_pointer(
+            self.schema, 'tagged')
+        env = pgcontext.Environment(
+            schema=self.schema, output_format=None, json_format=None,
+            backend=None, singleton_mode=False, views={})
+
+        rvar = dbobj.range_for_ptrcls(ptrcls, '>', env=env)
+        self.assertIsInstance(rvar, pgast.RangeVar)
+        self.assertEqual(rvar.relation.name, 'tagged_link')
+
+        # DML in the same statement records its effect on the link
+        # in an overlay, which must be applied to every specialized
+        # table.
+        overlay = pgast.CommonTableExpr(
+            name='overlay', query=pgast.SelectStmt())
+        env.rel_overlays[ptrcls.shortname].append(('union', overlay))
+
+        rvar = dbobj.range_for_ptrcls(ptrcls, '>', env=env)
+        self.assertIsInstance(rvar, pgast.RangeSubselect)
+        self.assertEqual(
+            sorted(r.relation.name for r in _iter_range_vars(rvar.subquery)
+                   if isinstance(r.relation, pgast.Relation)),
+            ['test|tagged@@test|Photo_link',
+             'test|tagged@@test|Post_link',
+             'test|tagged@@test|Taggable_link'])
+
+
+def _iter_range_vars(query):
+    if query.op:
+        yield from _iter_range_vars(query.larg)
+        yield from _iter_range_vars(query.rarg)
+    else:
+        yield from query.from_clause
@@ -19,6 +19,7 @@
 
 from edgedb.lang import _testbase as tb
 from edgedb.lang.schema import error as s_err
+from edgedb.lang.schema import name as sn
 from edgedb.lang.schema import pointers as s_pointers
 
 
@@ -129,3 +130,88 @@ class TestSchema(tb.BaseSchemaTest):
         obj = schema.get('test::Object')
         self.assertEqual(obj.getptr(schema, 'foo_plus_bar').cardinality,
                          s_pointers.PointerCardinality.ManyToMany)
+
+    def test_schema_lookup_cache_01(self):
+        schema = self.load_schema("""
+            type Foo:
+                property foo -> str
+        """)
+
+        obj = schema.get('test::Foo')
+        aliases = {None: 'test'}
+        self.assertIs(schema.get('Foo', module_aliases=aliases), obj)
+        self.assertIsNone(schema.get('test::Missing', default=None))
+
+        overlay = schema.get_overlay()
+        self.assertIs(overlay.get('Foo', module_aliases=aliases), obj)
+
+        schema.delete(obj)
+        self.assertIsNone(schema.get('test::Foo', default=None))
+        self.assertIsNone(
+            overlay.get('Foo', module_aliases=aliases, default=None))
+
+        schema.add(obj)
+        self.assertIs(schema.get('test::Foo'), obj)
+        self.assertIs(overlay.get('Foo', module_aliases=aliases), obj)
+
+    def test_schema_inheritance_index_01(self):
+        schema = self.load_schema("""
+            type Base:
+                property foo -> str
+
+            type Child1 extending Base
+
+            type Child2 extending Base:
+                inherited property foo -> str
+        """)
+
+        base = schema.get('test::Base')
+        child1 = schema.get('test::Child1')
+        child2 = schema.get('test::Child2')
+
+        self.assertEqual(base.children(schema), {child1, child2})
+        self.assertEqual(child1.children(schema), set())
+
+        ptrs = schema.get_pointer_specializations(base, 'test::foo')
+        self.assertEqual(ptrs[0], base.pointers['test::foo'].material_type())
+        self.assertEqual(len(set(ptrs)), len(ptrs))
+
+        schema.delete(child1)
+        self.assertEqual(base.children(schema), {child2})
+
+    def test_schema_name_interning_01(self):
+        schema = self.load_schema("""
+            type Foo:
+                property foo -> str
+
+            type Bar:
+                property foo -> str
+        """)
+
+        foo = schema.get('test::Foo')
+        bar = schema.get('test::Bar')
+
+        foo_key, = (k for k in foo.pointers if k.name == 'foo')
+        bar_key, = (k for k in bar.pointers if k.name == 'foo')
+        self.assertIs(foo_key, bar_key)
+        self.assertIs(sn.intern_name(sn.Name('test::foo')), foo_key)
+
+    def test_schema_copy_01(self):
+        schema = self.load_schema("""
+            type Foo:
+                property foo -> str
+        """)
+
+        foo = schema.get('test::Foo')
+
+        copy = schema.copy()
+        copy_foo = copy.get('test::Foo')
+        self.assertIsNot(copy_foo, foo)
+        self.assertEqual(copy_foo.name, foo.name)
+
+        copy_foo.title = 'changed'
+        self.assertNotEqual(foo.title, 'changed')
+
+        copy.delete(copy_foo)
+        self.assertIsNone(copy.get('test::Foo', default=None))
+        self.assertIs(schema.get('test::Foo'), foo)
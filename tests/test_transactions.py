@@ -17,7 +17,10 @@
 #
 
 
+from edgedb.lang.edgeql import ast as qlast
 from edgedb.server import _testbase as tb
+from edgedb.server import executor
+from edgedb.server import planner
 from edgedb.client import exceptions
 
 
@@ -216,3 +219,227 @@ class TestTransactions(tb.QueryTestCase):
             async with tr:
                 async with tr:
                     pass
+
+    async def test_transaction_ddl_rollback_01(self):
+        with self.assertRaises(ZeroDivisionError):
+            async with self.con.transaction():
+                await self.con.execute('''
+                    CREATE TYPE test::TransactionDDLTest EXTENDING std::Object;
+                ''')
+
+                result = await self.con.execute('''
+                    SELECT test::TransactionDDLTest;
+                ''')
+                self.assertEqual(result[0], [])
+
+                1 / 0
+
+        # The type was rolled back and the schema must reflect that.
+        with self.assertRaisesRegex(
+                exceptions.EdgeQLError,
+                'reference to a non-existent schema item'):
+            await self.con.execute('''
+                SELECT test::TransactionDDLTest;
+            ''')
+
+        # A rollback without DDL keeps the schema intact.
+        with self.assertRaises(ZeroDivisionError):
+            async with self.con.transaction():
+                await self.con.execute('''
+                    INSERT test::TransactionTest {
+                        name := 'TXTEST DDL'
+                    };
+                ''')
+
+                1 / 0
+
+        result = await self.con.execute('''
+            SELECT test::TransactionTest
+            FILTER test::TransactionTest.name = 'TXTEST DDL';
+        ''')
+        self.assertEqual(result[0], [])
+
+    async def test_transaction_cursor_01(self):
+        async with self.con.transaction():
+            await self.con.execute('''
+                FOR x IN {1, 2, 3, 4, 5}
+                UNION (INSERT test::TransactionTest {
+                    name := 'TXTEST CURSOR ' + <str>x
+                });
+            ''')
+
+            query = '''
+                SELECT test::TransactionTest { name }
+                FILTER test::TransactionTest.name LIKE 'TXTEST CURSOR %'
+                ORDER BY test::TransactionTest.name;
+            '''
+
+            names = []
+            async for row in self.con.cursor(query, prefetch=2):
+                names.append(row['name'])
+
+            self.assertEqual(
+                names, ['TXTEST CURSOR {}'.format(i) for i in range(1, 6)])
+
+            cur = self.con.cursor(query)
+            self.assertEqual(
+                [row['name'] for row in await cur.fetch(3)],
+                ['TXTEST CURSOR 1', 'TXTEST CURSOR 2', 'TXTEST CURSOR 3'])
+            self.assertEqual(
+                [row['name'] for row in await cur.fetch(3)],
+                ['TXTEST CURSOR 4', 'TXTEST CURSOR 5'])
+            self.assertEqual(await cur.fetch(3), [])
+
+    async def test_transaction_cursor_02(self):
+        async with self.con.transaction():
+            cur = self.con.cursor('SELECT {1, 2, 3};')
+            self.assertEqual(await cur.fetch(1), [1])
+
+            cursor_id = cur._id
+            await cur.close()
+
+            with self.assertRaisesRegex(
+                    exceptions.InvalidTransactionStateError,
+                    'cursor .* does not exist'):
+                await self.con._protocol.fetch_cursor(cursor_id, 1)
+
+            # The connection is still usable after the portal is closed.
+            result = await self.con.execute('SELECT 1;')
+            self.assertEqual(result[0], [1])
+
+    async def test_transaction_cursor_04(self):
+        async with self.con.transaction():
+            async with self.con.transaction():
+                released = self.con.cursor('SELECT {1, 2, 3};')
+                self.assertEqual(await released.fetch(1), [1])
+
+            # The cursor outlives the savepoint it was declared in.
+            self.assertEqual(await released.fetch(1), [2])
+
+            try:
+                async with self.con.transaction():
+                    rolled_back = self.con.cursor('SELECT {1, 2, 3};')
+                    self.assertEqual(await rolled_back.fetch(1), [1])
+                    1 / 0
+            except ZeroDivisionError:
+                pass
+
+            with self.assertRaisesRegex(
+                    exceptions.InvalidTransactionStateError,
+                    'cursor .* does not exist'):
+                await rolled_back.fetch(1)
+
+            self.assertEqual(await released.fetch(1), [3])
+
+
+class TestTransactionsNoIsolation(tb.QueryTestCase):
+    # The test methods must not run in a transaction to check that
+    # cursors cannot be used outside of one.
+    ISOLATED_METHODS = False
+
+    async def test_transaction_cursor_03(self):
+        with self.assertRaisesRegex(
+                exceptions.NoActiveTransactionError,
+                'cursors can only be used inside a transaction'):
+            async for _ in self.con.cursor('SELECT {1, 2, 3};'):
+                pass
+
+
+class _Transaction:
+    async def start(self):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class _Connection:
+    def transaction(self):
+        return _Transaction()
+
+
+class _Backend:
+    def __init__(self):
+        self.connection = _Connection()
+        self.schema_version = 0
+        self.schema_reloads = 0
+
+    async def invalidate_schema_cache(self):
+        self.schema_version += 1
+
+    async def getschema(self):
+        self.schema_reloads += 1
+
+
+class _Protocol:
+    def __init__(self):
+        self.backend = _Backend()
+        self.transactions = []
+        self.cursors = {}
+
+    def open_cursor(self, cursor_id):
+        transaction, _ = self.transactions[-1]
+        self.cursors[cursor_id] = (f'cursor_{cursor_id}', None, transaction)
+
+
+async def _execute(protocol, qlnode):
+    await executor.execute_plan(
+        planner.TransactionStatement(qlnode), protocol)
+
+
+class TestTransactionSchemaReload(tb.TestCase):
+
+    async def test_transaction_schema_reload_01(self):
+        protocol = _Protocol()
+        backend = protocol.backend
+
+        # A data-only ROLLBACK does not reload the schema.
+        await _execute(protocol, qlast.StartTransaction())
+        await _execute(protocol, qlast.RollbackTransaction())
+        self.assertEqual(backend.schema_reloads, 0)
+
+        # Neither does a ROLLBACK of a savepoint without DDL when
+        # the enclosing transaction changed the schema.
+        await _execute(protocol, qlast.StartTransaction())
+        backend.schema_version += 1
+        await _execute(protocol, qlast.StartTransaction())
+        await _execute(protocol, qlast.RollbackTransaction())
+        self.assertEqual(backend.schema_reloads, 0)
+
+        await _execute(protocol, qlast.RollbackTransaction())
+        self.assertEqual(backend.schema_reloads, 1)
+        self.assertEqual(protocol.transactions, [])
+
+
+class TestTransactionCursorScope(tb.TestCase):
+
+    async def test_transaction_cursor_scope_01(self):
+        protocol = _Protocol()
+
+        await _execute(protocol, qlast.StartTransaction())
+        outer, _ = protocol.transactions[-1]
+        protocol.open_cursor(1)
+
+        # Releasing a savepoint keeps the cursors declared in it.
+        await _execute(protocol, qlast.StartTransaction())
+        protocol.open_cursor(2)
+        await _execute(protocol, qlast.CommitTransaction())
+        self.assertEqual(
+            {cid: owner for cid, (_, _, owner) in protocol.cursors.items()},
+            {1: outer, 2: outer})
+
+        # Rolling a savepoint back closes the cursors declared in it
+        # and in the savepoints released into it.
+        await _execute(protocol, qlast.StartTransaction())
+        protocol.open_cursor(3)
+        await _execute(protocol, qlast.StartTransaction())
+        protocol.open_cursor(4)
+        await _execute(protocol, qlast.CommitTransaction())
+        await _execute(protocol, qlast.RollbackTransaction())
+        self.assertEqual(set(protocol.cursors), {1, 2})
+
+        await _execute(protocol, qlast.CommitTransaction())
+        self.assertEqual(protocol.cursors, {})